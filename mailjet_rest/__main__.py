@@ -0,0 +1,8 @@
+"""Run the bulk export and import tool with `python -m mailjet_rest`."""
+
+import sys
+
+from mailjet_rest.cli import main
+
+
+sys.exit(main())
@@ -0,0 +1,285 @@
+"""Clients for many Mailjet accounts sharing one connection pool.
+
+Applications managing many sub-accounts need one `Client` per API key pair.
+`ClientPool` hands out those clients as lightweight views over a single
+shared transport, so all accounts reuse the same pooled connections. Each view
+can have its own request budget, enforced by a token bucket, and the pool only
+keeps the most recently used views so that memory stays bounded with
+thousands of accounts. The budgets outlive the views: an account whose view
+was evicted gets its remaining budget back with its next view.
+
+Classes:
+    - RateLimitedTransport: Waits for a token bucket before each request.
+    - ClientPool: Hands out per-account clients over a shared transport.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from http.cookiejar import DefaultCookiePolicy
+from typing import TYPE_CHECKING
+from typing import Any
+
+from mailjet_rest.client import Client
+from mailjet_rest.client import TimeoutError  # noqa: A004
+from mailjet_rest.transport import RequestsTransport
+from mailjet_rest.transport import Transport
+from mailjet_rest.utils.rate_limit import TokenBucket
+
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from requests.models import Response  # type: ignore[import-untyped]
+
+
+_NO_COOKIES = DefaultCookiePolicy(allowed_domains=[])
+
+
+class RateLimitedTransport(Transport):
+    """Forward requests to another transport, within a token bucket budget.
+
+    Attributes:
+    - transport (Transport): The transport doing the actual requests.
+    - bucket (TokenBucket | None): The request budget. If None, requests are not limited.
+    - owns_transport (bool): Whether closing this transport closes the wrapped one.
+    """
+
+    def __init__(
+        self,
+        transport: Transport,
+        bucket: TokenBucket | None,
+        owns_transport: bool = True,
+    ) -> None:
+        """Initialize a new RateLimitedTransport instance.
+
+        Parameters:
+        - transport (Transport): The transport doing the actual requests.
+        - bucket (TokenBucket | None): The request budget. If None, requests are not limited.
+        - owns_transport (bool): Whether closing this transport closes the wrapped one.
+        """
+        self.transport = transport
+        self.bucket = bucket
+        self.owns_transport = owns_transport
+
+    @property
+    def session(self) -> Any:
+        """Return the session of the wrapped transport, if it has one."""
+        return getattr(self.transport, "session", None)
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        *,
+        data: str | bytes | Any | None = None,
+        params: str | None = None,
+        headers: Mapping[str, str] | None = None,
+        auth: tuple[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> Response:
+        """Wait for a token, then forward the request.
+
+        Parameters:
+        - method (str): The HTTP method, in lowercase (e.g. 'get').
+        - url (str): The full URL of the request, without the query string.
+        - data (str | bytes | Any | None): The request body.
+        - params (str | None): The encoded query string.
+        - headers (Mapping[str, str] | None): The request headers.
+        - auth (tuple[str, str] | None): The basic authentication credentials.
+        - timeout (float | None): The timeout of the request in seconds, also bounding the wait for a token.
+
+        Returns:
+        - Response: The response of the wrapped transport.
+
+        Raises:
+        - TimeoutError: If no token became available within `timeout`.
+        """
+        if self.bucket is not None and not self.bucket.acquire(timeout=timeout):
+            msg = "Timed out waiting for the request budget"
+            raise TimeoutError(msg)
+        return self.transport.send(
+            method,
+            url,
+            data=data,
+            params=params,
+            headers=headers,
+            auth=auth,
+            timeout=timeout,
+        )
+
+    def close(self) -> None:
+        """Close the wrapped transport, if this transport owns it."""
+        if self.owns_transport:
+            self.transport.close()
+
+
+class ClientPool:
+    """Hand out per-account clients sharing one connection pool.
+
+    Clients are keyed by API key. Every client sends its requests through the
+    pool's shared transport, optionally through a per-account token bucket.
+    The shared session neither stores nor sends cookies, so a cookie set for
+    one account is never replayed for another.
+    Only the `max_clients` most recently used clients are kept; an evicted
+    account gets a new client on its next use. The token buckets are kept
+    apart from the clients, keyed by API key, so the new client shares the
+    budget left by the evicted one; buckets are pruned once they are full
+    again and their account has no kept client. Closing a client handed out by
+    the pool does not close the shared connections; close the pool instead.
+
+    Attributes:
+    - transport (Transport): The transport shared by every account.
+    - max_clients (int): The largest number of clients kept.
+    - rate (float | None): The default budget of an account, in requests per second.
+    - burst (float | None): The default number of requests an account may send at once.
+    - evicted (int): The number of clients dropped to stay within `max_clients`.
+    """
+
+    def __init__(
+        self,
+        max_clients: int = 1024,
+        rate: float | None = None,
+        burst: float | None = None,
+        transport: Transport | None = None,
+        **client_kwargs: Any,
+    ) -> None:
+        """Initialize a new ClientPool instance.
+
+        Parameters:
+        - max_clients (int): The largest number of clients kept.
+        - rate (float | None): The default budget of an account, in requests per second. If None, requests are not limited.
+        - burst (float | None): The default number of requests an account may send at once. Defaults to `rate`.
+        - transport (Transport | None): The shared transport. Defaults to a `RequestsTransport` sized by the `pool_connections`, `pool_maxsize` and `pool_block` options.
+        - **client_kwargs (Any): Options passed to every `Client`, such as `version` or `api_url`.
+
+        Raises:
+        - ValueError: If `max_clients` is not positive.
+        """
+        if max_clients < 1:
+            msg = "max_clients must be positive"
+            raise ValueError(msg)
+        self.max_clients = max_clients
+        self.rate = rate
+        self.burst = burst
+        self.transport: Transport = transport or RequestsTransport(
+            pool_connections=client_kwargs.pop(
+                "pool_connections",
+                Client.DEFAULT_POOL_CONNECTIONS,
+            ),
+            pool_maxsize=client_kwargs.pop("pool_maxsize", Client.DEFAULT_POOL_MAXSIZE),
+            pool_block=client_kwargs.pop("pool_block", False),
+        )
+        session = getattr(self.transport, "session", None)
+        if session is not None and hasattr(session, "cookies"):
+            session.cookies.set_policy(_NO_COOKIES)
+            session.cookies.clear()
+        self._client_kwargs = client_kwargs
+        self._clients: OrderedDict[str, Client] = OrderedDict()
+        self._buckets: dict[str, TokenBucket] = {}
+        self._prune_at = max_clients
+        self._lock = threading.Lock()
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        """Return the number of clients currently kept."""
+        return len(self._clients)
+
+    def __contains__(self, api_key: object) -> bool:
+        """Return whether a client is kept for an API key."""
+        return api_key in self._clients
+
+    def __enter__(self) -> ClientPool:  # noqa: PYI034
+        """Return the pool itself when used as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the shared connections when leaving the context."""
+        self.close()
+
+    def get(
+        self,
+        auth: tuple[str, str],
+        rate: float | None = None,
+        burst: float | None = None,
+    ) -> Client:
+        """Return the client of an account, creating it if needed.
+
+        Parameters:
+        - auth (tuple[str, str]): The API key and secret of the account.
+        - rate (float | None): The budget of the account, in requests per second, if it differs from the pool default. Only used when the budget is created.
+        - burst (float | None): The number of requests the account may send at once. Only used when the budget is created.
+
+        Returns:
+        - Client: The client of the account.
+        """
+        api_key = auth[0]
+        with self._lock:
+            client = self._clients.get(api_key)
+            if client is not None and client.auth == auth:
+                self._clients.move_to_end(api_key)
+                return client
+            client = self._make_client(auth, rate, burst)
+            self._clients[api_key] = client
+            self._clients.move_to_end(api_key)
+            while len(self._clients) > self.max_clients:
+                self._clients.popitem(last=False)
+                self.evicted += 1
+            return client
+
+    def _make_client(
+        self,
+        auth: tuple[str, str],
+        rate: float | None,
+        burst: float | None,
+    ) -> Client:
+        transport = RateLimitedTransport(
+            self.transport,
+            self._bucket(auth[0], rate, burst),
+            owns_transport=False,
+        )
+        return Client(auth=auth, transport=transport, **self._client_kwargs)
+
+    def _bucket(
+        self,
+        api_key: str,
+        rate: float | None,
+        burst: float | None,
+    ) -> TokenBucket | None:
+        bucket = self._buckets.get(api_key)
+        if bucket is not None:
+            return bucket
+        rate = rate if rate is not None else self.rate
+        if rate is None:
+            return None
+        burst = burst if burst is not None else self.burst
+        if len(self._buckets) >= self._prune_at:
+            self._prune_buckets()
+        bucket = self._buckets[api_key] = TokenBucket(rate, burst)
+        return bucket
+
+    def _prune_buckets(self) -> None:
+        # A full bucket is no different from a new one, so it can be dropped
+        # unless a kept client still uses it.
+        for api_key, bucket in list(self._buckets.items()):
+            if api_key not in self._clients and bucket.tokens >= bucket.capacity:
+                del self._buckets[api_key]
+        self._prune_at = max(self.max_clients, 2 * len(self._buckets))
+
+    def discard(self, api_key: str) -> None:
+        """Forget the client and budget of an account, e.g. when its keys are revoked.
+
+        Parameters:
+        - api_key (str): The API key of the account.
+        """
+        with self._lock:
+            self._clients.pop(api_key, None)
+            self._buckets.pop(api_key, None)
+
+    def close(self) -> None:
+        """Forget every client and close the shared connections."""
+        with self._lock:
+            self._clients.clear()
+            self._buckets.clear()
+        self.transport.close()
@@ -0,0 +1,366 @@
+"""Load generation against the Mailjet API or a local stand-in.
+
+Run `python -m mailjet_rest.bench --help` for the options. The benchmark drives
+`Client` from a pool of worker threads for a fixed duration (or number of
+requests) and reports latency percentiles, throughput and a breakdown of the
+errors, as text or JSON:
+
+    python -m mailjet_rest.bench --scenario mixed --concurrency 32 --duration 10
+
+Without `--api-url`, a `MockMailjetServer` is started on a local port, so that
+the client configuration (pool sizes, compression...) can be measured without
+touching the real API. Pass `--api-url` to target another stand-in; the real
+API is only reached with `--api-url https://api.mailjet.com/`, using the
+credentials from `MJ_APIKEY_PUBLIC` and `MJ_APIKEY_PRIVATE`.
+
+Classes:
+    - BenchResult: The measurements of a benchmark run.
+
+Functions:
+    - percentile: Return a percentile of sorted values.
+    - run: Run a scenario and return its measurements.
+    - main: The command line entry point.
+
+Attributes:
+    - SCENARIOS (tuple[str, ...]): The supported scenarios.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass
+from dataclasses import field
+from typing import TYPE_CHECKING
+from typing import Any
+
+from mailjet_rest.client import Client
+from mailjet_rest.testing import MockMailjet
+from mailjet_rest.testing import MockMailjetServer
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Sequence
+
+    from requests.models import Response  # type: ignore[import-untyped]
+
+
+SCENARIOS: tuple[str, ...] = ("send", "read", "mixed")
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Return a percentile of sorted values, by the nearest-rank method.
+
+    Parameters:
+    - values (Sequence[float]): The values, in ascending order.
+    - q (float): The percentile, between 0 and 100.
+
+    Returns:
+    - float: The percentile, or 0.0 if there are no values.
+    """
+    if not values:
+        return 0.0
+    rank = max(1, -(-len(values) * q // 100))
+    return values[min(int(rank), len(values)) - 1]
+
+
+@dataclass
+class BenchResult:
+    """The measurements of a benchmark run.
+
+    Attributes:
+    - scenario (str): The scenario that ran.
+    - concurrency (int): The number of worker threads.
+    - elapsed (float): The wall-clock duration of the run, in seconds.
+    - latencies (list[float]): The latency of every request, in seconds.
+    - errors (Counter[str]): The failed requests, by HTTP status or exception type.
+    """
+
+    scenario: str
+    concurrency: int
+    elapsed: float = 0.0
+    latencies: list[float] = field(default_factory=list)
+    errors: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def requests(self) -> int:
+        """Return the number of requests sent."""
+        return len(self.latencies)
+
+    @property
+    def throughput(self) -> float:
+        """Return the number of requests completed per second."""
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> dict[str, Any]:
+        """Return the measurements as a JSON-serializable dict.
+
+        Returns:
+        - dict[str, Any]: The counts, throughput, latency percentiles (in milliseconds) and errors.
+        """
+        latencies = sorted(self.latencies)
+        return {
+            "scenario": self.scenario,
+            "concurrency": self.concurrency,
+            "duration_s": round(self.elapsed, 3),
+            "requests": self.requests,
+            "errors": sum(self.errors.values()),
+            "throughput_rps": round(self.throughput, 1),
+            "latency_ms": {
+                name: round(percentile(latencies, q) * 1000, 2)
+                for name, q in (("p50", 50), ("p95", 95), ("p99", 99), ("max", 100))
+            },
+            "error_breakdown": dict(self.errors.most_common()),
+        }
+
+    def format(self) -> str:
+        """Render the measurements as text.
+
+        Returns:
+        - str: A short multi-line report.
+        """
+        summary = self.summary()
+        requests = (
+            f"{summary['requests']} in {summary['duration_s']:.2f}s, "
+            f"{summary['errors']} errors"
+        )
+        percentiles = ", ".join(
+            f"{name} {value:.2f} ms" for name, value in summary["latency_ms"].items()
+        )
+        lines = [
+            f"scenario:    {self.scenario} ({self.concurrency} workers)",
+            f"requests:    {requests}",
+            f"throughput:  {summary['throughput_rps']:.1f} req/s",
+            f"latency:     {percentiles}",
+        ]
+        if self.errors:
+            lines.append("errors:")
+            lines += [
+                f"  {name}: {count}"
+                for name, count in summary["error_breakdown"].items()
+            ]
+        return "\n".join(lines)
+
+
+def _operations(
+    scenario: str,
+    client: Client,
+    send_client: Client,
+    page_size: int,
+    pages: int,
+) -> Callable[[int], Response]:
+    """Return the request made at each step of a scenario."""
+
+    def send(step: int) -> Response:
+        return send_client.send.create(
+            data={
+                "Messages": [
+                    {
+                        "From": {"Email": "bench@example.com"},
+                        "To": [{"Email": f"recipient{step}@example.com"}],
+                        "Subject": "Benchmark",
+                        "TextPart": "Benchmark message",
+                        "CustomID": f"bench-{step}",
+                    },
+                ],
+            },
+        )
+
+    def read(step: int) -> Response:
+        return client.contact.get(
+            filters={"Limit": page_size, "Offset": (step % pages) * page_size},
+        )
+
+    if scenario == "send":
+        return send
+    if scenario == "read":
+        return read
+    # Mixed: one send for every three page reads.
+    return lambda step: send(step) if step % 4 == 0 else read(step)
+
+
+def run(
+    client: Client,
+    scenario: str = "mixed",
+    concurrency: int = 8,
+    duration: float = 10.0,
+    max_requests: int | None = None,
+    page_size: int = 100,
+    pages: int = 10,
+    send_client: Client | None = None,
+) -> BenchResult:
+    """Run a scenario and return its measurements.
+
+    Parameters:
+    - client (Client): The client used for the v3 reads.
+    - scenario (str): One of `SCENARIOS`.
+    - concurrency (int): The number of worker threads sending requests.
+    - duration (float): How long to send requests, in seconds.
+    - max_requests (int | None): Stop after this many requests, if set, even before `duration`.
+    - page_size (int): The `Limit` of the paginated reads.
+    - pages (int): The number of distinct pages the reads cycle through.
+    - send_client (Client | None): The client used for the v3.1 sends. Defaults to a v3.1 client sharing the transport of `client`.
+
+    Returns:
+    - BenchResult: The measurements.
+
+    Raises:
+    - ValueError: If the scenario is unknown.
+    """
+    if scenario not in SCENARIOS:
+        msg = f"Unknown scenario: {scenario}"
+        raise ValueError(msg)
+    if send_client is None:
+        send_client = Client(
+            auth=client.auth,
+            version="v3.1",
+            api_url=client.config.api_url,
+            transport=client.transport,
+        )
+    operation = _operations(scenario, client, send_client, page_size, pages)
+    result = BenchResult(scenario, concurrency)
+    steps = itertools.count()
+    lock = threading.Lock()
+
+    def worker(deadline: float) -> None:
+        latencies: list[float] = []
+        errors: Counter[str] = Counter()
+        while time.perf_counter() < deadline:
+            with lock:
+                step = next(steps)
+            if max_requests is not None and step >= max_requests:
+                break
+            started = time.perf_counter()
+            try:
+                response = operation(step)
+            except Exception as err:  # noqa: BLE001
+                errors[type(err).__name__] += 1
+            else:
+                if not 200 <= response.status_code < 300:
+                    errors[f"HTTP {response.status_code}"] += 1
+            latencies.append(time.perf_counter() - started)
+        with lock:
+            result.latencies.extend(latencies)
+            result.errors.update(errors)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [
+            executor.submit(worker, started + duration) for _ in range(concurrency)
+        ]:
+            future.result()
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m mailjet_rest.bench",
+        description="Measure the request throughput and latency of the client.",
+    )
+    parser.add_argument(
+        "--api-url",
+        help="base URL of the API; defaults to a mock server started locally",
+    )
+    parser.add_argument("--scenario", choices=SCENARIOS, default="mixed")
+    parser.add_argument("--concurrency", type=int, default=8, help="worker threads")
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=10.0,
+        help="seconds to run (default: 10)",
+    )
+    parser.add_argument(
+        "--requests",
+        type=int,
+        help="stop after this many requests",
+    )
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument(
+        "--pool-maxsize",
+        type=int,
+        help="connections kept per host (default: the concurrency)",
+    )
+    parser.add_argument(
+        "--mock-latency",
+        type=float,
+        default=0.0,
+        help="simulated latency of the local mock server, in seconds",
+    )
+    parser.add_argument(
+        "--mock-throttle-rate",
+        type=float,
+        default=0.0,
+        help="share of requests the local mock server answers with 429",
+    )
+    parser.add_argument("--format", choices=("text", "json"), default="text")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the benchmark from the command line.
+
+    Parameters:
+    - argv (Sequence[str] | None): The arguments. Defaults to `sys.argv[1:]`.
+
+    Returns:
+    - int: The exit status: 0, or 1 if every request failed.
+    """
+    args = _parser().parse_args(argv)
+    auth = (
+        os.environ.get("MJ_APIKEY_PUBLIC", "key"),
+        os.environ.get("MJ_APIKEY_PRIVATE", "secret"),
+    )
+    with ExitStack() as stack:
+        api_url = args.api_url
+        if api_url is None:
+            mock = MockMailjet(
+                latency=args.mock_latency,
+                throttle_rate=args.mock_throttle_rate,
+            )
+            mock.seed(
+                "contact",
+                (
+                    {"Email": f"contact{i}@example.com"}
+                    for i in range(args.page_size * args.pages)
+                ),
+            )
+            server = stack.enter_context(MockMailjetServer(mock))
+            api_url = server.url
+        client = stack.enter_context(
+            Client(
+                auth=auth,
+                api_url=api_url,
+                pool_maxsize=args.pool_maxsize or args.concurrency,
+            ),
+        )
+        result = run(
+            client,
+            scenario=args.scenario,
+            concurrency=args.concurrency,
+            duration=args.duration,
+            max_requests=args.requests,
+            page_size=args.page_size,
+            pages=args.pages,
+        )
+    if args.format == "json":
+        sys.stdout.write(json.dumps(result.summary(), indent=2) + "\n")
+    else:
+        sys.stdout.write(result.format() + "\n")
+    return (
+        1 if result.requests and sum(result.errors.values()) == result.requests else 0
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
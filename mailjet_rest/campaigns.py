@@ -0,0 +1,471 @@
+"""Pipelined creation and sending of many campaign drafts.
+
+Launching a campaign takes several dependent calls: `campaigndraft` creates
+the draft, `campaigndraft_detailcontent` sets its content, and optionally
+`campaigndraft_test` sends a test, then `campaigndraft_schedule` or
+`campaigndraft_send` launches it. `CampaignWorkflow` runs these steps for
+many drafts at once: each draft moves through its steps in order, while the
+steps of different drafts run concurrently on a thread pool, so one draft's
+content upload overlaps with another draft's creation.
+
+Progress is checkpointed in SQLite after every step. When a run fails part
+way, running the same drafts again against the same checkpoint file reuses
+the draft IDs already created and resumes each draft at its first unfinished
+step.
+
+Creating, scheduling and sending a draft are not idempotent, so the intent to
+run them is checkpointed before the call. If a run stops after such a call
+without knowing its result (a timeout, a crash), the next run first checks
+whether it was applied: before creating the draft again, it looks for a draft
+with the same `Title`, still in draft status and created after the intent was
+checkpointed; before scheduling or sending it again, it reads its status.
+
+Classes:
+    - CampaignSpec: The description of one campaign draft to launch.
+    - DraftOutcome: The state of one draft after a run.
+    - WorkflowResult: The outcomes of every draft of a run.
+    - CampaignWorkflow: Runs the steps of many drafts concurrently.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from dataclasses import dataclass
+from dataclasses import field
+from dataclasses import replace
+from datetime import datetime
+from datetime import timezone
+from typing import TYPE_CHECKING
+from typing import Any
+
+from mailjet_rest.client import ApiError
+from mailjet_rest.utils.pagination import iter_records
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+    from requests.models import Response  # type: ignore[import-untyped]
+
+    from mailjet_rest.client import Client
+    from mailjet_rest.concurrency import AIMDLimiter
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS campaign_drafts (
+    key TEXT PRIMARY KEY,
+    draft_id INTEGER,
+    completed TEXT NOT NULL,
+    error TEXT,
+    pending TEXT,
+    pending_since REAL
+);
+"""
+_MIGRATIONS = {
+    "pending": "ALTER TABLE campaign_drafts ADD COLUMN pending TEXT",
+    "pending_since": "ALTER TABLE campaign_drafts ADD COLUMN pending_since REAL",
+}
+_UNSAFE_STEPS = frozenset({"create", "schedule", "send"})
+_UNLAUNCHED_STATUSES = frozenset({0, "0", "draft", "Draft"})
+# Allowed difference, in seconds, between the local clock and the `CreatedAt`
+# dates of the API when looking for a draft created by an unconfirmed call.
+_CLOCK_TOLERANCE = 60.0
+
+
+@dataclass(frozen=True)
+class CampaignSpec:
+    """The description of one campaign draft to launch.
+
+    Attributes:
+    - key (str): A unique name of the draft within the workflow, e.g. its locale. Used to resume runs.
+    - draft (dict[str, Any]): The `campaigndraft` payload (Locale, Sender, SenderEmail, Subject, ContactsListID, Title...).
+    - content (dict[str, Any]): The `campaigndraft_detailcontent` payload (Html-part, Text-part...).
+    - test_recipients (list[dict[str, str]] | None): The recipients of a test send, if any.
+    - schedule (str | None): The date to schedule the campaign at, in ISO 8601 format, if any.
+    - send_now (bool): Whether to send the campaign right away. Ignored when `schedule` is set.
+    """
+
+    key: str
+    draft: dict[str, Any]
+    content: dict[str, Any]
+    test_recipients: list[dict[str, str]] | None = None
+    schedule: str | None = None
+    send_now: bool = False
+
+    @property
+    def steps(self) -> tuple[str, ...]:
+        """Return the steps of this draft, in order."""
+        steps = ["create", "content"]
+        if self.test_recipients:
+            steps.append("test")
+        if self.schedule is not None:
+            steps.append("schedule")
+        elif self.send_now:
+            steps.append("send")
+        return tuple(steps)
+
+
+@dataclass(frozen=True)
+class DraftOutcome:
+    """The state of one draft after a run.
+
+    Attributes:
+    - key (str): The key of the draft.
+    - draft_id (int | None): The ID of the created draft, if it was created.
+    - completed (tuple[str, ...]): The steps done so far, including in previous runs.
+    - error (str | None): The error that stopped the draft, if any.
+    - pending (str | None): The non-idempotent step started without a known result, if any.
+    - pending_since (float | None): When the pending step was started, as a Unix timestamp.
+    """
+
+    key: str
+    draft_id: int | None
+    completed: tuple[str, ...]
+    error: str | None = None
+    pending: str | None = None
+    pending_since: float | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Return whether the draft went through without error."""
+        return self.error is None
+
+
+@dataclass(frozen=True)
+class WorkflowResult:
+    """The outcomes of every draft of a run.
+
+    Attributes:
+    - outcomes (dict[str, DraftOutcome]): The outcome of each draft, by key.
+    """
+
+    outcomes: dict[str, DraftOutcome] = field(default_factory=dict)
+
+    @property
+    def succeeded(self) -> list[DraftOutcome]:
+        """Return the outcomes of the drafts that went through all their steps."""
+        return [outcome for outcome in self.outcomes.values() if outcome.ok]
+
+    @property
+    def failed(self) -> list[DraftOutcome]:
+        """Return the outcomes of the drafts stopped by an error."""
+        return [outcome for outcome in self.outcomes.values() if not outcome.ok]
+
+
+def _timestamp(value: Any) -> float | None:
+    """Return the Unix timestamp of an ISO 8601 date of the API, if it is one."""
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        date = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return date.timestamp()
+
+
+class CampaignWorkflow:
+    """Create, fill, test and launch many campaign drafts concurrently.
+
+    A failing step stops its draft only; the other drafts carry on. Failures
+    are recorded in the checkpoint, and the next `run` retries each failed
+    draft from the step that failed.
+
+    The instance can be shared between threads: every database access is
+    serialised by an internal lock.
+
+    Attributes:
+    - client (Client): The client used to call the API (version v3).
+    - max_workers (int): The largest number of steps running at once.
+    - limiter (AIMDLimiter | None): An adaptive concurrency limit applied to every step, if set.
+
+    Example:
+        workflow = CampaignWorkflow(client, "campaigns.sqlite")
+        result = workflow.run(specs)
+        for outcome in result.failed:
+            print(outcome.key, outcome.error)
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        path: str | Path = ":memory:",
+        max_workers: int = 8,
+        limiter: AIMDLimiter | None = None,
+    ) -> None:
+        """Initialize a new CampaignWorkflow instance.
+
+        Parameters:
+        - client (Client): The client used to call the API (version v3).
+        - path (str | Path): The SQLite checkpoint file. Defaults to an in-memory database.
+        - max_workers (int): The largest number of steps running at once.
+        - limiter (AIMDLimiter | None): An adaptive concurrency limit applied to every step, if set.
+        """
+        self.client = client
+        self.max_workers = max_workers
+        self.limiter = limiter
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        columns = {
+            row[1] for row in self._conn.execute("PRAGMA table_info(campaign_drafts)")
+        }
+        with self._conn:
+            for column, statement in _MIGRATIONS.items():
+                if column not in columns:
+                    self._conn.execute(statement)
+
+    def close(self) -> None:
+        """Close the checkpoint database."""
+        with self._lock:
+            self._conn.close()
+
+    def outcome(self, key: str) -> DraftOutcome | None:
+        """Return the checkpointed state of a draft.
+
+        Parameters:
+        - key (str): The key of the draft.
+
+        Returns:
+        - DraftOutcome | None: The state of the draft, or None if it never ran.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT draft_id, completed, error, pending, pending_since "
+                "FROM campaign_drafts WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        return DraftOutcome(
+            key,
+            row[0],
+            tuple(json.loads(row[1])),
+            row[2],
+            row[3],
+            row[4],
+        )
+
+    def _save(self, outcome: DraftOutcome) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO campaign_drafts "
+                "(key, draft_id, completed, error, pending, pending_since) "
+                "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET "
+                "draft_id = excluded.draft_id, completed = excluded.completed, "
+                "error = excluded.error, pending = excluded.pending, "
+                "pending_since = excluded.pending_since",
+                (
+                    outcome.key,
+                    outcome.draft_id,
+                    json.dumps(list(outcome.completed)),
+                    outcome.error,
+                    outcome.pending,
+                    outcome.pending_since,
+                ),
+            )
+
+    def _call(self, spec: CampaignSpec, step: str, draft_id: int | None) -> Response:
+        if step == "create":
+            return self.client.campaigndraft.create(data=spec.draft)
+        if step == "content":
+            return self.client.campaigndraft_detailcontent.create(
+                id=draft_id,
+                data=spec.content,
+            )
+        if step == "test":
+            return self.client.campaigndraft_test.create(
+                id=draft_id,
+                data={"Recipients": spec.test_recipients},
+            )
+        if step == "schedule":
+            return self.client.campaigndraft_schedule.create(
+                id=draft_id,
+                data={"Date": spec.schedule},
+            )
+        return self.client.campaigndraft_send.create(id=draft_id)
+
+    def _execute(self, spec: CampaignSpec, step: str, draft_id: int | None) -> int:
+        """Call the API for one step of a draft.
+
+        Parameters:
+        - spec (CampaignSpec): The draft.
+        - step (str): The step to run.
+        - draft_id (int | None): The ID of the draft, once created.
+
+        Returns:
+        - int: The ID of the draft.
+
+        Raises:
+        - ApiError: If the API does not accept the step.
+        """
+        if self.limiter is None:
+            response = self._call(spec, step, draft_id)
+        else:
+            with self.limiter.slot() as slot:
+                response = self._call(spec, step, draft_id)
+                slot.record(response)
+        if not 200 <= response.status_code < 300:
+            msg = f"{step} failed: HTTP {response.status_code} {response.text}"
+            raise ApiError(msg, status_code=response.status_code, response=response)
+        if step == "create":
+            return int(response.json()["Data"][0]["ID"])
+        if draft_id is None:
+            msg = f"{step} needs a draft ID, but the draft was not created"
+            raise RuntimeError(msg)
+        return draft_id
+
+    def _recover(self, spec: CampaignSpec, state: DraftOutcome) -> int | None:
+        """Check whether the pending step of a previous run was applied.
+
+        A pending `create` is looked up among the drafts still in draft status,
+        newest first, down to the time the intent was checkpointed: a draft
+        with the same `Title` created since then is the one the previous run
+        created.
+
+        Parameters:
+        - spec (CampaignSpec): The draft.
+        - state (DraftOutcome): The checkpointed state of the draft.
+
+        Returns:
+        - int | None: The ID of the draft if the step was applied, None if it must run again.
+
+        Raises:
+        - ApiError: If the draft cannot be looked up, or several drafts match.
+        """
+        step = state.pending
+        if step == "create":
+            title = spec.draft.get("Title")
+            if not title or state.pending_since is None:
+                msg = (
+                    "create may have succeeded in a previous run, and the draft "
+                    "cannot be looked up by its Title and creation time"
+                )
+                raise ApiError(msg)
+            filters: dict[str, Any] = {"Status": 0, "Sort": "ID DESC"}
+            if "ContactsListID" in spec.draft:
+                filters["ContactsList"] = spec.draft["ContactsListID"]
+            since = state.pending_since - _CLOCK_TOLERANCE
+            matches = []
+            for draft in iter_records(self.client.campaigndraft, filters=filters):
+                created = _timestamp(draft.get("CreatedAt"))
+                if created is not None and created < since:
+                    break
+                if draft.get("Title") == title and created is not None:
+                    matches.append(int(draft["ID"]))
+            if len(matches) > 1:
+                msg = (
+                    f"create may have succeeded in a previous run, and drafts "
+                    f"{sorted(matches)} all match it"
+                )
+                raise ApiError(msg)
+            return matches[0] if matches else None
+        response = self.client.campaigndraft.get(id=state.draft_id)
+        if response.status_code != 200:
+            msg = f"{step} check failed: HTTP {response.status_code} {response.text}"
+            raise ApiError(msg, status_code=response.status_code, response=response)
+        status = response.json()["Data"][0].get("Status")
+        return None if status in _UNLAUNCHED_STATUSES else state.draft_id
+
+    def _run_step(self, spec: CampaignSpec, state: DraftOutcome) -> DraftOutcome:
+        """Run the next step of a draft and checkpoint the new state.
+
+        Parameters:
+        - spec (CampaignSpec): The draft.
+        - state (DraftOutcome): The state of the draft before the step.
+
+        Returns:
+        - DraftOutcome: The state of the draft after the step.
+        """
+        step = next(s for s in spec.steps if s not in state.completed)
+        pending, pending_since = None, None
+        try:
+            draft_id = None
+            if state.pending == step:
+                draft_id = self._recover(spec, state)
+            if draft_id is None:
+                if step in _UNSAFE_STEPS:
+                    pending, pending_since = step, time.time()
+                    self._save(
+                        replace(
+                            state,
+                            error=None,
+                            pending=step,
+                            pending_since=pending_since,
+                        ),
+                    )
+                draft_id = self._execute(spec, step, state.draft_id)
+        except Exception as err:  # noqa: BLE001
+            refused = isinstance(err, ApiError) and err.status_code is not None
+            if refused:
+                pending, pending_since = None, None
+            elif pending is None:
+                pending, pending_since = state.pending, state.pending_since
+            outcome = DraftOutcome(
+                spec.key,
+                state.draft_id,
+                state.completed,
+                str(err) or type(err).__name__,
+                pending,
+                pending_since,
+            )
+        else:
+            outcome = DraftOutcome(spec.key, draft_id, (*state.completed, step))
+        self._save(outcome)
+        return outcome
+
+    def run(self, specs: Iterable[CampaignSpec]) -> WorkflowResult:
+        """Run every unfinished step of the drafts.
+
+        Drafts whose steps were all completed in a previous run are not called
+        again. Drafts that failed previously are retried from their failed step.
+
+        Parameters:
+        - specs (Iterable[CampaignSpec]): The drafts, with unique keys.
+
+        Returns:
+        - WorkflowResult: The outcome of every draft.
+
+        Raises:
+        - ValueError: If two drafts share the same key.
+        """
+        specs = list(specs)
+        keys = [spec.key for spec in specs]
+        if len(set(keys)) != len(keys):
+            msg = "campaign keys must be unique"
+            raise ValueError(msg)
+        outcomes: dict[str, DraftOutcome] = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending: dict[Future[DraftOutcome], CampaignSpec] = {}
+            for spec in specs:
+                previous = self.outcome(spec.key)
+                state = DraftOutcome(
+                    spec.key,
+                    previous.draft_id if previous else None,
+                    previous.completed if previous else (),
+                    pending=previous.pending if previous else None,
+                    pending_since=previous.pending_since if previous else None,
+                )
+                if set(spec.steps) <= set(state.completed):
+                    outcomes[spec.key] = state
+                else:
+                    pending[executor.submit(self._run_step, spec, state)] = spec
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    spec = pending.pop(future)
+                    state = future.result()
+                    if state.ok and not set(spec.steps) <= set(state.completed):
+                        pending[executor.submit(self._run_step, spec, state)] = spec
+                    else:
+                        outcomes[spec.key] = state
+        return WorkflowResult({key: outcomes[key] for key in keys})
@@ -0,0 +1,297 @@
+"""Record and replay HTTP interactions of a Mailjet client.
+
+`RecordingTransport` wraps another transport and captures every request and
+response sent through a `Client` into a compact JSON-lines cassette (gzipped
+when the file name ends with `.gz`). `ReplayTransport` serves the recorded
+responses back without any network access, optionally with simulated latency
+and jitter, so that performance tests of pagination, bulk sends or imports are
+realistic and deterministic offline.
+
+Credentials are never written to cassettes: request headers and the basic
+authentication tuple are not recorded, and request bodies are only stored as
+a digest used for matching.
+
+Classes:
+    - CassetteMissError: Raised when a replayed request was not recorded.
+    - RecordingTransport: Captures interactions while forwarding them.
+    - ReplayTransport: Serves recorded interactions.
+"""
+
+from __future__ import annotations
+
+import base64
+import gzip
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import IO
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import cast
+
+from mailjet_rest.transport import Transport
+from mailjet_rest.transport import make_response
+
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from requests.models import Response  # type: ignore[import-untyped]
+
+
+_RESPONSE_HEADERS = ("Content-Type", "X-MJ-Request-GUID")
+
+
+class CassetteMissError(LookupError):
+    """Error raised when a replayed request has no recorded interaction."""
+
+
+def _open(path: Path, mode: str) -> IO[str]:
+    if path.suffix == ".gz":
+        return cast("IO[str]", gzip.open(path, mode + "t", encoding="utf-8"))
+    return path.open(mode, encoding="utf-8")
+
+
+def _body_digest(data: str | bytes | Any | None) -> str | None:
+    if data is None:
+        return None
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    elif not isinstance(data, (bytes, bytearray, memoryview)):
+        return None
+    return hashlib.sha1(data).hexdigest()  # noqa: S324
+
+
+def _key(
+    method: str,
+    url: str,
+    params: str | None,
+    body_digest: str | None,
+    match_body: bool,
+) -> tuple[str, ...]:
+    full_url = f"{url}?{params}" if params else url
+    if match_body:
+        return (method.lower(), full_url, body_digest or "")
+    return (method.lower(), full_url)
+
+
+class RecordingTransport(Transport):
+    """Forward requests to another transport and record the interactions.
+
+    Interactions are kept in memory and written by `save` or `close`.
+
+    Attributes:
+    - transport (Transport): The transport doing the actual requests.
+    - path (Path): The cassette file.
+    - interactions (list[dict[str, Any]]): The interactions recorded so far.
+    """
+
+    def __init__(self, transport: Transport, path: str | Path) -> None:
+        """Initialize a new RecordingTransport instance.
+
+        Parameters:
+        - transport (Transport): The transport doing the actual requests.
+        - path (str | Path): The cassette file; a `.gz` suffix enables compression.
+        """
+        self.transport = transport
+        self.path = Path(path)
+        self.interactions: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        *,
+        data: str | bytes | Any | None = None,
+        params: str | None = None,
+        headers: Mapping[str, str] | None = None,
+        auth: tuple[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> Response:
+        """Forward a request and record it with its response.
+
+        Parameters:
+        - method (str): The HTTP method, in lowercase (e.g. 'get').
+        - url (str): The full URL of the request, without the query string.
+        - data (str | bytes | Any | None): The request body.
+        - params (str | None): The encoded query string.
+        - headers (Mapping[str, str] | None): The request headers.
+        - auth (tuple[str, str] | None): The basic authentication credentials.
+        - timeout (float | None): The timeout of the request in seconds.
+
+        Returns:
+        - Response: The response of the wrapped transport.
+        """
+        started = time.perf_counter()
+        response = self.transport.send(
+            method,
+            url,
+            data=data,
+            params=params,
+            headers=headers,
+            auth=auth,
+            timeout=timeout,
+        )
+        elapsed = time.perf_counter() - started
+        content: bytes = response.content
+        try:
+            body, encoding = content.decode("utf-8"), "utf-8"
+        except UnicodeDecodeError:
+            body, encoding = base64.b64encode(content).decode("ascii"), "base64"
+        interaction = {
+            "method": method.lower(),
+            "url": url,
+            "params": params,
+            "body_sha1": _body_digest(data),
+            "status": response.status_code,
+            "headers": {
+                name: response.headers[name]
+                for name in _RESPONSE_HEADERS
+                if name in response.headers
+            },
+            "body": body,
+            "encoding": encoding,
+            "elapsed": round(elapsed, 6),
+        }
+        with self._lock:
+            self.interactions.append(interaction)
+        return response
+
+    def save(self) -> None:
+        """Write the recorded interactions to the cassette file."""
+        with self._lock:
+            interactions = list(self.interactions)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with _open(self.path, "w") as cassette:
+            for interaction in interactions:
+                cassette.write(json.dumps(interaction, separators=(",", ":")) + "\n")
+
+    def close(self) -> None:
+        """Save the cassette and close the wrapped transport."""
+        self.save()
+        self.transport.close()
+
+
+class ReplayTransport(Transport):
+    """Serve the interactions of a cassette without network access.
+
+    Requests are matched on method, URL and query string, and also on the
+    request body digest when `match_body` is set. When a request was recorded
+    several times, the recorded responses are served in order and the last one
+    is repeated afterwards.
+
+    Attributes:
+    - latency (float): The simulated latency of every request, in seconds.
+    - jitter (float): The maximum random deviation added to the latency, in seconds.
+    - replayed (int): The number of requests served.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        seed: int | None = None,
+        match_body: bool = False,
+        recorded_latency: bool = False,
+    ) -> None:
+        """Initialize a new ReplayTransport instance.
+
+        Parameters:
+        - path (str | Path): The cassette file.
+        - latency (float): The simulated latency of every request, in seconds.
+        - jitter (float): The maximum random deviation added to the latency, in seconds.
+        - seed (int | None): The seed of the jitter generator, for reproducible runs.
+        - match_body (bool): Whether request bodies must match the recorded ones.
+        - recorded_latency (bool): Whether to replay the recorded durations instead of `latency`.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.match_body = match_body
+        self.recorded_latency = recorded_latency
+        self.replayed = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._interactions: dict[tuple[str, ...], list[dict[str, Any]]] = defaultdict(
+            list,
+        )
+        self._positions: dict[tuple[str, ...], int] = defaultdict(int)
+        with _open(Path(path), "r") as cassette:
+            for line in cassette:
+                if not line.strip():
+                    continue
+                interaction = json.loads(line)
+                key = _key(
+                    interaction["method"],
+                    interaction["url"],
+                    interaction["params"],
+                    interaction["body_sha1"],
+                    match_body,
+                )
+                self._interactions[key].append(interaction)
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        *,
+        data: str | bytes | Any | None = None,
+        params: str | None = None,
+        headers: Mapping[str, str] | None = None,  # noqa: ARG002
+        auth: tuple[str, str] | None = None,  # noqa: ARG002
+        timeout: float | None = None,  # noqa: ARG002
+    ) -> Response:
+        """Serve the recorded response of a request.
+
+        Parameters:
+        - method (str): The HTTP method, in lowercase (e.g. 'get').
+        - url (str): The full URL of the request, without the query string.
+        - data (str | bytes | Any | None): The request body.
+        - params (str | None): The encoded query string.
+        - headers (Mapping[str, str] | None): The request headers.
+        - auth (tuple[str, str] | None): The basic authentication credentials.
+        - timeout (float | None): The timeout of the request in seconds.
+
+        Returns:
+        - Response: The recorded response.
+
+        Raises:
+        - CassetteMissError: If the request was not recorded.
+        """
+        key = _key(method, url, params, _body_digest(data), self.match_body)
+        with self._lock:
+            recorded = self._interactions.get(key)
+            if not recorded:
+                msg = (
+                    f"No recorded interaction for {method.upper()} {url}?{params or ''}"
+                )
+                raise CassetteMissError(msg)
+            position = self._positions[key]
+            self._positions[key] = min(position + 1, len(recorded) - 1)
+            interaction = recorded[position]
+            delay = interaction["elapsed"] if self.recorded_latency else self.latency
+            if self.jitter:
+                delay += self._random.uniform(-self.jitter, self.jitter)
+            self.replayed += 1
+        if delay > 0:
+            time.sleep(delay)
+        if interaction["encoding"] == "base64":
+            content = base64.b64decode(interaction["body"])
+        else:
+            content = interaction["body"].encode("utf-8")
+        full_url = f"{url}?{params}" if params else url
+        return make_response(
+            interaction["status"],
+            content,
+            {
+                name: value
+                for name, value in interaction["headers"].items()
+                if name in _RESPONSE_HEADERS
+            },
+            full_url,
+        )
@@ -0,0 +1,520 @@
+"""Streaming bulk export and import from the command line.
+
+Run `python -m mailjet_rest --help` (or `mailjet-rest --help`) for the options.
+
+- `export <resource>` writes every record of a REST resource to a JSON lines or
+  CSV file. Pages are fetched `--parallel` at a time, ahead of the writer, and
+  written in order as soon as they arrive, so memory stays bounded by the pages
+  in flight whatever the size of the resource.
+- `import <list> <csv>` adds the contacts of a CSV file to a contact list. The
+  file is read in chunks of `--chunk-size` rows; every chunk is uploaded with
+  `contactslist_csvdata` and imported with `csvimport`, `--parallel` chunks at
+  a time, so the file is never loaded whole.
+
+Both report their progress and throughput on stderr. The credentials are read
+from `MJ_APIKEY_PUBLIC` and `MJ_APIKEY_PRIVATE`.
+
+Classes:
+    - Progress: Reports the progress and throughput of a long operation.
+
+Functions:
+    - export_records: Stream the records of a resource to a file.
+    - import_csv: Import a CSV file into a contact list, chunk by chunk.
+    - main: The command line entry point.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import itertools
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import TextIO
+
+from mailjet_rest.client import ApiError
+from mailjet_rest.client import Client
+from mailjet_rest.utils.pagination import MAX_PAGE_SIZE
+
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+    from collections.abc import Mapping
+    from collections.abc import Sequence
+
+    from requests.models import Response  # type: ignore[import-untyped]
+
+
+_FINAL_IMPORT_STATUSES = frozenset({"Completed", "Error", "Abort"})
+
+
+class Progress:
+    """Report the progress and throughput of a long operation.
+
+    Updates are written on one line, at most every `interval` seconds.
+
+    Attributes:
+    - label (str): What is counted, e.g. "records exported".
+    - count (int): The number of items done so far.
+    """
+
+    def __init__(
+        self,
+        label: str,
+        stream: TextIO | None = None,
+        interval: float = 0.5,
+    ) -> None:
+        """Initialize a new Progress instance.
+
+        Parameters:
+        - label (str): What is counted, e.g. "records exported".
+        - stream (TextIO | None): Where to report. If None, nothing is reported.
+        - interval (float): The shortest time between two reports, in seconds.
+        """
+        self.label = label
+        self.count = 0
+        self._stream = stream
+        self._interval = interval
+        self._started = time.monotonic()
+        self._reported = self._started
+
+    @property
+    def rate(self) -> float:
+        """Return the number of items done per second."""
+        elapsed = time.monotonic() - self._started
+        return self.count / elapsed if elapsed > 0 else 0.0
+
+    def update(self, count: int) -> None:
+        """Add items done and report if the interval has passed.
+
+        Parameters:
+        - count (int): The number of items just done.
+        """
+        self.count += count
+        now = time.monotonic()
+        if now - self._reported >= self._interval:
+            self._reported = now
+            self._write("\r")
+
+    def finish(self) -> None:
+        """Report the final count and throughput."""
+        self._write("\r", "\n")
+
+    def _write(self, prefix: str, suffix: str = "") -> None:
+        if self._stream is None:
+            return
+        self._stream.write(
+            f"{prefix}{self.count} {self.label} ({self.rate:.1f}/s){suffix}",
+        )
+        self._stream.flush()
+
+
+def _check(response: Response, what: str) -> Any:
+    if not 200 <= response.status_code < 300:
+        msg = f"{what} failed: HTTP {response.status_code} {response.text}"
+        raise ApiError(msg)
+    return response.json()
+
+
+def _iter_pages_ahead(
+    client: Client,
+    resource: str,
+    filters: Mapping[str, Any],
+    page_size: int,
+    parallel: int,
+) -> Iterator[list[dict[str, Any]]]:
+    """Yield the pages of a resource in order, fetching up to `parallel` pages ahead."""
+    endpoint = getattr(client, resource)
+
+    def fetch(offset: int) -> list[dict[str, Any]]:
+        response = endpoint.get(
+            filters={**filters, "Limit": page_size, "Offset": offset},
+        )
+        body = _check(response, f"page at offset {offset}")
+        data: list[dict[str, Any]] = body.get("Data", [])
+        return data
+
+    offsets = itertools.count(0, page_size)
+    with ThreadPoolExecutor(max_workers=parallel) as executor:
+        window: deque[Future[list[dict[str, Any]]]] = deque(
+            executor.submit(fetch, next(offsets)) for _ in range(parallel)
+        )
+        try:
+            while window:
+                page = window.popleft().result()
+                if page:
+                    yield page
+                if len(page) < page_size:
+                    return
+                window.append(executor.submit(fetch, next(offsets)))
+        finally:
+            for future in window:
+                future.cancel()
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"))
+    return value
+
+
+def _check_header(
+    page: list[dict[str, Any]],
+    header: Collection[str],
+    offset: int,
+) -> None:
+    """Raise a ValueError if a record of the page has a field missing from the header."""
+    known = set(header)
+    for index, record in enumerate(page, offset):
+        missing = [key for key in record if key not in known]
+        if missing:
+            msg = (
+                f"Record {index} has fields missing from the CSV header, which "
+                f"was taken from the first page: {', '.join(missing)}. Pass the "
+                "columns to export explicitly."
+            )
+            raise ValueError(msg)
+
+
+def export_records(
+    client: Client,
+    resource: str,
+    out: TextIO,
+    output_format: str = "jsonl",
+    filters: Mapping[str, Any] | None = None,
+    page_size: int = MAX_PAGE_SIZE,
+    parallel: int = 4,
+    progress: Progress | None = None,
+    columns: Sequence[str] | None = None,
+) -> int:
+    """Stream the records of a resource to a file.
+
+    The CSV columns are `columns` if given, otherwise the fields of the records
+    of the first page, in order of appearance. Without `columns`, a later
+    record with a field missing from the header stops the export rather than
+    losing the field; with `columns`, the other fields are left out.
+
+    Parameters:
+    - client (Client): The client used to call the API (version v3).
+    - resource (str): The resource to export, e.g. "contact" or "listrecipient".
+    - out (TextIO): The file to write to.
+    - output_format (str): "jsonl" (one JSON object per line) or "csv" (nested values as JSON).
+    - filters (Mapping[str, Any] | None): Filters sent with every page request.
+    - page_size (int): The `Limit` of every page request.
+    - parallel (int): The number of pages fetched at once.
+    - progress (Progress | None): Receives the number of records written, if set.
+    - columns (Sequence[str] | None): The CSV columns. Defaults to the fields of the first page.
+
+    Returns:
+    - int: The number of records written.
+
+    Raises:
+    - ApiError: If a page request does not succeed.
+    - ValueError: If the page size or format is not valid, or a record has a field missing
+      from the CSV header inferred from the first page.
+    """
+    if not 1 <= page_size <= MAX_PAGE_SIZE:
+        msg = f"page_size must be between 1 and {MAX_PAGE_SIZE}"
+        raise ValueError(msg)
+    if output_format not in {"jsonl", "csv"}:
+        msg = f"Unknown format: {output_format}"
+        raise ValueError(msg)
+    writer: csv.DictWriter[str] | None = None
+    total = 0
+    for page in _iter_pages_ahead(
+        client,
+        resource,
+        filters or {},
+        page_size,
+        max(1, parallel),
+    ):
+        if output_format == "jsonl":
+            out.writelines(json.dumps(record) + "\n" for record in page)
+        else:
+            if writer is None:
+                header = list(columns or dict.fromkeys(k for r in page for k in r))
+                writer = csv.DictWriter(out, header, extrasaction="ignore")
+                writer.writeheader()
+            if columns is None:
+                _check_header(page, writer.fieldnames, total)
+            writer.writerows(
+                {key: _csv_value(value) for key, value in record.items()}
+                for record in page
+            )
+        total += len(page)
+        if progress is not None:
+            progress.update(len(page))
+    return total
+
+
+def _chunks(source: TextIO, chunk_size: int) -> Iterator[tuple[int, bytes]]:
+    """Yield (row count, CSV bytes with the header) for every chunk of a CSV file."""
+    reader = csv.reader(source)
+    header = next(reader, None)
+    if header is None:
+        return
+    while True:
+        rows = list(itertools.islice(reader, chunk_size))
+        if not rows:
+            return
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(header)
+        writer.writerows(rows)
+        yield len(rows), buffer.getvalue().encode("utf-8")
+
+
+def _import_chunk(
+    client: Client,
+    list_id: str,
+    data: bytes,
+    method: str,
+    wait: bool,
+    poll_interval: float,
+) -> dict[str, Any]:
+    """Upload one CSV chunk, start its import job and return the job."""
+    upload = _check(
+        client.contactslist_csvdata.create(id=list_id, data=data),
+        "CSV upload",
+    )
+    job: dict[str, Any] = _check(
+        client.csvimport.create(
+            data={
+                "ContactsListID": list_id,
+                "DataID": upload["ID"],
+                "Method": method,
+            },
+        ),
+        "CSV import",
+    )["Data"][0]
+    while wait and job.get("Status") not in _FINAL_IMPORT_STATUSES:
+        time.sleep(poll_interval)
+        response = client.csvimport.get(id=job["ID"])
+        job = _check(response, "CSV import status")["Data"][0]
+    return job
+
+
+def import_csv(
+    client: Client,
+    list_id: str | int,
+    source: TextIO,
+    chunk_size: int = 10_000,
+    parallel: int = 2,
+    method: str = "addnoforce",
+    wait: bool = True,
+    poll_interval: float = 2.0,
+    progress: Progress | None = None,
+) -> list[dict[str, Any]]:
+    """Import a CSV file into a contact list, chunk by chunk.
+
+    At most `parallel` chunks are held in memory and in flight at once.
+
+    Parameters:
+    - client (Client): The client used to call the API (version v3).
+    - list_id (str | int): The ID of the contact list.
+    - source (TextIO): The CSV file, with a header row naming the contact properties (including "email").
+    - chunk_size (int): The number of rows uploaded and imported at once.
+    - parallel (int): The number of chunks uploaded and imported at once.
+    - method (str): The `csvimport` method, e.g. "addnoforce", "addforce", "remove" or "unsub".
+    - wait (bool): Whether to wait for every import job to finish.
+    - poll_interval (float): The time between two job status requests, in seconds.
+    - progress (Progress | None): Receives the number of rows sent, if set.
+
+    Returns:
+    - list[dict[str, Any]]: The `csvimport` job of every chunk, in file order.
+
+    Raises:
+    - ApiError: If an upload or import request does not succeed.
+    """
+    jobs: list[dict[str, Any]] = []
+    parallel = max(1, parallel)
+    with ThreadPoolExecutor(max_workers=parallel) as executor:
+        window: deque[tuple[int, Future[dict[str, Any]]]] = deque()
+
+        def collect() -> None:
+            rows, future = window.popleft()
+            jobs.append(future.result())
+            if progress is not None:
+                progress.update(rows)
+
+        for rows, data in _chunks(source, chunk_size):
+            if len(window) >= parallel:
+                collect()
+            window.append(
+                (
+                    rows,
+                    executor.submit(
+                        _import_chunk,
+                        client,
+                        str(list_id),
+                        data,
+                        method,
+                        wait,
+                        poll_interval,
+                    ),
+                ),
+            )
+        while window:
+            collect()
+    return jobs
+
+
+def _filters(pairs: Iterable[str]) -> dict[str, str]:
+    filters = {}
+    for pair in pairs:
+        key, sep, value = pair.partition("=")
+        if not sep:
+            msg = f"filters must look like Key=Value, got {pair!r}"
+            raise argparse.ArgumentTypeError(msg)
+        filters[key] = value
+    return filters
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="mailjet-rest",
+        description="Bulk export and import of Mailjet data.",
+    )
+    parser.add_argument("--api-url", help="base URL of the API")
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="do not report progress on stderr",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="export every record of a resource")
+    export.add_argument("resource", help='e.g. "contact" or "listrecipient"')
+    export.add_argument("-o", "--output", help="output file (default: stdout)")
+    export.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+    export.add_argument(
+        "--filter",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="filter sent with every page request (repeatable)",
+    )
+    export.add_argument(
+        "--columns",
+        type=lambda value: [column.strip() for column in value.split(",")],
+        metavar="NAME,...",
+        help="CSV columns (default: the fields of the first page)",
+    )
+    export.add_argument("--page-size", type=int, default=MAX_PAGE_SIZE)
+    export.add_argument(
+        "--parallel",
+        type=int,
+        default=4,
+        help="pages fetched at once",
+    )
+
+    imp = commands.add_parser("import", help="import a CSV file into a contact list")
+    imp.add_argument("list", help="ID of the contact list")
+    imp.add_argument("csv", help='CSV file with a header row, or "-" for stdin')
+    imp.add_argument("--chunk-size", type=int, default=10_000, help="rows per job")
+    imp.add_argument(
+        "--parallel",
+        type=int,
+        default=2,
+        help="chunks imported at once",
+    )
+    imp.add_argument("--method", default="addnoforce", help="csvimport method")
+    imp.add_argument(
+        "--no-wait",
+        dest="wait",
+        action="store_false",
+        help="do not wait for the import jobs to finish",
+    )
+    imp.add_argument("--poll-interval", type=float, default=2.0)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the command line tool.
+
+    Parameters:
+    - argv (Sequence[str] | None): The arguments. Defaults to `sys.argv[1:]`.
+
+    Returns:
+    - int: The exit status: 0 on success, 1 if a request or an import job failed.
+    """
+    parser = _parser()
+    args = parser.parse_args(argv)
+    auth = (
+        os.environ.get("MJ_APIKEY_PUBLIC", ""),
+        os.environ.get("MJ_APIKEY_PRIVATE", ""),
+    )
+    stderr = None if args.quiet else sys.stderr
+    with ExitStack() as stack:
+        client = stack.enter_context(
+            Client(auth=auth, api_url=args.api_url, pool_maxsize=args.parallel),
+        )
+        try:
+            if args.command == "export":
+                try:
+                    filters = _filters(args.filter)
+                except argparse.ArgumentTypeError as err:
+                    parser.error(str(err))
+                out = (
+                    stack.enter_context(
+                        open(args.output, "w", encoding="utf-8", newline=""),  # noqa: PTH123
+                    )
+                    if args.output
+                    else sys.stdout
+                )
+                progress = Progress(f"{args.resource} records exported", stderr)
+                export_records(
+                    client,
+                    args.resource,
+                    out,
+                    args.format,
+                    filters,
+                    args.page_size,
+                    args.parallel,
+                    progress,
+                    args.columns,
+                )
+                progress.finish()
+                return 0
+            source = (
+                sys.stdin
+                if args.csv == "-"
+                else stack.enter_context(
+                    open(args.csv, encoding="utf-8", newline=""),  # noqa: PTH123
+                )
+            )
+            progress = Progress("rows imported", stderr)
+            jobs = import_csv(
+                client,
+                args.list,
+                source,
+                args.chunk_size,
+                args.parallel,
+                args.method,
+                args.wait,
+                args.poll_interval,
+                progress,
+            )
+            progress.finish()
+        except (ApiError, OSError, ValueError) as err:
+            sys.stderr.write(f"\nerror: {err}\n")
+            return 1
+    failed = [job for job in jobs if job.get("Status") in {"Error", "Abort"}]
+    if stderr is not None:
+        stderr.write(
+            f"{len(jobs)} import jobs, {len(failed)} failed: "
+            f"{sum(job.get('Count', 0) for job in jobs)} contacts imported, "
+            f"{sum(job.get('Errcount', 0) for job in jobs)} errors\n",
+        )
+    return 1 if failed else 0
@@ -16,37 +16,65 @@ Functions:
     - prepare_url: Prepares URLs for API requests.
     - api_call: A helper function that sends HTTP requests to the API and handles
       responses.
+    - api_call_async: The coroutine variant of `api_call`, sending requests
+      through an asynchronous transport.
     - build_headers: Builds HTTP headers for the requests.
     - build_url: Constructs the full API URL based on endpoint and parameters.
     - parse_response: Parses API responses and handles error conditions.
+    - error_from_response: Builds the `ApiError` subclass matching an unsuccessful response.
 
 Exceptions:
     - ApiError: Base exception for API errors, with subclasses to represent
       specific error types, such as `AuthorizationError`, `TimeoutError`,
       `ActionDeniedError`, and `ValidationError`.
+
+Attributes:
+    - ERROR_TYPES: The `ApiError` subclass raised for each status code.
 """
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import functools
 import json
 import logging
 import re
 import sys
 from datetime import datetime
 from datetime import timezone
+from email.utils import parsedate_to_datetime
 from re import Match
 from typing import TYPE_CHECKING
 from typing import Any
 from typing import Callable
+from typing import cast
 
 import requests  # type: ignore[import-untyped]
 from requests.compat import urljoin  # type: ignore[import-untyped]
 
+from mailjet_rest.compression import COMPRESSIBLE_ENDPOINTS
+from mailjet_rest.compression import CompressingTransport
+from mailjet_rest.compression import CompressionStats
+from mailjet_rest.profiling import Profiler
+from mailjet_rest.profiling import resource_name
+from mailjet_rest.stats_cache import StatsCache
+from mailjet_rest.stats_cache import StatsCacheTransport
+from mailjet_rest.tracing import Tracer
+from mailjet_rest.tracing import TracingTransport
+from mailjet_rest.transport import AsyncTransport
+from mailjet_rest.transport import RequestsTransport
+from mailjet_rest.transport import ThreadedAsyncTransport
+from mailjet_rest.transport import Transport
+from mailjet_rest.utils.singleflight import SingleFlight
+from mailjet_rest.utils.ttl_cache import TTLCache
 from mailjet_rest.utils.version import get_version
 
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
     from collections.abc import Mapping
+    from typing import IO
 
     from requests.models import Response  # type: ignore[import-untyped]
 
@@ -153,14 +181,22 @@ class Endpoint:
     - headers (dict[str, str]): The headers to be included in API requests.
     - _auth (tuple[str, str] | None): The authentication credentials.
     - action (str | None): The specific action to be performed on the endpoint.
+    - _coalescer (SingleFlight | None): Shares concurrent identical GET requests, if set.
+    - _transport (Transport | None): The transport sending the requests. If None, `requests` is used directly.
+    - _async_transport (AsyncTransport | None): The transport sending the requests of the coroutine methods.
+    - _count_cache (TTLCache | None): Caches the totals returned by `count`, if set.
+    - _raise_errors (bool): Whether unsuccessful responses raise the matching `ApiError` subclass.
+    - _profiler (Profiler | None): Measures the phases of the requests, if set.
 
     Methods:
     - _get: Internal method to perform a GET request.
     - get_many: Performs a GET request to retrieve multiple resources.
     - get: Performs a GET request to retrieve a specific resource.
+    - count: Returns the number of matching resources without fetching them.
     - create: Performs a POST request to create a new resource.
     - update: Performs a PUT request to update an existing resource.
     - delete: Performs a DELETE request to delete a resource.
+    - aget_many, aget, acount, acreate, aupdate, adelete: Coroutine variants of the methods above.
     """
 
     def __init__(
@@ -169,6 +205,12 @@ class Endpoint:
         headers: dict[str, str],
         auth: tuple[str, str] | None,
         action: str | None = None,
+        coalescer: SingleFlight | None = None,
+        transport: Transport | None = None,
+        async_transport: AsyncTransport | None = None,
+        count_cache: TTLCache | None = None,
+        raise_errors: bool = False,
+        profiler: Profiler | None = None,
     ) -> None:
         """Initialize a new Endpoint instance.
 
@@ -177,8 +219,97 @@ class Endpoint:
             headers (dict[str, str]): Headers for API requests.
             auth (tuple[str, str] | None): Authentication credentials.
             action (str | None): Action to perform on the endpoint, if any.
+            coalescer (SingleFlight | None): Shares concurrent identical GET requests, if set.
+            transport (Transport | None): The transport sending the requests, if set.
+            async_transport (AsyncTransport | None): The transport sending the requests of the coroutine methods, if set.
+            count_cache (TTLCache | None): Caches the totals returned by `count`, if set.
+            raise_errors (bool): Whether unsuccessful responses raise the matching `ApiError` subclass instead of being returned.
+            profiler (Profiler | None): Measures the phases of the requests, if set.
         """
         self._url, self.headers, self._auth, self.action = url, headers, auth, action
+        self._coalescer = coalescer
+        self._transport = transport
+        self._async_transport = async_transport
+        self._count_cache = count_cache
+        self._raise_errors = raise_errors
+        self._profiler = profiler
+
+    def _phase(self, name: str) -> contextlib.AbstractContextManager[Any]:
+        """Return a context manager measuring a phase of a request, when profiling.
+
+        Parameters:
+        - name (str): The phase, one of `mailjet_rest.profiling.PHASES`.
+
+        Returns:
+        - AbstractContextManager[Any]: Records the phase in the profiler, if it is enabled.
+        """
+        if self._profiler is None or not self._profiler.enabled:
+            return contextlib.nullcontext()
+        return self._profiler.phase(name, resource_name(self._url))
+
+    def _check(self, response: Response) -> Response:
+        """Raise the error matching an unsuccessful response, in `raise_errors` mode.
+
+        Parameters:
+        - response (Response): The response of a request.
+
+        Returns:
+        - Response: The response, if it is successful or errors are not raised.
+
+        Raises:
+        - ApiError: The subclass matching the status of an unsuccessful response, in `raise_errors` mode.
+        """
+        if self._profiler is not None:
+            self._profiler.track_response(response, resource_name(self._url))
+        if self._raise_errors and response.status_code >= 400:
+            raise error_from_response(response)
+        return response
+
+    def _encode_data(
+        self,
+        data: dict | bytes | bytearray | memoryview | IO[bytes] | str | None,
+        ensure_ascii: bool,
+        data_encoding: str,
+    ) -> bytes | bytearray | memoryview | IO[bytes] | str | None:
+        """Serialize a request payload, passing pre-encoded bodies through.
+
+        Bytes, bytearrays, memoryviews and binary file objects are sent as they
+        are, without being decoded, re-serialized or copied, whatever the
+        content type of the endpoint; only non-contiguous memoryviews (e.g.
+        strided slices) are copied into bytes. Strings are sent as they are to JSON
+        endpoints and encoded with `data_encoding` for the others (e.g. CSV
+        uploads). Other payloads are serialized to JSON for JSON endpoints.
+
+        Parameters:
+        - data (dict | bytes | bytearray | memoryview | IO[bytes] | str | None): The data to include in the request body.
+        - ensure_ascii (bool): Whether to ensure ASCII characters in the data.
+        - data_encoding (str): The encoding to be used for the data.
+
+        Returns:
+        - bytes | bytearray | memoryview | IO[bytes] | str | None: The encoded body, or None if there is nothing to send.
+        """
+        with self._phase("encode"):
+            if data is None or isinstance(data, (bytes, bytearray)):
+                return data
+            if isinstance(data, memoryview):
+                # A memoryview of a multi-byte format reports its length in items,
+                # so expose it as raw bytes to get a correct Content-Length.
+                # Strided views can neither be cast nor sent as one buffer.
+                if not data.c_contiguous:
+                    data = memoryview(data.tobytes())
+                return data if data.format == "B" else data.cast("B")
+            if hasattr(data, "read"):
+                return cast("IO[bytes]", data)
+            if isinstance(data, str):
+                if self.headers.get("Content-type") == "application/json":
+                    return data
+                return data.encode(data_encoding)
+            json_data: str | bytes | None = None
+            if self.headers.get("Content-type") == "application/json":
+                json_data = json.dumps(data, ensure_ascii=ensure_ascii)
+                if not ensure_ascii:
+                    json_data = json_data.encode(data_encoding)
+            return json_data
 
     def _get(
         self,
@@ -190,7 +321,9 @@ class Endpoint:
         """Perform an internal GET request to the endpoint.
 
         Constructs the URL with the provided filters and action_id to retrieve
-        specific data from the API.
+        specific data from the API. When the endpoint has a coalescer, concurrent
+        calls with the same URL, filters, headers and credentials share a single
+        HTTP request and all receive its response.
 
         Parameters:
         - filters (Mapping[str, str | Any] | None): Filters to be applied in the request.
@@ -201,16 +334,54 @@ class Endpoint:
         Returns:
         - Response: The response object from the API call.
         """
-        return api_call(
-            self._auth,
-            "get",
+
+        def call() -> Response:
+            return api_call(
+                self._auth,
+                "get",
+                self._url,
+                headers=self.headers,
+                action=self.action,
+                action_id=action_id,
+                filters=filters,
+                resource_id=id,
+                transport=self._transport,
+                profiler=self._profiler,
+                **kwargs,
+            )
+
+        if self._coalescer is None:
+            return self._check(call())
+        key = self._request_key(filters, action_id, id, kwargs)
+        return self._check(self._coalescer.do(key, call))
+
+    def _request_key(
+        self,
+        filters: Mapping[str, str | Any] | None,
+        action_id: str | None,
+        id: str | None,
+        kwargs: Mapping[str, Any],
+    ) -> tuple[Any, ...]:
+        """Identify a GET request, for coalescing and caching.
+
+        Parameters:
+        - filters (Mapping[str, str | Any] | None): Filters to be applied in the request.
+        - action_id (str | None): The specific action ID for the endpoint to be performed.
+        - id (str | None): The ID of the specific resource to be retrieved.
+        - kwargs (Mapping[str, Any]): Additional keyword arguments passed to the API call.
+
+        Returns:
+        - tuple[Any, ...]: A hashable key, equal for requests sending the same query with the same credentials.
+        """
+        return (
             self._url,
-            headers=self.headers,
-            action=self.action,
-            action_id=action_id,
-            filters=filters,
-            resource_id=id,
-            **kwargs,
+            self.action,
+            action_id,
+            id,
+            tuple(sorted((k, repr(v)) for k, v in (filters or {}).items())),
+            tuple(sorted(self.headers.items())),
+            self._auth,
+            tuple(sorted((k, repr(v)) for k, v in kwargs.items())),
         )
 
     def get_many(
@@ -251,9 +422,64 @@ class Endpoint:
         """
         return self._get(id=id, filters=filters, action_id=action_id, **kwargs)
 
+    def count(
+        self,
+        filters: Mapping[str, str | Any] | None = None,
+        action_id: str | None = None,
+        use_cache: bool = True,
+        **kwargs: Any,
+    ) -> int:
+        """Return the number of resources matching the filters, without fetching them.
+
+        The request uses the `countOnly` query mode of the API, so no `Data` is
+        downloaded or parsed. When the client was created with a
+        `count_cache_ttl`, totals are cached for that many seconds.
+
+        Parameters:
+        - filters (Mapping[str, str | Any] | None): Filters to be applied in the request.
+        - action_id (str | None): The specific action ID to be performed.
+        - use_cache (bool): Whether a cached total may be returned.
+        - **kwargs (Any): Additional keyword arguments to be passed to the API call.
+
+        Returns:
+        - int: The total number of matching resources.
+
+        Raises:
+        - ApiError: If the request does not succeed.
+        """
+        count_filters = {**(filters or {}), "countOnly": 1}
+        key = self._request_key(count_filters, action_id, None, kwargs)
+        if use_cache and self._count_cache is not None:
+            cached = self._count_cache.get(key)
+            if cached is not None:
+                return cached
+        response = self._get(filters=count_filters, action_id=action_id, **kwargs)
+        total = self._parse_count(response)
+        if self._count_cache is not None:
+            self._count_cache.set(key, total)
+        return total
+
+    @staticmethod
+    def _parse_count(response: Response) -> int:
+        """Read the total of a `countOnly` response.
+
+        Parameters:
+        - response (Response): The response of a `countOnly` request.
+
+        Returns:
+        - int: The `Total` of the response, or its `Count` if there is no total.
+
+        Raises:
+        - ApiError: The subclass matching the status, if the response is not successful.
+        """
+        if response.status_code != 200:
+            raise error_from_response(response)
+        body = response.json()
+        return int(body.get("Total", body.get("Count", 0)))
+
     def create(
         self,
-        data: dict | None = None,
+        data: dict | bytes | bytearray | memoryview | IO[bytes] | str | None = None,
         filters: Mapping[str, str | Any] | None = None,
         id: str | None = None,
         action_id: str | None = None,
@@ -264,7 +490,8 @@ class Endpoint:
         """Perform a POST request to create a new resource.
 
         Parameters:
-        - data (dict | None): The data to include in the request body.
+        - data (dict | bytes | bytearray | memoryview | IO[bytes] | str | None): The data to include in the request body. Dicts are
+          serialized to JSON; pre-encoded bodies are sent unchanged.
         - filters (Mapping[str, str | Any] | None): Filters to be applied in the request.
         - id (str | None): The ID of the specific resource to be created.
         - action_id (str | None): The specific action ID to be performed.
@@ -275,12 +502,8 @@ class Endpoint:
         Returns:
         - Response: The response object from the API call.
         """
-        json_data: str | bytes | None = None
-        if self.headers.get("Content-type") == "application/json" and data is not None:
-            json_data = json.dumps(data, ensure_ascii=ensure_ascii)
-            if not ensure_ascii:
-                json_data = json_data.encode(data_encoding)
-        return api_call(
+        json_data = self._encode_data(data, ensure_ascii, data_encoding)
+        response = api_call(
             self._auth,
             "post",
             self._url,
@@ -290,13 +513,16 @@ class Endpoint:
             action=self.action,
             action_id=action_id,
             filters=filters,
+            transport=self._transport,
+            profiler=self._profiler,
             **kwargs,
         )
+        return self._check(response)
 
     def update(
         self,
         id: str | None,
-        data: dict | None = None,
+        data: dict | bytes | bytearray | memoryview | IO[bytes] | str | None = None,
         filters: Mapping[str, str | Any] | None = None,
         action_id: str | None = None,
         ensure_ascii: bool = True,
@@ -307,7 +533,8 @@ class Endpoint:
 
         Parameters:
         - id (str | None): The ID of the specific resource to be updated.
-        - data (dict | None): The data to be sent in the request body.
+        - data (dict | bytes | bytearray | memoryview | IO[bytes] | str | None): The data to be sent in the request body. Dicts are
+          serialized to JSON; pre-encoded bodies are sent unchanged.
         - filters (Mapping[str, str | Any] | None): Filters to be applied in the request.
         - action_id (str | None): The specific action ID to be performed.
         - ensure_ascii (bool): Whether to ensure ASCII characters in the data.
@@ -317,12 +544,8 @@ class Endpoint:
         Returns:
         - Response: The response object from the API call.
         """
-        json_data: str | bytes | None = None
-        if self.headers.get("Content-type") == "application/json" and data is not None:
-            json_data = json.dumps(data, ensure_ascii=ensure_ascii)
-            if not ensure_ascii:
-                json_data = json_data.encode(data_encoding)
-        return api_call(
+        json_data = self._encode_data(data, ensure_ascii, data_encoding)
+        response = api_call(
             self._auth,
             "put",
             self._url,
@@ -332,8 +555,11 @@ class Endpoint:
             action=self.action,
             action_id=action_id,
             filters=filters,
+            transport=self._transport,
+            profiler=self._profiler,
             **kwargs,
         )
+        return self._check(response)
 
     def delete(self, id: str | None, **kwargs: Any) -> Response:
         """Perform a DELETE request to delete a resource.
@@ -345,15 +571,211 @@ class Endpoint:
         Returns:
         - Response: The response object from the API call.
         """
-        return api_call(
+        response = api_call(
+            self._auth,
+            "delete",
+            self._url,
+            action=self.action,
+            headers=self.headers,
+            resource_id=id,
+            transport=self._transport,
+            profiler=self._profiler,
+            **kwargs,
+        )
+        return self._check(response)
+
+    async def aget_many(
+        self,
+        filters: Mapping[str, str | Any] | None = None,
+        action_id: str | None = None,
+        **kwargs: Any,
+    ) -> Response:
+        """Perform a GET request to retrieve multiple resources, as a coroutine.
+
+        Parameters:
+        - filters (Mapping[str, str | Any] | None): Filters to be applied in the request.
+        - action_id (str | None): The specific action ID to be performed.
+        - **kwargs (Any): Additional keyword arguments to be passed to the API call.
+
+        Returns:
+        - Response: The response object from the API call containing multiple resources.
+        """
+        return await self.aget(filters=filters, action_id=action_id, **kwargs)
+
+    async def aget(
+        self,
+        id: str | None = None,
+        filters: Mapping[str, str | Any] | None = None,
+        action_id: str | None = None,
+        **kwargs: Any,
+    ) -> Response:
+        """Perform a GET request to retrieve a specific resource, as a coroutine.
+
+        Parameters:
+        - id (str | None): The ID of the specific resource to be retrieved.
+        - filters (Mapping[str, str | Any] | None): Filters to be applied in the request.
+        - action_id (str | None): The specific action ID to be performed.
+        - **kwargs (Any): Additional keyword arguments to be passed to the API call.
+
+        Returns:
+        - Response: The response object from the API call containing the specific resource.
+        """
+        response = await api_call_async(
+            self._auth,
+            "get",
+            self._url,
+            headers=self.headers,
+            action=self.action,
+            action_id=action_id,
+            filters=filters,
+            resource_id=id,
+            transport=self._async_transport,
+            profiler=self._profiler,
+            **kwargs,
+        )
+        return self._check(response)
+
+    async def acount(
+        self,
+        filters: Mapping[str, str | Any] | None = None,
+        action_id: str | None = None,
+        use_cache: bool = True,
+        **kwargs: Any,
+    ) -> int:
+        """Return the number of resources matching the filters, as a coroutine.
+
+        Parameters:
+        - filters (Mapping[str, str | Any] | None): Filters to be applied in the request.
+        - action_id (str | None): The specific action ID to be performed.
+        - use_cache (bool): Whether a cached total may be returned.
+        - **kwargs (Any): Additional keyword arguments to be passed to the API call.
+
+        Returns:
+        - int: The total number of matching resources.
+
+        Raises:
+        - ApiError: If the request does not succeed.
+        """
+        count_filters = {**(filters or {}), "countOnly": 1}
+        key = self._request_key(count_filters, action_id, None, kwargs)
+        if use_cache and self._count_cache is not None:
+            cached = self._count_cache.get(key)
+            if cached is not None:
+                return cached
+        response = await self.aget(
+            filters=count_filters,
+            action_id=action_id,
+            **kwargs,
+        )
+        total = self._parse_count(response)
+        if self._count_cache is not None:
+            self._count_cache.set(key, total)
+        return total
+
+    async def acreate(
+        self,
+        data: dict | bytes | bytearray | memoryview | IO[bytes] | str | None = None,
+        filters: Mapping[str, str | Any] | None = None,
+        id: str | None = None,
+        action_id: str | None = None,
+        ensure_ascii: bool = True,
+        data_encoding: str = "utf-8",
+        **kwargs: Any,
+    ) -> Response:
+        """Perform a POST request to create a new resource, as a coroutine.
+
+        Parameters:
+        - data (dict | bytes | bytearray | memoryview | IO[bytes] | str | None): The data to include in the request body. Dicts are
+          serialized to JSON; pre-encoded bodies are sent unchanged.
+        - filters (Mapping[str, str | Any] | None): Filters to be applied in the request.
+        - id (str | None): The ID of the specific resource to be created.
+        - action_id (str | None): The specific action ID to be performed.
+        - ensure_ascii (bool): Whether to ensure ASCII characters in the data.
+        - data_encoding (str): The encoding to be used for the data.
+        - **kwargs (Any): Additional keyword arguments to be passed to the API call.
+
+        Returns:
+        - Response: The response object from the API call.
+        """
+        response = await api_call_async(
+            self._auth,
+            "post",
+            self._url,
+            headers=self.headers,
+            resource_id=id,
+            data=self._encode_data(data, ensure_ascii, data_encoding),
+            action=self.action,
+            action_id=action_id,
+            filters=filters,
+            transport=self._async_transport,
+            profiler=self._profiler,
+            **kwargs,
+        )
+        return self._check(response)
+
+    async def aupdate(
+        self,
+        id: str | None,
+        data: dict | bytes | bytearray | memoryview | IO[bytes] | str | None = None,
+        filters: Mapping[str, str | Any] | None = None,
+        action_id: str | None = None,
+        ensure_ascii: bool = True,
+        data_encoding: str = "utf-8",
+        **kwargs: Any,
+    ) -> Response:
+        """Perform a PUT request to update an existing resource, as a coroutine.
+
+        Parameters:
+        - id (str | None): The ID of the specific resource to be updated.
+        - data (dict | bytes | bytearray | memoryview | IO[bytes] | str | None): The data to be sent in the request body. Dicts are
+          serialized to JSON; pre-encoded bodies are sent unchanged.
+        - filters (Mapping[str, str | Any] | None): Filters to be applied in the request.
+        - action_id (str | None): The specific action ID to be performed.
+        - ensure_ascii (bool): Whether to ensure ASCII characters in the data.
+        - data_encoding (str): The encoding to be used for the data.
+        - **kwargs (Any): Additional keyword arguments to be passed to the API call.
+
+        Returns:
+        - Response: The response object from the API call.
+        """
+        response = await api_call_async(
+            self._auth,
+            "put",
+            self._url,
+            resource_id=id,
+            headers=self.headers,
+            data=self._encode_data(data, ensure_ascii, data_encoding),
+            action=self.action,
+            action_id=action_id,
+            filters=filters,
+            transport=self._async_transport,
+            profiler=self._profiler,
+            **kwargs,
+        )
+        return self._check(response)
+
+    async def adelete(self, id: str | None, **kwargs: Any) -> Response:
+        """Perform a DELETE request to delete a resource, as a coroutine.
+
+        Parameters:
+        - id (str | None): The ID of the specific resource to be deleted.
+        - **kwargs (Any): Additional keyword arguments to be passed to the API call.
+
+        Returns:
+        - Response: The response object from the API call.
+        """
+        response = await api_call_async(
             self._auth,
             "delete",
             self._url,
             action=self.action,
             headers=self.headers,
             resource_id=id,
+            transport=self._async_transport,
+            profiler=self._profiler,
             **kwargs,
         )
+        return self._check(response)
 
 
 class Client:
@@ -363,15 +785,35 @@ class Client:
     It initializes with API authentication details and uses dynamic attribute access
     to allow flexible interaction with various Mailjet API endpoints.
 
+    A single instance is safe to share between threads: every attribute access
+    builds a new `Endpoint`, and all endpoints send their requests through the
+    client's transport. The default `RequestsTransport` holds one
+    `requests.Session` whose connection pool is sized by the `pool_connections`,
+    `pool_maxsize` and `pool_block` options. Call `close()` (or use the client as
+    a context manager) to release the pooled connections.
+
     Attributes:
     - auth  (tuple[str, str] | None): A tuple containing the API key and secret for authentication.
     - config (Config): An instance of the Config class, which holds API configuration settings.
+    - coalescer (SingleFlight | None): Shares concurrent identical GET requests between threads, if enabled.
+    - transport (Transport): The transport sending the requests.
+    - async_transport (AsyncTransport): The transport sending the requests of the coroutine endpoint methods.
+    - session (requests.Session | None): The session holding the pooled connections, when the transport is a `RequestsTransport`.
+    - compression_stats (CompressionStats | None): The bytes saved by compression, if request compression is enabled.
+    - count_cache (TTLCache | None): The cache of `Endpoint.count` totals, if enabled.
+    - profiler (Profiler): Measures the phases of the requests while `profile()` is active.
 
     Methods:
     - __init__: Initializes a new Client instance with authentication and configuration settings.
     - __getattr__: Handles dynamic attribute access, allowing for accessing API endpoints as attributes.
+    - close: Closes the pooled connections.
+    - warmup: Opens pooled connections to the API ahead of a burst of requests.
+    - profile: Measures where the time of the requests goes, in a `with` block.
     """
 
+    DEFAULT_POOL_CONNECTIONS: int = 10
+    DEFAULT_POOL_MAXSIZE: int = 10
+
     def __init__(self, auth: tuple[str, str] | None = None, **kwargs: Any) -> None:
         """Initialize a new Client instance for API interaction.
 
@@ -382,14 +824,157 @@ class Client:
         Parameters:
         - auth (tuple[str, str] | None): A tuple containing the API key and secret for authentication. If None, authentication is not required.
         - **kwargs (Any): Additional keyword arguments, such as `version` and `api_url`, for configuring the client.
+            Set `coalesce_gets=True` to let concurrent identical GET requests share one HTTP call;
+            the counters are then available from `client.coalescer.stats`.
+            The connection pool is sized with `pool_connections` (number of hosts kept),
+            `pool_maxsize` (connections kept per host) and `pool_block` (wait for a free
+            connection instead of opening a temporary one when the pool is exhausted).
+            `pool_max_age` and `pool_max_idle` (in seconds) close pooled connections opened or
+            unused for longer before they are reused, and `pool_reap_interval` (in seconds)
+            also closes them in the background, so pools stay fresh between bursts.
+            Pass `transport` (a `Transport`) to replace the HTTP stack, and `async_transport`
+            (an `AsyncTransport`) for the coroutine endpoint methods; by default the latter
+            runs the synchronous transport in worker threads.
+            Set `compress_min_size` (in bytes) to gzip request bodies of at least that size,
+            for endpoints that accept compressed bodies; `compress_level` sets the gzip level and
+            `compress_endpoints` replaces the endpoints whose bodies are compressed (see
+            `compression.COMPRESSIBLE_ENDPOINTS`).
+            Set `count_cache_ttl` (in seconds) to cache the totals returned by `Endpoint.count`.
+            Pass `stats_cache` (a `StatsCache`) to serve statistics requests of closed periods
+            from a persistent cache.
+            Pass `tracer` (a `Tracer`) to write a JSON-lines trace record for every request.
+            Set `raise_errors=True` to have unsuccessful responses raise the matching `ApiError`
+            subclass (see `error_from_response`) instead of being returned.
 
         Example:
             client = Client(auth=("api_key", "api_secret"), version="v3")
         """
         self.auth = auth
+        self.profiler = Profiler()
         version: str | None = kwargs.get("version")
         api_url: str | None = kwargs.get("api_url")
         self.config = Config(version=version, api_url=api_url)
+        self.coalescer: SingleFlight | None = (
+            SingleFlight() if kwargs.get("coalesce_gets") else None
+        )
+        pool_connections: int = kwargs.get(
+            "pool_connections",
+            self.DEFAULT_POOL_CONNECTIONS,
+        )
+        pool_maxsize: int = kwargs.get("pool_maxsize", self.DEFAULT_POOL_MAXSIZE)
+        pool_block: bool = kwargs.get("pool_block", False)
+        self.transport: Transport = kwargs.get("transport") or RequestsTransport(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            max_age=kwargs.get("pool_max_age"),
+            max_idle=kwargs.get("pool_max_idle"),
+            reap_interval=kwargs.get("pool_reap_interval"),
+        )
+        self._pool_maxsize = pool_maxsize
+        self.compression_stats: CompressionStats | None = None
+        compress_min_size: int | None = kwargs.get("compress_min_size")
+        if compress_min_size is not None:
+            compressing = CompressingTransport(
+                self.transport,
+                min_size=compress_min_size,
+                level=kwargs.get("compress_level", 6),
+                endpoints=kwargs.get("compress_endpoints", COMPRESSIBLE_ENDPOINTS),
+            )
+            self.transport = compressing
+            self.compression_stats = compressing.stats
+        stats_cache: StatsCache | None = kwargs.get("stats_cache")
+        if stats_cache is not None:
+            self.transport = StatsCacheTransport(self.transport, stats_cache)
+        tracer: Tracer | None = kwargs.get("tracer")
+        if tracer is not None:
+            self.transport = TracingTransport(self.transport, tracer)
+        self.async_transport: AsyncTransport = kwargs.get(
+            "async_transport",
+        ) or ThreadedAsyncTransport(self.transport)
+        self.session: requests.Session | None = getattr(self.transport, "session", None)
+        count_cache_ttl: float | None = kwargs.get("count_cache_ttl")
+        self.count_cache: TTLCache | None = (
+            TTLCache(count_cache_ttl) if count_cache_ttl else None
+        )
+        self.raise_errors: bool = kwargs.get("raise_errors", False)
+
+    def __enter__(self) -> Client:  # noqa: PYI034
+        """Return the client itself when used as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the pooled connections when leaving the context."""
+        self.close()
+
+    def close(self) -> None:
+        """Close every pooled connection of the client."""
+        self.transport.close()
+
+    def warmup(self, n_connections: int | None = None, timeout: float = 10.0) -> int:
+        """Open connections to the API ahead of a burst of requests.
+
+        The connections, TLS handshake included, are opened in parallel and
+        kept in the pool, so the first requests of the burst do not pay for
+        them. Combine with `pool_max_idle` so connections that stayed unused
+        too long are replaced rather than reused.
+
+        Parameters:
+        - n_connections (int | None): The number of connections to open. Defaults to `pool_maxsize`,
+          which also bounds it.
+        - timeout (float): The connection timeout, in seconds.
+
+        Returns:
+        - int: The number of connections opened; 0 if the transport does not pool connections.
+
+        Raises:
+        - ApiError: If a connection cannot be opened.
+        """
+        transport: Any = self.transport
+        while not hasattr(transport, "warmup") and hasattr(transport, "transport"):
+            transport = transport.transport
+        if not hasattr(transport, "warmup"):
+            return 0
+        try:
+            return transport.warmup(
+                self.config.api_url,
+                n_connections or self._pool_maxsize,
+                timeout,
+            )
+        except requests.RequestException as e:
+            raise ApiError(e) from e
+
+    @contextlib.contextmanager
+    def profile(
+        self,
+        trace_allocations: bool = True,
+        stream: IO[str] | None = None,
+        limit: int | None = 20,
+    ) -> Iterator[Profiler]:
+        """Measure where the time of the requests goes, then print a ranked summary.
+
+        While the block runs, the wall time, CPU time and net allocations of
+        each phase of the requests (endpoint lookup, body encoding, URL
+        building, network and response parsing) are recorded per resource.
+
+        Parameters:
+        - trace_allocations (bool): Whether to measure the net allocations of the phases with `tracemalloc`.
+        - stream (IO[str] | None): Where to print the summary. Defaults to stderr.
+        - limit (int | None): The largest number of (phase, resource) rows to print, or None for all.
+
+        Yields:
+        - Profiler: The profiler, whose measures stay available after the block.
+
+        Example:
+            with client.profile():
+                client.contact.create(data={"Email": "passenger@mailjet.com"})
+        """
+        self.profiler.start(trace_allocations=trace_allocations)
+        try:
+            yield self.profiler
+        finally:
+            self.profiler.stop()
+            self.profiler.print_summary(stream, limit)
 
     def __getattr__(self, name: str) -> Any:
         """Dynamically access API endpoints as attributes.
@@ -417,13 +1002,25 @@ class Client:
                 action = "csvdata/text:plain"
             if action == "csverror":
                 action = "csverror/text:csv"
-        url, headers = self.config[name]
-        return type(fname, (Endpoint,), {})(
-            url=url,
-            headers=headers,
-            action=action,
-            auth=self.auth,
+        phase = (
+            self.profiler.phase("endpoint", name.split("_", 1)[0].lower())
+            if self.profiler.enabled
+            else contextlib.nullcontext()
         )
+        with phase:
+            url, headers = self.config[name]
+            return type(fname, (Endpoint,), {})(
+                url=url,
+                headers=headers,
+                action=action,
+                auth=self.auth,
+                coalescer=self.coalescer,
+                transport=self.transport,
+                async_transport=self.async_transport,
+                count_cache=self.count_cache,
+                raise_errors=self.raise_errors,
+                profiler=self.profiler,
+            )
 
 
 def api_call(
@@ -431,13 +1028,15 @@ def api_call(
     method: str,
     url: str,
     headers: dict[str, str],
-    data: str | bytes | None = None,
+    data: bytes | bytearray | memoryview | IO[bytes] | str | None = None,
     filters: Mapping[str, str | Any] | None = None,
     resource_id: str | None = None,
     timeout: int = 60,
     debug: bool = False,
     action: str | None = None,
     action_id: str | None = None,
+    transport: Transport | None = None,
+    profiler: Profiler | None = None,
     **kwargs: Any,
 ) -> Response | Any:
     """Make an API call to a specified URL using the provided method, headers, and other parameters.
@@ -447,41 +1046,152 @@ def api_call(
     - method (str): The HTTP method to be used for the API call (e.g., 'get', 'post', 'put', 'delete').
     - url (str): The URL to which the API call will be made.
     - headers (dict[str, str]): A dictionary containing the headers to be included in the API call.
-    - data (str | bytes | None): The data to be sent in the request body.
+    - data (bytes | bytearray | memoryview | IO[bytes] | str | None): The data to be sent in the request body.
     - filters (Mapping[str, str | Any] | None): A dictionary containing filters to be applied in the request.
     - resource_id (str | None): The ID of the specific resource to be accessed.
     - timeout (int): The timeout for the API call in seconds.
     - debug (bool): A flag indicating whether debug mode is enabled.
     - action (str | None): The specific action to be performed on the resource.
     - action_id (str | None): The ID of the specific action to be performed.
+    - transport (Transport | None): The transport to send the request with. If None, a one-off `requests` session is used.
+    - profiler (Profiler | None): Measures the URL and network phases of the request, if set.
     - **kwargs (Any): Additional keyword arguments to be passed to the API call.
 
     Returns:
     - Response | Any: The response object from the API call if the request is successful, or an exception if an error occurs.
     """
-    url = build_url(
-        url,
-        method=method,
-        action=action,
-        resource_id=resource_id,
-        action_id=action_id,
-    )
-    req_method = getattr(requests, method)
-
-    try:
+    resource = resource_name(url)
+    phase = profiler.phase if profiler is not None else _no_phase
+    with phase("url", resource):
+        url = build_url(
+            url,
+            method=method,
+            action=action,
+            resource_id=resource_id,
+            action_id=action_id,
+        )
         filters_str: str | None = None
         if filters:
             filters_str = "&".join(f"{k}={v}" for k, v in filters.items())
-        response = req_method(
+
+    try:
+        with phase("network", resource):
+            if transport is None:
+                req_method = getattr(requests, method)
+                response = req_method(
+                    url,
+                    data=data,
+                    params=filters_str,
+                    headers=headers,
+                    auth=auth,
+                    timeout=timeout,
+                    verify=True,
+                    stream=False,
+                )
+            else:
+                response = transport.send(
+                    method,
+                    url,
+                    data=data,
+                    params=filters_str,
+                    headers=headers,
+                    auth=auth,
+                    timeout=timeout,
+                )
+
+    except requests.exceptions.Timeout:
+        raise TimeoutError
+    except requests.RequestException as e:
+        raise ApiError(e)  # noqa: RUF100, B904
+    except Exception:
+        raise
+    else:
+        return response
+
+
+async def api_call_async(
+    auth: tuple[str, str] | None,
+    method: str,
+    url: str,
+    headers: dict[str, str],
+    data: bytes | bytearray | memoryview | IO[bytes] | str | None = None,
+    filters: Mapping[str, str | Any] | None = None,
+    resource_id: str | None = None,
+    timeout: int = 60,
+    debug: bool = False,
+    action: str | None = None,
+    action_id: str | None = None,
+    transport: AsyncTransport | None = None,
+    profiler: Profiler | None = None,
+    **kwargs: Any,
+) -> Response | Any:
+    """Make an API call from a coroutine, through an asynchronous transport.
+
+    Parameters:
+    - auth (tuple[str, str] | None): A tuple containing the API key and secret for authentication.
+    - method (str): The HTTP method to be used for the API call (e.g., 'get', 'post', 'put', 'delete').
+    - url (str): The URL to which the API call will be made.
+    - headers (dict[str, str]): A dictionary containing the headers to be included in the API call.
+    - data (bytes | bytearray | memoryview | IO[bytes] | str | None): The data to be sent in the request body.
+    - filters (Mapping[str, str | Any] | None): A dictionary containing filters to be applied in the request.
+    - resource_id (str | None): The ID of the specific resource to be accessed.
+    - timeout (int): The timeout for the API call in seconds.
+    - debug (bool): A flag indicating whether debug mode is enabled.
+    - action (str | None): The specific action to be performed on the resource.
+    - action_id (str | None): The ID of the specific action to be performed.
+    - transport (AsyncTransport | None): The transport to send the request with. If None, `api_call` runs in a worker thread.
+    - profiler (Profiler | None): Measures the URL and network phases of the request, if set.
+    - **kwargs (Any): Additional keyword arguments to be passed to the API call.
+
+    Returns:
+    - Response | Any: The response object from the API call if the request is successful, or an exception if an error occurs.
+    """
+    if transport is None:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None,
+            functools.partial(
+                api_call,
+                auth,
+                method,
+                url,
+                headers,
+                data=data,
+                filters=filters,
+                resource_id=resource_id,
+                timeout=timeout,
+                debug=debug,
+                action=action,
+                action_id=action_id,
+                profiler=profiler,
+                **kwargs,
+            ),
+        )
+    resource = resource_name(url)
+    phase = profiler.phase if profiler is not None else _no_phase
+    with phase("url", resource):
+        url = build_url(
             url,
-            data=data,
-            params=filters_str,
-            headers=headers,
-            auth=auth,
-            timeout=timeout,
-            verify=True,
-            stream=False,
+            method=method,
+            action=action,
+            resource_id=resource_id,
+            action_id=action_id,
         )
+        filters_str: str | None = None
+        if filters:
+            filters_str = "&".join(f"{k}={v}" for k, v in filters.items())
+
+    try:
+        with phase("network", resource):
+            response = await transport.send(
+                method,
+                url,
+                data=data,
+                params=filters_str,
+                headers=headers,
+                auth=auth,
+                timeout=timeout,
+            )
 
     except requests.exceptions.Timeout:
         raise TimeoutError
@@ -493,6 +1203,11 @@ def api_call(
         return response
 
 
+def _no_phase(name: str, resource: str) -> contextlib.AbstractContextManager[Any]:
+    """Stand in for `Profiler.phase` when there is no profiler."""
+    return contextlib.nullcontext()
+
+
 def build_headers(
     resource: str,
     action: str,
@@ -593,18 +1308,33 @@ def parse_response(
     response: Response,
     log: Callable,
     debug: bool = False,
+    raise_errors: bool = False,
 ) -> Any:
     """Parse the response from an API request and return the JSON data.
 
+    With `raise_errors` set, the body is decoded only when there is one to
+    return: responses to DELETE requests, `204 No Content` responses and empty
+    bodies give None. Otherwise, the body is always decoded.
+
     Parameters:
     response (Response): The response object from the API request.
     log (Callable): A function or method that logs debug information.
     debug (bool): A flag indicating whether debug mode is enabled. Defaults to False.
+    raise_errors (bool): Whether an unsuccessful response raises the matching `ApiError` subclass. Defaults to False.
 
     Returns:
-    Any: The JSON data from the API response.
+    Any: The JSON data from the API response, or None if `raise_errors` is set and there is no body to decode.
+
+    Raises:
+    ApiError: The subclass matching the status of an unsuccessful response (see `ERROR_TYPES`), if `raise_errors` is set.
     """
-    data = response.json()
+    failed = raise_errors and response.status_code >= 400
+    if not raise_errors:
+        data = response.json()
+    elif failed or _has_body(response):
+        data = _decode_body(response, lenient=failed)
+    else:
+        data = None
 
     if debug:
         lgr = log()
@@ -618,17 +1348,164 @@ def parse_response(
         # Clear logger handlers to prevent making log duplications
         logging.getLogger().handlers.clear()
 
+    if failed:
+        raise error_from_response(response, data)
     return data
 
 
+def _has_body(response: Response) -> bool:
+    """Tell whether a successful response has a body worth decoding."""
+    request = getattr(response, "request", None)
+    return (
+        response.status_code != 204
+        and bool(response.content)
+        and getattr(request, "method", None) != "DELETE"
+    )
+
+
+def _decode_body(response: Response, lenient: bool = False) -> Any:
+    """Decode the JSON body of a response.
+
+    Parameters:
+    response (Response): The response.
+    lenient (bool): Whether a missing or invalid JSON body gives None instead of raising.
+
+    Returns:
+    Any: The decoded body.
+    """
+    if not lenient:
+        return response.json()
+    if not response.content:
+        return None
+    try:
+        return response.json()
+    except ValueError:
+        return None
+
+
+def _retry_after(response: Response) -> float | None:
+    """Read the `Retry-After` header of a response, in seconds."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (date - datetime.now(tz=timezone.utc)).total_seconds())
+
+
+def _error_details(body: Any) -> tuple[str | None, str | None, list[dict[str, Any]]]:
+    """Extract the message, info and detailed errors of an error body.
+
+    Both the v3 format (`ErrorMessage`, `ErrorInfo`) and the v3.1 Send API
+    format (`Errors`, possibly nested in `Messages`) are recognized.
+    """
+    if not isinstance(body, dict):
+        return None, None, []
+    errors: list[dict[str, Any]] = list(body.get("Errors") or [])
+    for message in body.get("Messages") or []:
+        if isinstance(message, dict):
+            errors.extend(message.get("Errors") or [])
+    message = body.get("ErrorMessage") or next(
+        (error.get("ErrorMessage") for error in errors if error.get("ErrorMessage")),
+        None,
+    )
+    return message, body.get("ErrorInfo") or None, errors
+
+
+def error_from_response(response: Response, body: Any = None) -> ApiError:
+    """Build the exception matching an unsuccessful response.
+
+    The exception type is looked up in `ERROR_TYPES` by status code; other
+    server errors give a `CriticalApiError` and other client errors an
+    `ApiError`. The details of the error body and the `Retry-After` hint are
+    attached to the exception.
+
+    Parameters:
+    response (Response): The unsuccessful response.
+    body (Any): The decoded body, if it was already decoded. Decoded from the response otherwise.
+
+    Returns:
+    ApiError: The exception, to be raised by the caller.
+    """
+    if body is None:
+        body = _decode_body(response, lenient=True)
+    status_code = response.status_code
+    error_type = ERROR_TYPES.get(status_code)
+    if error_type is None:
+        error_type = CriticalApiError if status_code >= 500 else ApiError
+    message, info, errors = _error_details(body)
+    text = message or getattr(response, "reason", None) or "Unknown error"
+    return error_type(
+        f"HTTP {status_code}: {text}",
+        status_code=status_code,
+        error_message=message,
+        error_info=info,
+        errors=errors,
+        retry_after=_retry_after(response),
+        response=response,
+    )
+
+
 class ApiError(Exception):
     """Base class for all API-related errors.
 
     This exception serves as the root for all custom API error types,
     allowing for more specific error handling based on the type of API
     failure encountered.
+
+    Errors built from a response (see `error_from_response`) carry its details.
+
+    Attributes:
+    - status_code (int | None): The HTTP status of the response, if any.
+    - error_message (str | None): The `ErrorMessage` of the response body, if any.
+    - error_info (str | None): The `ErrorInfo` of the response body, if any.
+    - errors (list[dict[str, Any]]): The detailed errors of the response body (e.g. of the Send API v3.1).
+    - retry_after (float | None): How long to wait before retrying, in seconds, from the `Retry-After` header.
+    - response (Response | None): The response, if any.
     """
 
+    def __init__(
+        self,
+        *args: object,
+        status_code: int | None = None,
+        error_message: str | None = None,
+        error_info: str | None = None,
+        errors: list[dict[str, Any]] | None = None,
+        retry_after: float | None = None,
+        response: Response | None = None,
+    ) -> None:
+        """Initialize a new ApiError instance.
+
+        Parameters:
+        - *args (object): The exception arguments, usually a message.
+        - status_code (int | None): The HTTP status of the response, if any.
+        - error_message (str | None): The `ErrorMessage` of the response body, if any.
+        - error_info (str | None): The `ErrorInfo` of the response body, if any.
+        - errors (list[dict[str, Any]] | None): The detailed errors of the response body, if any.
+        - retry_after (float | None): How long to wait before retrying, in seconds, if known.
+        - response (Response | None): The response, if any.
+        """
+        super().__init__(*args)
+        self.status_code = status_code
+        self.error_message = error_message
+        self.error_info = error_info
+        self.errors = errors or []
+        self.retry_after = retry_after
+        self.response = response
+
+    @property
+    def retryable(self) -> bool:
+        """Return whether the request may succeed if sent again later (429 and 5xx)."""
+        return self.status_code is not None and (
+            self.status_code == 429 or self.status_code >= 500
+        )
+
 
 class AuthorizationError(ApiError):
     """Error raised for authorization failures.
@@ -669,6 +1546,11 @@ class TimeoutError(ApiError):
     the allowed timeframe, possibly due to network issues or server load.
     """
 
+    @property
+    def retryable(self) -> bool:
+        """Return True: a timed out request may succeed if sent again."""
+        return True
+
 
 class DoesNotExistError(ApiError):
     """Error raised when a requested resource does not exist.
@@ -686,3 +1568,14 @@ class ValidationError(ApiError):
     does not meet validation requirements, such as incorrect data types
     or missing fields.
     """
+
+
+ERROR_TYPES: dict[int, type[ApiError]] = {
+    400: ValidationError,
+    401: AuthorizationError,
+    403: ActionDeniedError,
+    404: DoesNotExistError,
+    405: ActionDeniedError,
+    429: ApiRateLimitError,
+}
+"""The exception raised for each status code in `raise_errors` mode."""
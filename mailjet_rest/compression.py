@@ -0,0 +1,231 @@
+"""Gzip compression of request bodies and accounting of compressed responses.
+
+Large `send` batches and `managemanycontacts` payloads are highly
+compressible. `CompressingTransport` wraps another transport, gzips request
+bodies above a size threshold for the endpoints that accept compressed bodies,
+and records how many bytes compression saved in both directions. Responses are
+negotiated and decompressed incrementally by the underlying HTTP stack as they
+are read.
+
+Classes:
+    - CompressionStats: Thread-safe counters of compressed traffic.
+    - CompressingTransport: The compressing transport wrapper.
+
+Attributes:
+    - COMPRESSIBLE_ENDPOINTS: The endpoints whose request bodies are compressed by default.
+"""
+
+from __future__ import annotations
+
+import gzip
+import threading
+from typing import TYPE_CHECKING
+from typing import Any
+from urllib.parse import urlsplit
+
+from mailjet_rest.transport import Transport
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Mapping
+
+    from requests.models import Response  # type: ignore[import-untyped]
+
+
+COMPRESSIBLE_ENDPOINTS: frozenset[str] = frozenset(
+    {"send", "managemanycontacts", "csvdata"},
+)
+
+
+def _endpoint_of(url: str, endpoints: frozenset[str]) -> bool:
+    """Return whether a path segment of the URL is one of the endpoints."""
+    path = urlsplit(url).path
+    return any(segment.lower() in endpoints for segment in path.split("/"))
+
+
+class CompressionStats:
+    """Thread-safe counters of compressed request and response traffic.
+
+    Attributes:
+    - requests_compressed (int): The number of gzipped request bodies.
+    - request_bytes_raw (int): The size of those bodies before compression.
+    - request_bytes_sent (int): The size of those bodies after compression.
+    - responses_compressed (int): The number of compressed responses received.
+    - response_bytes_wire (int): The size of those responses on the wire.
+    - response_bytes_decoded (int): The size of those responses after decompression.
+    """
+
+    def __init__(self) -> None:
+        """Initialize all counters to zero."""
+        self._lock = threading.Lock()
+        self.requests_compressed = 0
+        self.request_bytes_raw = 0
+        self.request_bytes_sent = 0
+        self.responses_compressed = 0
+        self.response_bytes_wire = 0
+        self.response_bytes_decoded = 0
+
+    @property
+    def request_bytes_saved(self) -> int:
+        """Return the number of request bytes saved by compression."""
+        return self.request_bytes_raw - self.request_bytes_sent
+
+    @property
+    def response_bytes_saved(self) -> int:
+        """Return the number of response bytes saved by compression."""
+        return self.response_bytes_decoded - self.response_bytes_wire
+
+    def record_request(self, raw: int, sent: int) -> None:
+        """Account for one compressed request body.
+
+        Parameters:
+        - raw (int): The size of the body before compression.
+        - sent (int): The size of the body after compression.
+        """
+        with self._lock:
+            self.requests_compressed += 1
+            self.request_bytes_raw += raw
+            self.request_bytes_sent += sent
+
+    def record_response(self, wire: int, decoded: int) -> None:
+        """Account for one compressed response.
+
+        Parameters:
+        - wire (int): The size of the response body on the wire.
+        - decoded (int): The size of the response body after decompression.
+        """
+        with self._lock:
+            self.responses_compressed += 1
+            self.response_bytes_wire += wire
+            self.response_bytes_decoded += decoded
+
+    def as_dict(self) -> dict[str, int]:
+        """Return a snapshot of the counters.
+
+        Returns:
+        - dict[str, int]: Every counter, including the saved byte totals.
+        """
+        with self._lock:
+            return {
+                "requests_compressed": self.requests_compressed,
+                "request_bytes_raw": self.request_bytes_raw,
+                "request_bytes_sent": self.request_bytes_sent,
+                "request_bytes_saved": self.request_bytes_saved,
+                "responses_compressed": self.responses_compressed,
+                "response_bytes_wire": self.response_bytes_wire,
+                "response_bytes_decoded": self.response_bytes_decoded,
+                "response_bytes_saved": self.response_bytes_saved,
+            }
+
+
+class CompressingTransport(Transport):
+    """Gzip large request bodies and account for compressed responses.
+
+    Bodies given as `str`, `bytes`, `bytearray` or `memoryview` of at least
+    `min_size` bytes, sent to one of `endpoints`, are gzipped and sent with
+    `Content-Encoding: gzip`, unless the request already has a content encoding.
+    Other requests are forwarded unchanged.
+
+    Attributes:
+    - transport (Transport): The transport doing the actual requests.
+    - min_size (int): The smallest body size, in bytes, that is compressed.
+    - level (int): The gzip compression level.
+    - endpoints (frozenset[str]): The lowercase URL path segments of the endpoints accepting compressed bodies.
+    - stats (CompressionStats): The traffic counters.
+    """
+
+    def __init__(
+        self,
+        transport: Transport,
+        min_size: int = 1024,
+        level: int = 6,
+        endpoints: Iterable[str] = COMPRESSIBLE_ENDPOINTS,
+    ) -> None:
+        """Initialize a new CompressingTransport instance.
+
+        Parameters:
+        - transport (Transport): The transport doing the actual requests.
+        - min_size (int): The smallest body size, in bytes, that is compressed.
+        - level (int): The gzip compression level, from 1 (fastest) to 9 (smallest).
+        - endpoints (Iterable[str]): The URL path segments of the endpoints accepting compressed bodies,
+          e.g. "send" or "managemanycontacts". Defaults to `COMPRESSIBLE_ENDPOINTS`.
+        """
+        self.transport = transport
+        self.min_size = min_size
+        self.level = level
+        self.endpoints = frozenset(endpoint.lower() for endpoint in endpoints)
+        self.stats = CompressionStats()
+
+    @property
+    def session(self) -> Any:
+        """Return the session of the wrapped transport, if it has one."""
+        return getattr(self.transport, "session", None)
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        *,
+        data: str | bytes | Any | None = None,
+        params: str | None = None,
+        headers: Mapping[str, str] | None = None,
+        auth: tuple[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> Response:
+        """Compress the request body if worthwhile and forward the request.
+
+        Parameters:
+        - method (str): The HTTP method, in lowercase (e.g. 'get').
+        - url (str): The full URL of the request, without the query string.
+        - data (str | bytes | Any | None): The request body.
+        - params (str | None): The encoded query string.
+        - headers (Mapping[str, str] | None): The request headers.
+        - auth (tuple[str, str] | None): The basic authentication credentials.
+        - timeout (float | None): The timeout of the request in seconds.
+
+        Returns:
+        - Response: The response of the wrapped transport.
+        """
+        send_headers = dict(headers or {})
+        body = data.encode("utf-8") if isinstance(data, str) else data
+        already_encoded = any(
+            name.lower() == "content-encoding" for name in send_headers
+        )
+        if (
+            _endpoint_of(url, self.endpoints)
+            and isinstance(body, (bytes, bytearray, memoryview))
+            and memoryview(body).nbytes >= self.min_size
+            and not already_encoded
+        ):
+            size = memoryview(body).nbytes
+            compressed = gzip.compress(body, compresslevel=self.level, mtime=0)
+            if len(compressed) < size:
+                self.stats.record_request(size, len(compressed))
+                send_headers["Content-Encoding"] = "gzip"
+                data = compressed
+        response = self.transport.send(
+            method,
+            url,
+            data=data,
+            params=params,
+            headers=send_headers,
+            auth=auth,
+            timeout=timeout,
+        )
+        self._record_response(response)
+        return response
+
+    def _record_response(self, response: Response) -> None:
+        encoding = response.headers.get("Content-Encoding", "").lower()
+        if encoding not in {"gzip", "deflate"}:
+            return
+        raw = getattr(response, "raw", None)
+        tell = getattr(raw, "tell", None)
+        if tell is None:
+            return
+        self.stats.record_response(int(tell()), len(response.content))
+
+    def close(self) -> None:
+        """Close the wrapped transport."""
+        self.transport.close()
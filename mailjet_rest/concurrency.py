@@ -0,0 +1,381 @@
+"""Adaptive concurrency for bulk operations.
+
+Choosing a fixed number of workers for bulk sends or imports is guesswork:
+too few leaves throughput on the table, too many triggers `429 Too Many
+Requests` and server errors. `AIMDLimiter` adapts the number of requests in
+flight with the additive-increase/multiplicative-decrease rule used by TCP
+congestion control: the limit grows by about one request per round of healthy
+responses, and is cut by a constant factor on rate limiting, server errors,
+timeouts or connection failures.
+
+The limiter can gate any code sending requests. `AdaptiveTransport` applies it
+to every request of a `Client` (or of `api_call`), and `map_adaptive` runs a
+function over many items with the limiter deciding how many run at once.
+
+Classes:
+    - AIMDLimiter: The adaptive concurrency limit.
+    - Slot: One admitted request, reporting its outcome to the limiter.
+    - AdaptiveTransport: Gates the requests of a transport with a limiter.
+
+Functions:
+    - map_adaptive: Applies a function to items with adaptive concurrency.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Callable
+from typing import TypeVar
+
+import requests  # type: ignore[import-untyped]
+
+from mailjet_rest.client import ApiError
+from mailjet_rest.client import ApiRateLimitError
+from mailjet_rest.client import CriticalApiError
+from mailjet_rest.client import TimeoutError  # noqa: A004
+from mailjet_rest.transport import Transport
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+    from collections.abc import Mapping
+
+    from requests.models import Response  # type: ignore[import-untyped]
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_OVERLOAD_ERRORS = (
+    TimeoutError,
+    ApiRateLimitError,
+    CriticalApiError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ConnectionError,
+)
+
+
+def _is_overload_status(status_code: int) -> bool:
+    return status_code == 429 or status_code >= 500
+
+
+def _is_overload_error(error: BaseException) -> bool:
+    """Tell rate limiting, server errors, timeouts and connection failures from other errors.
+
+    An `ApiError` with a status code is classified like a response. One without
+    (e.g. raised by `api_call` for a network failure) is classified by the
+    exception it wraps.
+    """
+    if isinstance(error, ApiError) and error.status_code is not None:
+        return _is_overload_status(error.status_code)
+    if isinstance(error, _OVERLOAD_ERRORS):
+        return True
+    if isinstance(error, ApiError):
+        causes = [error.__cause__, error.__context__, *error.args]
+        return any(
+            isinstance(cause, _OVERLOAD_ERRORS) and cause is not error
+            for cause in causes
+        )
+    return False
+
+
+class Slot:
+    """One request admitted by an `AIMDLimiter`.
+
+    Call `record` with the response, if any, before leaving the
+    `AIMDLimiter.slot` context. A slot left without a recorded response counts
+    as a success, unless an exception escaped the context.
+
+    Attributes:
+    - started (float): The `time.monotonic()` value at admission.
+    - status_code (int | None): The recorded HTTP status code.
+    """
+
+    __slots__ = ("started", "status_code")
+
+    def __init__(self, started: float) -> None:
+        """Initialize a new Slot instance.
+
+        Parameters:
+        - started (float): The `time.monotonic()` value at admission.
+        """
+        self.started = started
+        self.status_code: int | None = None
+
+    def record(self, response: Response | Any) -> None:
+        """Record the response of the request.
+
+        Parameters:
+        - response (Response | Any): The response; objects without a `status_code` count as successes.
+        """
+        self.status_code = getattr(response, "status_code", None)
+
+
+class AIMDLimiter:
+    """An adaptive limit on the number of requests in flight.
+
+    Every healthy completion raises the limit by `1 / limit`, i.e. by about one
+    request per round of `limit` requests. A completion slower than
+    `latency_target` neither raises nor lowers the limit. Rate limiting
+    (HTTP 429), server errors, timeouts and connection failures multiply the
+    limit by `backoff`; completions of requests started before the previous
+    decrease are ignored, so that one burst of errors only backs off once.
+
+    The limiter is thread-safe.
+
+    Attributes:
+    - min_limit (int): The lowest limit.
+    - max_limit (int): The highest limit.
+    - backoff (float): The factor applied to the limit on overload.
+    - latency_target (float | None): The slowest healthy response time, in seconds, if any.
+    - increases (int): The number of times the limit grew by a whole request.
+    - decreases (int): The number of times the limit was backed off.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        backoff: float = 0.5,
+        latency_target: float | None = None,
+    ) -> None:
+        """Initialize a new AIMDLimiter instance.
+
+        Parameters:
+        - initial_limit (int): The limit to start with.
+        - min_limit (int): The lowest limit.
+        - max_limit (int): The highest limit.
+        - backoff (float): The factor applied to the limit on overload, between 0 and 1.
+        - latency_target (float | None): The slowest healthy response time, in seconds. If None, latency is ignored.
+
+        Raises:
+        - ValueError: If the limits are inconsistent or `backoff` is not between 0 and 1.
+        """
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            msg = "limits must satisfy 1 <= min_limit <= initial_limit <= max_limit"
+            raise ValueError(msg)
+        if not 0 < backoff < 1:
+            msg = "backoff must be between 0 and 1"
+            raise ValueError(msg)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_target = latency_target
+        self.increases = 0
+        self.decreases = 0
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._last_decrease = float("-inf")
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """Return the current number of requests allowed in flight."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Return the number of requests currently in flight."""
+        return self._in_flight
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return the limiter counters.
+
+        Returns:
+        - dict[str, int]: The current `limit` and `in_flight` count, and the `increases` and `decreases` counters.
+        """
+        with self._condition:
+            return {
+                "limit": self.limit,
+                "in_flight": self._in_flight,
+                "increases": self.increases,
+                "decreases": self.decreases,
+            }
+
+    def acquire(self, timeout: float | None = None) -> Slot | None:
+        """Wait until a request may be sent.
+
+        Parameters:
+        - timeout (float | None): The longest time to wait, in seconds. If None, wait as long as needed.
+
+        Returns:
+        - Slot | None: The admitted slot, to pass to `release`, or None if the timeout elapsed first.
+        """
+        with self._condition:
+            admitted = self._condition.wait_for(
+                lambda: self._in_flight < self.limit,
+                timeout,
+            )
+            if not admitted:
+                return None
+            self._in_flight += 1
+            return Slot(time.monotonic())
+
+    def release(self, slot: Slot, error: BaseException | None = None) -> None:
+        """Report the outcome of an admitted request and free its slot.
+
+        Parameters:
+        - slot (Slot): The slot returned by `acquire`.
+        - error (BaseException | None): The exception raised by the request, if any.
+        """
+        now = time.monotonic()
+        if error is not None:
+            overloaded = _is_overload_error(error)
+            healthy = False
+        elif slot.status_code is not None and _is_overload_status(slot.status_code):
+            overloaded, healthy = True, False
+        else:
+            overloaded = False
+            healthy = (
+                self.latency_target is None or now - slot.started <= self.latency_target
+            )
+        with self._condition:
+            self._in_flight -= 1
+            if overloaded:
+                if slot.started >= self._last_decrease:
+                    self._limit = max(
+                        float(self.min_limit),
+                        self._limit * self.backoff,
+                    )
+                    self._last_decrease = now
+                    self.decreases += 1
+            elif healthy and self._limit < self.max_limit:
+                before = int(self._limit)
+                self._limit = min(
+                    float(self.max_limit),
+                    self._limit + 1 / self._limit,
+                )
+                if int(self._limit) > before:
+                    self.increases += 1
+            self._condition.notify_all()
+
+    @contextlib.contextmanager
+    def slot(self) -> Iterator[Slot]:
+        """Hold a slot for the duration of a request.
+
+        Yields:
+        - Slot: The admitted slot; call its `record` method with the response.
+        """
+        slot = self.acquire()
+        if slot is None:  # pragma: no cover - acquire() without a timeout always admits
+            msg = "the limiter did not admit the request"
+            raise RuntimeError(msg)
+        try:
+            yield slot
+        except BaseException as err:
+            self.release(slot, err)
+            raise
+        self.release(slot)
+
+
+class AdaptiveTransport(Transport):
+    """Forward requests to another transport, within an adaptive concurrency limit.
+
+    Attributes:
+    - transport (Transport): The transport doing the actual requests.
+    - limiter (AIMDLimiter): The concurrency limit.
+    """
+
+    def __init__(
+        self,
+        transport: Transport,
+        limiter: AIMDLimiter | None = None,
+    ) -> None:
+        """Initialize a new AdaptiveTransport instance.
+
+        Parameters:
+        - transport (Transport): The transport doing the actual requests.
+        - limiter (AIMDLimiter | None): The concurrency limit. Defaults to an `AIMDLimiter` with default settings.
+        """
+        self.transport = transport
+        self.limiter = limiter or AIMDLimiter()
+
+    @property
+    def session(self) -> Any:
+        """Return the session of the wrapped transport, if it has one."""
+        return getattr(self.transport, "session", None)
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        *,
+        data: str | bytes | Any | None = None,
+        params: str | None = None,
+        headers: Mapping[str, str] | None = None,
+        auth: tuple[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> Response:
+        """Wait for a free slot, then forward the request.
+
+        Parameters:
+        - method (str): The HTTP method, in lowercase (e.g. 'get').
+        - url (str): The full URL of the request, without the query string.
+        - data (str | bytes | Any | None): The request body.
+        - params (str | None): The encoded query string.
+        - headers (Mapping[str, str] | None): The request headers.
+        - auth (tuple[str, str] | None): The basic authentication credentials.
+        - timeout (float | None): The timeout of the request in seconds.
+
+        Returns:
+        - Response: The response of the wrapped transport.
+        """
+        with self.limiter.slot() as slot:
+            response = self.transport.send(
+                method,
+                url,
+                data=data,
+                params=params,
+                headers=headers,
+                auth=auth,
+                timeout=timeout,
+            )
+            slot.record(response)
+        return response
+
+    def close(self) -> None:
+        """Close the wrapped transport."""
+        self.transport.close()
+
+
+def map_adaptive(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    limiter: AIMDLimiter | None = None,
+) -> list[R]:
+    """Apply a function to every item, with an adaptive number running at once.
+
+    `func` typically sends one request per item, e.g.
+    `lambda batch: client.send.create(data=batch)`. When it returns an object
+    with a `status_code`, that status is reported to the limiter.
+
+    Parameters:
+    - func (Callable[[T], R]): The function to apply.
+    - items (Iterable[T]): The items.
+    - limiter (AIMDLimiter | None): The concurrency limit. Defaults to an `AIMDLimiter` with default settings.
+
+    Returns:
+    - list[R]: The results, in the order of the items.
+
+    Raises:
+    - Exception: The first exception raised by `func`, in the order of the items, once every call has finished.
+    """
+    limiter = limiter or AIMDLimiter()
+
+    def run(item: T) -> R:
+        with limiter.slot() as slot:
+            result = func(item)
+            slot.record(result)
+        return result
+
+    with ThreadPoolExecutor(max_workers=limiter.max_limit) as executor:
+        futures = [executor.submit(run, item) for item in items]
+    return [future.result() for future in futures]
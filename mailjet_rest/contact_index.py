@@ -0,0 +1,396 @@
+"""A local SQLite mirror of Mailjet contacts for fast email-to-ID lookups.
+
+Resolving an email address to a contact ID with `contact.get(id=email)` costs
+one API round-trip per address. The `mailjet_rest.contact_index` module bulk
+loads the `contact` and `contactdata` resources into an indexed SQLite store,
+serves lookups locally and keeps the mirror fresh by fetching only the contacts
+created since the previous refresh, and by periodic full reloads for the
+changes of existing contacts, optionally from a background thread.
+
+Classes:
+    - ContactIndex: The local contact mirror.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import TYPE_CHECKING
+from typing import Any
+
+from mailjet_rest.stats import ColumnTable
+from mailjet_rest.utils.pagination import MAX_PAGE_SIZE
+from mailjet_rest.utils.pagination import iter_pages
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from collections.abc import Mapping
+    from pathlib import Path
+
+    from mailjet_rest.client import Client
+    from mailjet_rest.client import Endpoint
+
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacts (
+    id INTEGER PRIMARY KEY,
+    email TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS contacts_email ON contacts (email);
+CREATE TABLE IF NOT EXISTS contactdata (
+    contact_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    value TEXT,
+    PRIMARY KEY (contact_id, name)
+);
+"""
+_STAGING_SCHEMA = """
+DROP TABLE IF EXISTS staging_contacts;
+DROP TABLE IF EXISTS staging_contactdata;
+CREATE TEMP TABLE staging_contacts (
+    id INTEGER PRIMARY KEY,
+    email TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TEMP TABLE staging_contactdata (
+    contact_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    value TEXT,
+    PRIMARY KEY (contact_id, name)
+);
+"""
+
+
+class ContactIndex:
+    """Mirror contacts and their properties into an indexed SQLite store.
+
+    Email addresses are stored lowercased, so lookups are case-insensitive.
+    Incremental refreshes request contacts sorted by descending ID and stop at
+    the first contact that is already known, so they only add new contacts:
+    property edits, email changes and deletions of existing contacts are only
+    picked up by a full `load`. The background refresh runs one every
+    `reload_interval` seconds.
+
+    The instance can be shared between threads: every database access is
+    serialised by an internal lock.
+
+    Attributes:
+    - client (Client): The client used to query the API.
+    - page_size (int): The `Limit` used for every page request.
+
+    Example:
+        index = ContactIndex(client, "contacts.sqlite")
+        index.load()
+        index.start_background_refresh(interval=300, reload_interval=3600)
+        contact_id = index.lookup("passenger@mailjet.com")
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        path: str | Path = ":memory:",
+        page_size: int = MAX_PAGE_SIZE,
+    ) -> None:
+        """Initialize a new ContactIndex instance.
+
+        Parameters:
+        - client (Client): The client used to query the API.
+        - path (str | Path): The SQLite database file. Defaults to an in-memory database.
+        - page_size (int): The `Limit` used for every page request.
+        """
+        self.client = client
+        self.page_size = page_size
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._loaded_at: float | None = None
+
+    def __len__(self) -> int:
+        """Return the number of mirrored contacts."""
+        with self._lock:
+            return int(
+                self._conn.execute("SELECT COUNT(*) FROM contacts").fetchone()[0],
+            )
+
+    def close(self) -> None:
+        """Stop the background refresh, if any, and close the database."""
+        self.stop_background_refresh()
+        with self._lock:
+            self._conn.close()
+
+    def lookup(self, email: str) -> int | None:
+        """Return the ID of the contact with the given email address.
+
+        Parameters:
+        - email (str): The email address to resolve.
+
+        Returns:
+        - int | None: The contact ID, or None if the address is not mirrored.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id FROM contacts WHERE email = ?",
+                (email.strip().lower(),),
+            ).fetchone()
+        return row[0] if row else None
+
+    def resolve(self, email: str) -> int | None:
+        """Return the ID of a contact, falling back to the API on a local miss.
+
+        A contact found through the API is added to the mirror.
+
+        Parameters:
+        - email (str): The email address to resolve.
+
+        Returns:
+        - int | None: The contact ID, or None if the contact does not exist.
+        """
+        contact_id = self.lookup(email)
+        if contact_id is not None:
+            return contact_id
+        response = self.client.contact.get(id=email)
+        if response.status_code != 200:
+            return None
+        contacts: list[dict[str, Any]] = response.json().get("Data", [])
+        self._store_contacts(contacts)
+        return contacts[0]["ID"] if contacts else None
+
+    def contact(self, email: str) -> dict[str, Any] | None:
+        """Return the mirrored contact record for an email address.
+
+        Parameters:
+        - email (str): The email address of the contact.
+
+        Returns:
+        - dict[str, Any] | None: The contact as returned by the API, or None if it is not mirrored.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM contacts WHERE email = ?",
+                (email.strip().lower(),),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def properties(self, contact_id: int) -> dict[str, Any]:
+        """Return the mirrored contact properties of a contact.
+
+        Parameters:
+        - contact_id (int): The ID of the contact.
+
+        Returns:
+        - dict[str, Any]: The property values keyed by property name.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, value FROM contactdata WHERE contact_id = ?",
+                (contact_id,),
+            ).fetchall()
+        return {name: json.loads(value) for name, value in rows}
+
+    def set_properties(self, contact_id: int, properties: Mapping[str, Any]) -> None:
+        """Record property values of a contact, e.g. after updating them.
+
+        Parameters:
+        - contact_id (int): The ID of the contact.
+        - properties (Mapping[str, Any]): The new property values keyed by property name; other properties are kept.
+        """
+        rows = [
+            (contact_id, name, json.dumps(value)) for name, value in properties.items()
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO contactdata (contact_id, name, value) "
+                "VALUES (?, ?, ?)",
+                rows,
+            )
+
+    def table(self) -> ColumnTable:
+        """Return the mirrored contacts as a table with one column per property.
+
+        Returns:
+        - ColumnTable: The `ID` and `Email` columns, then one column per property name;
+          properties a contact does not have are None.
+        """
+        with self._lock:
+            contacts = self._conn.execute(
+                "SELECT id, email FROM contacts ORDER BY id",
+            ).fetchall()
+            data = self._conn.execute(
+                "SELECT contact_id, name, value FROM contactdata",
+            ).fetchall()
+        rows = {contact_id: index for index, (contact_id, _) in enumerate(contacts)}
+        columns: dict[str, list[Any]] = {
+            "ID": [contact_id for contact_id, _ in contacts],
+            "Email": [email for _, email in contacts],
+        }
+        for contact_id, name, value in data:
+            if contact_id not in rows:
+                continue
+            column = columns.setdefault(name, [None] * len(contacts))
+            column[rows[contact_id]] = json.loads(value)
+        return ColumnTable(columns)
+
+    def load(self) -> int:
+        """Replace the mirror with a full copy of `contact` and `contactdata`.
+
+        The copy is fetched into staging tables and swapped in with a single
+        transaction, so lookups keep seeing the previous mirror until the new
+        one is complete. If a page request fails, the previous mirror is kept.
+
+        Returns:
+        - int: The number of mirrored contacts.
+        """
+        with self._sync_lock:
+            with self._lock, self._conn:
+                self._conn.executescript(_STAGING_SCHEMA)
+            try:
+                for page in iter_pages(self.client.contact, limit=self.page_size):
+                    self._store_contacts(page, "staging_contacts")
+                for page in iter_pages(self.client.contactdata, limit=self.page_size):
+                    self._store_contactdata(page, "staging_contactdata")
+                with self._lock, self._conn:
+                    self._conn.execute("DELETE FROM contacts")
+                    self._conn.execute("DELETE FROM contactdata")
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO contacts SELECT * FROM staging_contacts",
+                    )
+                    self._conn.execute(
+                        "INSERT INTO contactdata SELECT * FROM staging_contactdata",
+                    )
+            finally:
+                with self._lock, self._conn:
+                    self._conn.execute("DROP TABLE IF EXISTS staging_contacts")
+                    self._conn.execute("DROP TABLE IF EXISTS staging_contactdata")
+            self._loaded_at = time.monotonic()
+        return len(self)
+
+    def refresh(self) -> int:
+        """Add the contacts created since the last load or refresh.
+
+        Only new contacts are fetched: changed properties, changed email
+        addresses and deleted contacts are not picked up until the next `load`.
+
+        Returns:
+        - int: The number of contacts added to the mirror.
+        """
+        with self._sync_lock:
+            with self._lock:
+                row = self._conn.execute("SELECT MAX(id) FROM contacts").fetchone()
+            known_max: int = row[0] or 0
+            added = 0
+            for page in self._newer_than(self.client.contact, "ID", known_max):
+                self._store_contacts(page)
+                added += len(page)
+            for page in self._newer_than(
+                self.client.contactdata,
+                "ContactID",
+                known_max,
+            ):
+                self._store_contactdata(page)
+        return added
+
+    def start_background_refresh(
+        self,
+        interval: float = 300.0,
+        reload_interval: float | None = 3600.0,
+    ) -> None:
+        """Refresh the mirror periodically from a daemon thread.
+
+        Parameters:
+        - interval (float): The number of seconds between two refreshes.
+        - reload_interval (float | None): The number of seconds after which a refresh is replaced by a
+          full `load`, so changes and deletions of existing contacts are picked up. None never reloads.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._refresh_loop,
+            args=(interval, reload_interval),
+            name="mailjet-contact-index",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop_background_refresh(self, timeout: float | None = None) -> None:
+        """Stop the background refresh thread.
+
+        Parameters:
+        - timeout (float | None): The maximum number of seconds to wait for the thread.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _refresh_loop(self, interval: float, reload_interval: float | None) -> None:
+        while not self._stop.wait(interval):
+            try:
+                if reload_interval is not None and (
+                    self._loaded_at is None
+                    or time.monotonic() - self._loaded_at >= reload_interval
+                ):
+                    self.load()
+                else:
+                    self.refresh()
+            except Exception:  # noqa: PERF203
+                logger.exception("Contact index refresh failed")
+
+    def _newer_than(
+        self,
+        endpoint: Endpoint,
+        id_field: str,
+        known_max: int,
+    ) -> Iterator[list[dict[str, Any]]]:
+        for page in iter_pages(
+            endpoint,
+            filters={"Sort": "ID DESC"},
+            limit=self.page_size,
+        ):
+            newer = [record for record in page if record[id_field] > known_max]
+            if newer:
+                yield newer
+            if len(newer) < len(page):
+                return
+
+    def _store_contacts(
+        self,
+        contacts: list[dict[str, Any]],
+        table: str = "contacts",
+    ) -> None:
+        rows = [
+            (contact["ID"], contact["Email"].strip().lower(), json.dumps(contact))
+            for contact in contacts
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {table} (id, email, data) VALUES (?, ?, ?)",  # noqa: S608
+                rows,
+            )
+
+    def _store_contactdata(
+        self,
+        records: list[dict[str, Any]],
+        table: str = "contactdata",
+    ) -> None:
+        rows = [
+            (record["ContactID"], item["Name"], json.dumps(item.get("Value")))
+            for record in records
+            for item in record.get("Data", [])
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {table} (contact_id, name, value) "  # noqa: S608
+                "VALUES (?, ?, ?)",
+                rows,
+            )
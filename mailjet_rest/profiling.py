@@ -0,0 +1,276 @@
+"""Attribution of the client's time and memory to request phases and resources.
+
+Every `Client` has a `Profiler`, disabled by default. `Client.profile()`
+enables it for the duration of a `with` block and prints a summary ranking
+where the time went. Each request is split in phases, measured separately
+for each resource:
+
+    - endpoint: `Client.__getattr__`, i.e. the `Config` lookup and the creation of the `Endpoint`.
+    - encode: the serialization of the request body (`Endpoint._encode_data`).
+    - url: the construction of the request URL and query string (`build_url`).
+    - network: the request itself, through the transport.
+    - parse: the decoding of the JSON body of the response (`Response.json()`, `parse_response`).
+
+For every phase, the profiler records the number of calls, the wall time, the
+CPU time of the calling thread and, when allocation tracing is on, the net
+memory allocated (through `tracemalloc`).
+
+Classes:
+    - PhaseStats: The totals measured for one phase of one resource.
+    - Profiler: Measures the phases of the requests of a client.
+
+Functions:
+    - resource_name: Return the resource targeted by an endpoint URL.
+
+Attributes:
+    - PHASES: The phases measured by the profiler, in the order of a request.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import sys
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from typing import Any
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from typing import IO
+
+    from requests.models import Response  # type: ignore[import-untyped]
+
+
+PHASES: tuple[str, ...] = ("endpoint", "encode", "url", "network", "parse")
+
+_DISABLED = contextlib.nullcontext()
+
+
+def resource_name(url: str) -> str:
+    """Return the resource targeted by an endpoint URL.
+
+    Parameters:
+    - url (str): The URL of an endpoint, before the IDs and actions are appended.
+
+    Returns:
+    - str: Its last path segment, e.g. "contact" for "https://api.mailjet.com/v3/REST/contact".
+    """
+    return url.rstrip("/").rsplit("/", 1)[-1]
+
+
+@dataclass
+class PhaseStats:
+    """The totals measured for one phase of one resource.
+
+    Attributes:
+    - calls (int): The number of times the phase ran.
+    - wall (float): The total wall time, in seconds.
+    - cpu (float): The total CPU time of the calling threads, in seconds.
+    - allocated (int): The net memory allocated, in bytes, if allocations are traced.
+    """
+
+    calls: int = 0
+    wall: float = 0.0
+    cpu: float = 0.0
+    allocated: int = 0
+
+    def add(self, other: PhaseStats) -> None:
+        """Add the totals of another `PhaseStats` to these ones.
+
+        Parameters:
+        - other (PhaseStats): The totals to add.
+        """
+        self.calls += other.calls
+        self.wall += other.wall
+        self.cpu += other.cpu
+        self.allocated += other.allocated
+
+
+class Profiler:
+    """Measure the phases of the requests of a client.
+
+    The measures are taken only while the profiler is enabled (see `start` and
+    `stop`, or `Client.profile()`); otherwise `phase` returns a shared no-op
+    context manager, so a disabled profiler costs an attribute lookup per phase.
+
+    Phases running concurrently in several threads are all recorded, so the
+    wall times of the phases can add up to more than the elapsed time.
+
+    Attributes:
+    - enabled (bool): Whether the phases are currently measured.
+    - trace_allocations (bool): Whether the net allocations of the phases are measured.
+    - stats (dict[tuple[str, str], PhaseStats]): The totals of each (phase, resource) pair.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a new, disabled, Profiler instance."""
+        self.enabled = False
+        self.trace_allocations = False
+        self.stats: dict[tuple[str, str], PhaseStats] = {}
+        self._lock = threading.Lock()
+        self._started_tracemalloc = False
+
+    def start(self, trace_allocations: bool = True) -> None:
+        """Clear the previous measures and enable the profiler.
+
+        Parameters:
+        - trace_allocations (bool): Whether to measure the net allocations of the phases.
+          `tracemalloc` is started if it is not tracing already, which slows the whole process down.
+        """
+        with self._lock:
+            self.stats = {}
+        self.trace_allocations = trace_allocations
+        if trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self.enabled = True
+
+    def stop(self) -> None:
+        """Disable the profiler, keeping its measures."""
+        self.enabled = False
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def phase(self, name: str, resource: str) -> contextlib.AbstractContextManager[Any]:
+        """Return a context manager measuring a phase, if the profiler is enabled.
+
+        Parameters:
+        - name (str): The phase, one of `PHASES`.
+        - resource (str): The resource the request targets.
+
+        Returns:
+        - AbstractContextManager[Any]: Records the phase when it exits.
+        """
+        if not self.enabled:
+            return _DISABLED
+        return self._measure(name, resource)
+
+    @contextlib.contextmanager
+    def _measure(self, name: str, resource: str) -> Iterator[None]:
+        trace = self.trace_allocations and tracemalloc.is_tracing()
+        memory = tracemalloc.get_traced_memory()[0] if trace else 0
+        cpu = time.thread_time()
+        wall = time.perf_counter()
+        try:
+            yield
+        finally:
+            measured = PhaseStats(
+                calls=1,
+                wall=time.perf_counter() - wall,
+                cpu=time.thread_time() - cpu,
+                allocated=tracemalloc.get_traced_memory()[0] - memory if trace else 0,
+            )
+            with self._lock:
+                self.stats.setdefault((name, resource), PhaseStats()).add(measured)
+
+    def track_response(self, response: Response, resource: str) -> Response:
+        """Measure the decoding of a response body in the parse phase.
+
+        The `json` method of the response is replaced by one measuring each
+        call, whether it comes from `parse_response` or from the caller.
+
+        Parameters:
+        - response (Response): The response of a request.
+        - resource (str): The resource the request targeted.
+
+        Returns:
+        - Response: The same response.
+        """
+        if not self.enabled or getattr(response, "_profiled", False):
+            return response
+        decode = response.json
+
+        def json(**kwargs: Any) -> Any:
+            with self.phase("parse", resource):
+                return decode(**kwargs)
+
+        response.json = json  # type: ignore[method-assign]
+        response._profiled = True  # type: ignore[attr-defined]  # noqa: SLF001
+        return response
+
+    def by_phase(self) -> dict[str, PhaseStats]:
+        """Return the totals of each phase, for all resources.
+
+        Returns:
+        - dict[str, PhaseStats]: The totals of the measured phases, in the order of `PHASES`.
+        """
+        totals: dict[str, PhaseStats] = {}
+        with self._lock:
+            stats = list(self.stats.items())
+        order = {name: index for index, name in enumerate(PHASES)}
+        for (name, _), measured in sorted(
+            stats,
+            key=lambda item: order.get(item[0][0], len(order)),
+        ):
+            totals.setdefault(name, PhaseStats()).add(measured)
+        return totals
+
+    def ranked(self) -> list[tuple[str, str, PhaseStats]]:
+        """Return the totals of each (phase, resource) pair, the slowest first.
+
+        Returns:
+        - list[tuple[str, str, PhaseStats]]: (phase, resource, totals) triples, by decreasing wall time.
+        """
+        with self._lock:
+            stats = list(self.stats.items())
+        return sorted(
+            ((name, resource, measured) for (name, resource), measured in stats),
+            key=lambda row: row[2].wall,
+            reverse=True,
+        )
+
+    def format(self, limit: int | None = 20) -> str:
+        """Return a text summary of the measures.
+
+        Parameters:
+        - limit (int | None): The largest number of (phase, resource) rows to show, or None for all.
+
+        Returns:
+        - str: The totals by phase, then by phase and resource, the slowest first.
+        """
+        phases = self.by_phase()
+        total = sum(measured.wall for measured in phases.values()) or 1.0
+        lines = ["By phase:"]
+        lines.extend(
+            self._line(name, "", measured, total) for name, measured in phases.items()
+        )
+        lines.append("By phase and resource:")
+        lines.extend(
+            self._line(name, resource, measured, total)
+            for name, resource, measured in self.ranked()[:limit]
+        )
+        return "\n".join(lines)
+
+    def _line(
+        self,
+        name: str,
+        resource: str,
+        measured: PhaseStats,
+        total: float,
+    ) -> str:
+        allocated = (
+            f"{measured.allocated / 1024:10.1f} KiB" if self.trace_allocations else ""
+        )
+        return (
+            f"  {name:<9}{resource:<24}{measured.calls:>7} calls"
+            f"{measured.wall * 1000:>11.2f} ms {measured.wall / total:6.1%}"
+            f"{measured.cpu * 1000:>11.2f} ms cpu{allocated}"
+        )
+
+    def print_summary(
+        self,
+        stream: IO[str] | None = None,
+        limit: int | None = 20,
+    ) -> None:
+        """Print the summary returned by `format`.
+
+        Parameters:
+        - stream (IO[str] | None): Where to print the summary. Defaults to stderr.
+        - limit (int | None): The largest number of (phase, resource) rows to show, or None for all.
+        """
+        print(self.format(limit), file=stream or sys.stderr)
@@ -0,0 +1,294 @@
+"""Bulk synchronisation of contact properties, sending only what changed.
+
+Pushing property values from a CRM with one `contactdata.update` call per
+contact resends every unchanged field and costs one round-trip per contact.
+`PropertySync` compares the desired values against a local snapshot of the
+properties (a `ContactIndex`), drops the contacts and properties that did not
+change, and sends the remaining changes in bulk
+`contact_managemanycontacts` jobs. A change touching fewer than `min_batch`
+contacts is sent with direct `contactdata` updates instead, which avoids the
+job polling.
+
+Values are compared by their text, so `42`, `42.0` and `"42"` differ but
+`True` and `"true"` do not; a None value is the same as an empty value. After
+a successful update, the snapshot is updated so the next run only sends newer
+changes. Contacts unknown to the snapshot are sent with all their properties
+and created by the job; `ContactIndex.refresh()` picks them up.
+
+The snapshot is only as accurate as its last full `ContactIndex.load()`:
+`refresh()` adds new contacts but not the values changed by others. If other
+systems edit the same properties, a stale snapshot can hold the desired value
+already and skip a change that is needed; reload the snapshot before syncing
+(or run its background refresh with a `reload_interval`).
+
+Classes:
+    - PropertySyncResult: The counters of a synchronisation run.
+    - PropertySync: Sends the property changes of many contacts.
+
+Functions:
+    - diff_properties: Return the desired properties whose value changed.
+"""
+
+from __future__ import annotations
+
+import itertools
+from dataclasses import dataclass
+from dataclasses import field
+from typing import TYPE_CHECKING
+from typing import Any
+
+from mailjet_rest.client import ApiError
+from mailjet_rest.utils.jobs import job_error
+from mailjet_rest.utils.jobs import run_job
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+    from collections.abc import Mapping
+
+    from mailjet_rest.client import Client
+    from mailjet_rest.contact_index import ContactIndex
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def diff_properties(
+    current: Mapping[str, Any],
+    desired: Mapping[str, Any],
+) -> dict[str, Any]:
+    """Return the desired properties whose value changed.
+
+    Parameters:
+    - current (Mapping[str, Any]): The known property values of a contact.
+    - desired (Mapping[str, Any]): The property values it should have; properties not listed are left alone.
+
+    Returns:
+    - dict[str, Any]: The desired values differing from the known ones.
+    """
+    return {
+        name: value
+        for name, value in desired.items()
+        if _text(current.get(name)) != _text(value)
+    }
+
+
+@dataclass
+class PropertySyncResult:
+    """The counters of a synchronisation run.
+
+    Attributes:
+    - contacts (int): The number of contacts compared.
+    - unchanged (int): The number of contacts without any change, which were not sent.
+    - unknown (int): The number of contacts missing from the snapshot, sent with all their properties.
+    - properties_sent (int): The number of property values sent.
+    - properties_skipped (int): The number of unchanged property values not sent.
+    - updates (int): The number of direct `contactdata` updates.
+    - jobs (list[dict[str, Any]]): The `managemanycontacts` jobs, with their `JobID` and last known status.
+    - failed (list[str]): The email addresses whose changes may not have been applied.
+    - errors (list[str]): The error messages of the failed updates and jobs.
+    """
+
+    contacts: int = 0
+    unchanged: int = 0
+    unknown: int = 0
+    properties_sent: int = 0
+    properties_skipped: int = 0
+    updates: int = 0
+    jobs: list[dict[str, Any]] = field(default_factory=list)
+    failed: list[str] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def calls(self) -> int:
+        """Return the number of update requests sent (not counting job status requests)."""
+        return self.updates + len(self.jobs)
+
+    @property
+    def calls_avoided(self) -> int:
+        """Return the number of requests saved compared to one update per contact."""
+        return max(self.contacts - self.calls, 0)
+
+
+class PropertySync:
+    """Send the property changes of many contacts.
+
+    Attributes:
+    - client (Client): The client used to send the changes.
+    - snapshot (ContactIndex): The known property values, updated after every successful change.
+    - batch_size (int): The largest number of contacts per `managemanycontacts` job.
+    - min_batch (int): The smallest number of known contacts worth a job; fewer are updated directly.
+    - wait (bool): Whether to wait for the jobs to finish before updating the snapshot.
+    - poll_interval (float): The time between two job status requests, in seconds.
+
+    Example:
+        index = ContactIndex(client, "contacts.sqlite")
+        index.load()
+        result = PropertySync(client, index).sync(crm_properties_by_email)
+        print(result.properties_sent, result.calls_avoided)
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        snapshot: ContactIndex,
+        batch_size: int = 1000,
+        min_batch: int = 2,
+        wait: bool = True,
+        poll_interval: float = 2.0,
+    ) -> None:
+        """Initialize a new PropertySync instance.
+
+        Parameters:
+        - client (Client): The client used to send the changes.
+        - snapshot (ContactIndex): The known property values, updated after every successful change.
+        - batch_size (int): The largest number of contacts per `managemanycontacts` job.
+        - min_batch (int): The smallest number of known contacts worth a job; fewer are updated directly.
+        - wait (bool): Whether to wait for the jobs to finish before updating the snapshot.
+          If False, the snapshot is updated as soon as a job is accepted.
+        - poll_interval (float): The time between two job status requests, in seconds.
+        """
+        self.client = client
+        self.snapshot = snapshot
+        self.batch_size = batch_size
+        self.min_batch = min_batch
+        self.wait = wait
+        self.poll_interval = poll_interval
+
+    def changes(
+        self,
+        desired: Mapping[str, Mapping[str, Any]]
+        | Iterable[tuple[str, Mapping[str, Any]]],
+        result: PropertySyncResult | None = None,
+    ) -> Iterator[tuple[str, int | None, dict[str, Any]]]:
+        """Yield the contacts whose properties changed, with the changed values.
+
+        Parameters:
+        - desired (Mapping[str, Mapping[str, Any]] | Iterable[tuple[str, Mapping[str, Any]]]): The desired
+          property values of each contact, by email address.
+        - result (PropertySyncResult | None): Receives the comparison counters, if set.
+
+        Yields:
+        - tuple[str, int | None, dict[str, Any]]: The email address, the contact ID (None if the
+          contact is not in the snapshot) and the changed property values.
+        """
+        result = result if result is not None else PropertySyncResult()
+        items = desired.items() if hasattr(desired, "items") else desired
+        for email, properties in items:
+            result.contacts += 1
+            contact_id = self.snapshot.lookup(email)
+            if contact_id is None:
+                changed = dict(properties)
+                result.unknown += 1
+            else:
+                changed = diff_properties(
+                    self.snapshot.properties(contact_id),
+                    properties,
+                )
+            result.properties_sent += len(changed)
+            result.properties_skipped += len(properties) - len(changed)
+            if not changed:
+                result.unchanged += 1
+                continue
+            yield email.strip(), contact_id, changed
+
+    def sync(
+        self,
+        desired: Mapping[str, Mapping[str, Any]]
+        | Iterable[tuple[str, Mapping[str, Any]]],
+    ) -> PropertySyncResult:
+        """Send the changed properties of the given contacts.
+
+        The desired values are consumed as a stream: at most `batch_size`
+        changed contacts are held in memory at once.
+
+        Parameters:
+        - desired (Mapping[str, Mapping[str, Any]] | Iterable[tuple[str, Mapping[str, Any]]]): The desired
+          property values of each contact, by email address. Properties not listed are left alone.
+
+        Returns:
+        - PropertySyncResult: The counters of the run.
+        """
+        result = PropertySyncResult()
+        changes = self.changes(desired, result)
+        while batch := list(itertools.islice(changes, self.batch_size)):
+            direct = len(batch) < self.min_batch and all(
+                contact_id is not None for _, contact_id, _ in batch
+            )
+            if direct:
+                for change in batch:
+                    self._update(change, result)
+            else:
+                self._submit(batch, result)
+        return result
+
+    def _update(
+        self,
+        change: tuple[str, int | None, dict[str, Any]],
+        result: PropertySyncResult,
+    ) -> None:
+        email, contact_id, changed = change
+        result.updates += 1
+        try:
+            response = self.client.contactdata.update(
+                id=contact_id,
+                data={
+                    "Data": [
+                        {"Name": name, "Value": value}
+                        for name, value in changed.items()
+                    ],
+                },
+            )
+        except ApiError as err:
+            result.failed.append(email)
+            result.errors.append(f"{email}: {err}")
+            return
+        if response.status_code != 200:
+            result.failed.append(email)
+            result.errors.append(
+                f"{email}: HTTP {response.status_code} {response.text}",
+            )
+            return
+        self.snapshot.set_properties(contact_id, changed)  # type: ignore[arg-type]
+
+    def _submit(
+        self,
+        batch: list[tuple[str, int | None, dict[str, Any]]],
+        result: PropertySyncResult,
+    ) -> None:
+        emails = [email for email, _, _ in batch]
+        endpoint = self.client.contact_managemanycontacts
+        try:
+            job = run_job(
+                lambda: endpoint.create(
+                    data={
+                        "Contacts": [
+                            {"Email": email, "Properties": changed}
+                            for email, _, changed in batch
+                        ],
+                    },
+                ),
+                lambda job_id: endpoint.get(action_id=job_id),
+                "managemanycontacts",
+                wait=self.wait,
+                poll_interval=self.poll_interval,
+                jobs=result.jobs,
+            )
+        except ApiError as err:
+            result.failed.extend(emails)
+            result.errors.append(str(err))
+            return
+        error = job_error(job)
+        if error:
+            result.failed.extend(emails)
+            result.errors.append(error)
+            return
+        for _, contact_id, changed in batch:
+            if contact_id is not None:
+                self.snapshot.set_properties(contact_id, changed)
@@ -0,0 +1,375 @@
+"""Reconciliation of a contact list with a desired set of email addresses.
+
+`ListReconciler` makes the subscribed members of a `contactslist` match the
+email addresses of a source of truth with the fewest calls: it streams the
+current membership page by page, computes which addresses must be added and
+which members must be removed (or unsubscribed), and submits only those
+changes as `contactslist_managemanycontacts` jobs.
+
+Memberships are compared through 64-bit digests of the normalised addresses,
+kept in sorted arrays (`DigestSet`), so both sides take 8 bytes per address
+rather than a Python string each; only the addresses to change are kept as
+strings. With NumPy installed, the arrays are sorted and searched with NumPy.
+Two different addresses share a digest with a probability of about n² / 2⁶⁵
+for n addresses, i.e. one in 370,000 for ten million addresses.
+
+The desired addresses are read twice. When they are given as an iterator
+(e.g. a generator over a file or a database cursor), they are spooled to a
+temporary file during the first pass.
+
+Classes:
+    - DigestSet: A compact, sorted set of 64-bit integers.
+    - ReconcilePlan: The changes needed to reconcile a list.
+    - ReconcileResult: The outcome of a reconciliation.
+    - ListReconciler: Computes and applies the changes of a contact list.
+
+Functions:
+    - email_digest: Return the 64-bit digest of a normalised email address.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import heapq
+import itertools
+import tempfile
+from array import array
+from dataclasses import dataclass
+from dataclasses import field
+from typing import TYPE_CHECKING
+from typing import Any
+
+from mailjet_rest.client import ApiError
+from mailjet_rest.utils.jobs import job_error
+from mailjet_rest.utils.jobs import run_job
+from mailjet_rest.utils.pagination import MAX_PAGE_SIZE
+from mailjet_rest.utils.pagination import iter_records
+
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when NumPy is missing
+    np = None  # type: ignore[assignment]
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+
+    from mailjet_rest.client import Client
+
+
+_SORT_CHUNK = 1 << 16
+
+
+def email_digest(email: str) -> int:
+    """Return the 64-bit digest of a normalised email address.
+
+    Parameters:
+    - email (str): The email address; surrounding spaces and case are ignored.
+
+    Returns:
+    - int: The digest, an unsigned 64-bit integer.
+    """
+    return int.from_bytes(
+        hashlib.blake2b(email.strip().lower().encode("utf-8"), digest_size=8).digest(),
+        "big",
+    )
+
+
+def _sorted_unique(values: Iterable[int]) -> array[int]:
+    """Sort and deduplicate integers, holding at most one chunk as Python objects."""
+    iterator = iter(values)
+    runs = []
+    while chunk := list(itertools.islice(iterator, _SORT_CHUNK)):
+        runs.append(array("Q", sorted(set(chunk))))
+    merged = array("Q")
+    for value in heapq.merge(*runs):
+        if not merged or merged[-1] != value:
+            merged.append(value)
+    return merged
+
+
+class DigestSet:
+    """A compact, sorted set of 64-bit integers.
+
+    The values are stored in a sorted array of 8 bytes per value (a NumPy
+    array when NumPy is installed); membership tests are binary searches.
+    """
+
+    def __init__(self, values: Iterable[int] = ()) -> None:
+        """Initialize a new DigestSet instance.
+
+        Parameters:
+        - values (Iterable[int]): The unsigned 64-bit integers of the set, in any order, possibly repeated.
+        """
+        self._values: Any
+        if np is not None:
+            self._values = np.unique(np.fromiter(values, dtype=np.uint64))
+        else:
+            self._values = _sorted_unique(values)
+
+    @classmethod
+    def of_emails(cls, emails: Iterable[str]) -> DigestSet:
+        """Return the set of the digests of email addresses.
+
+        Parameters:
+        - emails (Iterable[str]): The email addresses.
+
+        Returns:
+        - DigestSet: The set of their digests.
+        """
+        return cls(email_digest(email) for email in emails)
+
+    def __len__(self) -> int:
+        """Return the number of values of the set."""
+        return len(self._values)
+
+    def __contains__(self, value: object) -> bool:
+        """Return whether a value is in the set."""
+        if not isinstance(value, int) or not 0 <= value < 1 << 64:
+            return False
+        if np is not None:
+            index = int(np.searchsorted(self._values, np.uint64(value)))
+        else:
+            index = bisect.bisect_left(self._values, value)
+        return index < len(self._values) and int(self._values[index]) == value
+
+
+@dataclass
+class ReconcilePlan:
+    """The changes needed to reconcile a list.
+
+    Attributes:
+    - list_id (int): The ID of the contact list.
+    - to_add (list[str]): The desired addresses that are not subscribed members.
+    - to_drop (list[str]): The subscribed members that are not desired.
+    - members (int): The number of subscribed members.
+    - unsubscribed (int): The number of members who unsubscribed.
+    - desired (int): The number of distinct desired addresses.
+    """
+
+    list_id: int
+    to_add: list[str] = field(default_factory=list)
+    to_drop: list[str] = field(default_factory=list)
+    members: int = 0
+    unsubscribed: int = 0
+    desired: int = 0
+
+    @property
+    def unchanged(self) -> int:
+        """Return the number of subscribed members that stay subscribed."""
+        return self.members - len(self.to_drop)
+
+
+@dataclass
+class ReconcileResult:
+    """The outcome of a reconciliation.
+
+    Attributes:
+    - plan (ReconcilePlan): The changes that were submitted.
+    - jobs (list[dict[str, Any]]): The submitted jobs, with their `Action`, `JobID` and last known status.
+    - failed (list[str]): The addresses whose change may not have been applied.
+    - errors (list[str]): The error messages of the failed jobs.
+    """
+
+    plan: ReconcilePlan
+    jobs: list[dict[str, Any]] = field(default_factory=list)
+    failed: list[str] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+
+
+class ListReconciler:
+    """Compute and apply the changes making a contact list match desired addresses.
+
+    Attributes:
+    - client (Client): The client used to read and update the list.
+    - list_id (int): The ID of the contact list.
+    - add_action (str): The action adding missing addresses: "addforce" also resubscribes
+      members who unsubscribed, "addnoforce" leaves them unsubscribed.
+    - drop_action (str): The action applied to members that are not desired: "remove" or "unsub".
+    - batch_size (int): The largest number of contacts per job.
+    - page_size (int): The `Limit` used for every page request.
+    - wait (bool): Whether to wait for the jobs to finish.
+    - poll_interval (float): The time between two job status requests, in seconds.
+
+    Example:
+        reconciler = ListReconciler(client, list_id, drop_action="unsub")
+        result = reconciler.reconcile(row["email"] for row in crm_rows)
+        print(len(result.plan.to_add), len(result.plan.to_drop), result.failed)
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        list_id: int,
+        add_action: str = "addforce",
+        drop_action: str = "remove",
+        batch_size: int = 10_000,
+        page_size: int = MAX_PAGE_SIZE,
+        wait: bool = True,
+        poll_interval: float = 2.0,
+    ) -> None:
+        """Initialize a new ListReconciler instance.
+
+        Parameters:
+        - client (Client): The client used to read and update the list.
+        - list_id (int): The ID of the contact list.
+        - add_action (str): "addforce" to also resubscribe desired members who unsubscribed,
+          "addnoforce" to leave them unsubscribed.
+        - drop_action (str): "remove" to remove the members that are not desired, "unsub" to unsubscribe them.
+        - batch_size (int): The largest number of contacts per job.
+        - page_size (int): The `Limit` used for every page request.
+        - wait (bool): Whether to wait for the jobs to finish.
+        - poll_interval (float): The time between two job status requests, in seconds.
+
+        Raises:
+        - ValueError: If an action is not supported.
+        """
+        if add_action not in {"addforce", "addnoforce"}:
+            msg = f"add_action must be 'addforce' or 'addnoforce', not {add_action!r}"
+            raise ValueError(msg)
+        if drop_action not in {"remove", "unsub"}:
+            msg = f"drop_action must be 'remove' or 'unsub', not {drop_action!r}"
+            raise ValueError(msg)
+        self.client = client
+        self.list_id = list_id
+        self.add_action = add_action
+        self.drop_action = drop_action
+        self.batch_size = batch_size
+        self.page_size = page_size
+        self.wait = wait
+        self.poll_interval = poll_interval
+
+    def plan(self, desired: Iterable[str]) -> ReconcilePlan:
+        """Compute the changes making the list match the desired addresses, without applying them.
+
+        Parameters:
+        - desired (Iterable[str]): The addresses that should be subscribed members.
+
+        Returns:
+        - ReconcilePlan: The addresses to add and the members to drop.
+        """
+        plan = ReconcilePlan(list_id=self.list_id)
+        spool = None
+        if iter(desired) is desired:
+            spool = tempfile.TemporaryFile("w+", encoding="utf-8")  # noqa: SIM115
+        try:
+            wanted = DigestSet(self._digests(desired, spool))
+            plan.desired = len(wanted)
+            subscribed, unsubscribed = self._members(wanted, plan)
+            plan.members, plan.unsubscribed = len(subscribed), len(unsubscribed)
+            if spool is not None:
+                spool.seek(0)
+            seen: set[int] = set()
+            for line in spool if spool is not None else desired:
+                email = line.strip()
+                digest = email_digest(email) if email else None
+                if digest is None or digest in subscribed or digest in seen:
+                    continue
+                if self.add_action == "addnoforce" and digest in unsubscribed:
+                    continue
+                seen.add(digest)
+                plan.to_add.append(email)
+        finally:
+            if spool is not None:
+                spool.close()
+        return plan
+
+    def reconcile(
+        self,
+        desired: Iterable[str],
+        dry_run: bool = False,
+    ) -> ReconcileResult:
+        """Make the list match the desired addresses.
+
+        Parameters:
+        - desired (Iterable[str]): The addresses that should be subscribed members.
+        - dry_run (bool): Whether to only compute the changes, without submitting them.
+
+        Returns:
+        - ReconcileResult: The plan and the submitted jobs.
+        """
+        result = ReconcileResult(plan=self.plan(desired))
+        if dry_run:
+            return result
+        for action, emails in (
+            (self.add_action, result.plan.to_add),
+            (self.drop_action, result.plan.to_drop),
+        ):
+            for start in range(0, len(emails), self.batch_size):
+                self._submit(action, emails[start : start + self.batch_size], result)
+        return result
+
+    def _digests(self, desired: Iterable[str], spool: Any) -> Iterator[int]:
+        for line in desired:
+            email = line.strip()
+            if not email:
+                continue
+            if spool is not None:
+                spool.write(email + "\n")
+            yield email_digest(email)
+
+    def _members(
+        self,
+        wanted: DigestSet,
+        plan: ReconcilePlan,
+    ) -> tuple[DigestSet, DigestSet]:
+        """Stream the members of the list, collecting the ones to drop."""
+        unsubscribed_ids = DigestSet(
+            int(record["ContactID"])
+            for record in iter_records(
+                self.client.listrecipient,
+                filters={"ContactsList": self.list_id, "Unsub": "true"},
+                limit=self.page_size,
+            )
+        )
+        unsubscribed: list[int] = []
+
+        def digests() -> Iterator[int]:
+            for contact in iter_records(
+                self.client.contact,
+                filters={"ContactsList": self.list_id},
+                limit=self.page_size,
+            ):
+                email = contact["Email"]
+                digest = email_digest(email)
+                if int(contact["ID"]) in unsubscribed_ids:
+                    unsubscribed.append(digest)
+                    continue
+                if digest not in wanted:
+                    plan.to_drop.append(email)
+                yield digest
+
+        subscribed = DigestSet(digests())
+        return subscribed, DigestSet(unsubscribed)
+
+    def _submit(
+        self,
+        action: str,
+        emails: list[str],
+        result: ReconcileResult,
+    ) -> None:
+        endpoint = self.client.contactslist_managemanycontacts
+        try:
+            job = run_job(
+                lambda: endpoint.create(
+                    id=self.list_id,
+                    data={"Action": action, "Contacts": [{"Email": e} for e in emails]},
+                ),
+                lambda job_id: endpoint.get(id=self.list_id, action_id=job_id),
+                f"{action} job",
+                wait=self.wait,
+                poll_interval=self.poll_interval,
+                fields={"Action": action},
+                jobs=result.jobs,
+            )
+        except ApiError as err:
+            result.failed.extend(emails)
+            result.errors.append(str(err))
+            return
+        error = job_error(job)
+        if error:
+            result.failed.extend(emails)
+            result.errors.append(error)
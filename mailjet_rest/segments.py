@@ -0,0 +1,537 @@
+"""Local evaluation of contactfilter (segment) expressions.
+
+Tuning the `Expression` of a segment with `contactfilter.create` takes a
+round-trip per attempt to learn how many contacts it matches. The
+`mailjet_rest.segments` module parses the expression syntax and evaluates it
+over a local table of contacts (e.g. `ContactIndex.table()`), so the size of
+a segment can be estimated instantly before the filter is created.
+
+The supported syntax is the one used by segments:
+
+    - comparisons of a property with a literal: `=`, `!=` (or `<>`), `<`, `<=`, `>`, `>=`;
+    - literals: numbers, quoted strings ("..." or '...') and `true` / `false`;
+    - `IsInPreviousDays(property, days)`, true when a date property falls in the last days;
+    - `and`, `or`, `not` (in any case) and parentheses.
+
+Comparisons with a number compare the property values as numbers; a value that
+is not a number never matches. Comparisons with a string compare the values as
+text, and a missing value is the empty string. Comparisons with `true` or
+`false` ignore the case of the values.
+
+`SegmentPreview` evaluates a whole column at once: with NumPy installed, each
+property is converted once to a NumPy array (as numbers, text or timestamps)
+and the comparisons are vectorized; otherwise plain lists are used, with the
+same results.
+
+Classes:
+    - ExpressionSyntaxError: Error raised for an invalid expression.
+    - Comparison: A comparison of a property with a literal.
+    - InPreviousDays: A test that a date property falls in the last days.
+    - Not: The negation of an expression.
+    - BoolOp: The conjunction or disjunction of expressions.
+    - Expression: A parsed segment expression.
+    - SegmentPreview: Evaluates expressions over a table of contacts.
+"""
+
+from __future__ import annotations
+
+import math
+import operator
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from datetime import timezone
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Callable
+from typing import Union
+
+from mailjet_rest.stats import ColumnTable
+
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when NumPy is missing
+    np = None  # type: ignore[assignment]
+
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from mailjet_rest.contact_index import ContactIndex
+
+
+_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<number>-?\d+(?:\.\d+)?)
+        |(?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+        |(?P<op><=|>=|<>|!=|==|=|<|>)
+        |(?P<punct>[(),])
+        |(?P<name>[A-Za-z_][\w.]*)
+    )""",
+    re.VERBOSE,
+)
+_OPERATORS: dict[str, Callable[[Any, Any], Any]] = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+_ALIASES = {"==": "=", "<>": "!="}
+_KEYWORDS = frozenset({"and", "or", "not", "true", "false"})
+_DAY = 86400.0
+
+
+class ExpressionSyntaxError(ValueError):
+    """Error raised for an invalid segment expression."""
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """A comparison of a property with a literal.
+
+    Attributes:
+    - name (str): The property name.
+    - op (str): The operator: "=", "!=", "<", "<=", ">" or ">=".
+    - value (float | str | bool): The literal.
+    """
+
+    name: str
+    op: str
+    value: float | str | bool
+
+
+@dataclass(frozen=True)
+class InPreviousDays:
+    """A test that a date property falls in the last days.
+
+    Attributes:
+    - name (str): The property name.
+    - days (float): The number of days.
+    """
+
+    name: str
+    days: float
+
+
+@dataclass(frozen=True)
+class Not:
+    """The negation of an expression.
+
+    Attributes:
+    - operand (Node): The negated expression.
+    """
+
+    operand: Node
+
+
+@dataclass(frozen=True)
+class BoolOp:
+    """The conjunction or disjunction of expressions.
+
+    Attributes:
+    - op (str): "and" or "or".
+    - operands (tuple[Node, ...]): The combined expressions.
+    """
+
+    op: str
+    operands: tuple[Node, ...]
+
+
+Node = Union[Comparison, InPreviousDays, Not, BoolOp]
+
+
+def _tokenize(text: str) -> list[tuple[str, str]]:
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if match is None or match.end() == position:
+            msg = f"unexpected character at position {position}: {text[position:]!r}"
+            raise ExpressionSyntaxError(msg)
+        kind = match.lastgroup or ""
+        token = match.group(kind)
+        if kind == "name" and token.lower() in _KEYWORDS:
+            kind, token = token.lower(), token.lower()
+        tokens.append((kind, token))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """A recursive-descent parser of segment expressions."""
+
+    def __init__(self, text: str) -> None:
+        self.tokens = _tokenize(text)
+        self.position = 0
+
+    def parse(self) -> Node:
+        if not self.tokens:
+            msg = "empty expression"
+            raise ExpressionSyntaxError(msg)
+        node = self._or()
+        if self.position < len(self.tokens):
+            msg = f"unexpected {self.tokens[self.position][1]!r}"
+            raise ExpressionSyntaxError(msg)
+        return node
+
+    def _peek(self) -> tuple[str, str]:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return ("end", "")
+
+    def _take(self, kind: str, token: str | None = None) -> str:
+        found_kind, found = self._peek()
+        if found_kind != kind or (token is not None and found != token):
+            msg = f"expected {token or kind}, found {found or 'the end'!r}"
+            raise ExpressionSyntaxError(msg)
+        self.position += 1
+        return found
+
+    def _or(self) -> Node:
+        operands = [self._and()]
+        while self._peek()[0] == "or":
+            self.position += 1
+            operands.append(self._and())
+        return operands[0] if len(operands) == 1 else BoolOp("or", tuple(operands))
+
+    def _and(self) -> Node:
+        operands = [self._not()]
+        while self._peek()[0] == "and":
+            self.position += 1
+            operands.append(self._not())
+        return operands[0] if len(operands) == 1 else BoolOp("and", tuple(operands))
+
+    def _not(self) -> Node:
+        if self._peek()[0] == "not":
+            self.position += 1
+            return Not(self._not())
+        return self._primary()
+
+    def _primary(self) -> Node:
+        if self._peek() == ("punct", "("):
+            self.position += 1
+            node = self._or()
+            self._take("punct", ")")
+            return node
+        name = self._take("name")
+        if self._peek() == ("punct", "("):
+            return self._call(name)
+        op = self._take("op")
+        return Comparison(name, _ALIASES.get(op, op), self._literal())
+
+    def _call(self, function: str) -> Node:
+        if function.lower() != "isinpreviousdays":
+            msg = f"unsupported function {function!r}"
+            raise ExpressionSyntaxError(msg)
+        self._take("punct", "(")
+        name = self._take("name")
+        self._take("punct", ",")
+        days = float(self._take("number"))
+        self._take("punct", ")")
+        return InPreviousDays(name, days)
+
+    def _literal(self) -> float | str | bool:
+        kind, token = self._peek()
+        self.position += 1
+        if kind == "number":
+            return float(token)
+        if kind == "string":
+            return re.sub(r"\\(.)", r"\1", token[1:-1])
+        if kind in {"true", "false"}:
+            return kind == "true"
+        msg = f"expected a literal, found {token or 'the end'!r}"
+        raise ExpressionSyntaxError(msg)
+
+
+def _number(value: Any) -> float:
+    if isinstance(value, bool) or value is None:
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _apply(compare: Callable[[Any, Any], Any], values: Any, other: Any) -> Any:
+    """Compare every value of a column with a literal, or with another column of the same length."""
+    if np is not None:
+        return compare(values, other)
+    if isinstance(other, list):
+        return [compare(value, right) for value, right in zip(values, other)]
+    return [compare(value, other) for value in values]
+
+
+def _timestamp(value: Any) -> float:
+    if not isinstance(value, str) or not value:
+        return math.nan
+    try:
+        moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return math.nan
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+class Expression:
+    """A parsed segment expression.
+
+    Attributes:
+    - text (str): The expression, as given.
+    - root (Node): Its syntax tree.
+
+    Example:
+        expression = Expression('(age<35) and (country="FR" or country="BE")')
+        expression.matches({"age": 28, "country": "FR"})  # True
+    """
+
+    def __init__(self, text: str) -> None:
+        """Parse a segment expression.
+
+        Parameters:
+        - text (str): The expression, e.g. "(age<35)".
+
+        Raises:
+        - ExpressionSyntaxError: If the expression is not valid.
+        """
+        self.text = text
+        self.root = _Parser(text).parse()
+
+    def __repr__(self) -> str:
+        """Return the representation of the expression."""
+        return f"Expression({self.text!r})"
+
+    def properties(self) -> set[str]:
+        """Return the names of the properties the expression uses.
+
+        Returns:
+        - set[str]: The property names.
+        """
+        names: set[str] = set()
+        nodes: list[Node] = [self.root]
+        while nodes:
+            node = nodes.pop()
+            if isinstance(node, (Comparison, InPreviousDays)):
+                names.add(node.name)
+            elif isinstance(node, Not):
+                nodes.append(node.operand)
+            else:
+                nodes.extend(node.operands)
+        return names
+
+    def matches(self, properties: Mapping[str, Any], now: float | None = None) -> bool:
+        """Return whether a contact matches the expression.
+
+        Parameters:
+        - properties (Mapping[str, Any]): The property values of the contact.
+        - now (float | None): The reference time of `IsInPreviousDays`, as a timestamp. Defaults to now.
+
+        Returns:
+        - bool: Whether the contact belongs to the segment.
+        """
+        table = ColumnTable(
+            {name: [properties.get(name)] for name in self.properties()},
+        )
+        preview = SegmentPreview(table, now=now)
+        return bool(preview.mask(self)[0])
+
+
+class SegmentPreview:
+    """Evaluate segment expressions over a table of contacts.
+
+    The conversions of the property columns are cached, so trying several
+    variants of an expression over the same table only converts each column
+    once.
+
+    Attributes:
+    - table (ColumnTable): The contacts, one row per contact and one column per property.
+    - now (float | None): The reference time of `IsInPreviousDays`, as a timestamp; None means now.
+
+    Example:
+        index = ContactIndex(client, "contacts.sqlite")
+        index.load()
+        preview = SegmentPreview.from_index(index)
+        preview.count("(age<35) and (newsletter=true)")
+    """
+
+    def __init__(
+        self,
+        table: ColumnTable,
+        now: float | None = None,
+    ) -> None:
+        """Initialize a new SegmentPreview instance.
+
+        Parameters:
+        - table (ColumnTable): The contacts, one row per contact and one column per property.
+        - now (float | None): The reference time of `IsInPreviousDays`, as a timestamp. Defaults to now.
+        """
+        self.table = table
+        self.now = now
+        self._size = len(table)
+        self._names = {name.lower(): name for name in table.columns}
+        self._views: dict[tuple[str, str], Any] = {}
+
+    @classmethod
+    def from_index(
+        cls,
+        index: ContactIndex,
+        now: float | None = None,
+    ) -> SegmentPreview:
+        """Return a preview over the contacts mirrored by a `ContactIndex`.
+
+        Parameters:
+        - index (ContactIndex): The local contact mirror.
+        - now (float | None): The reference time of `IsInPreviousDays`, as a timestamp. Defaults to now.
+
+        Returns:
+        - SegmentPreview: The preview over `index.table()`.
+        """
+        return cls(index.table(), now=now)
+
+    def __len__(self) -> int:
+        """Return the number of contacts."""
+        return self._size
+
+    def mask(self, expression: str | Expression) -> Any:
+        """Return which contacts match an expression.
+
+        Parameters:
+        - expression (str | Expression): The segment expression.
+
+        Returns:
+        - Any: One boolean per contact, as a NumPy array or a list.
+
+        Raises:
+        - ExpressionSyntaxError: If the expression is not valid.
+        """
+        if isinstance(expression, str):
+            expression = Expression(expression)
+        return self._evaluate(expression.root)
+
+    def count(self, expression: str | Expression) -> int:
+        """Return the number of contacts matching an expression.
+
+        Parameters:
+        - expression (str | Expression): The segment expression.
+
+        Returns:
+        - int: The estimated size of the segment.
+
+        Raises:
+        - ExpressionSyntaxError: If the expression is not valid.
+        """
+        mask = self.mask(expression)
+        if np is not None:
+            return int(np.count_nonzero(mask))
+        return sum(mask)
+
+    def ratio(self, expression: str | Expression) -> float:
+        """Return the share of the contacts matching an expression.
+
+        Parameters:
+        - expression (str | Expression): The segment expression.
+
+        Returns:
+        - float: The matching contacts divided by all contacts, 0.0 for an empty table.
+        """
+        return self.count(expression) / self._size if self._size else 0.0
+
+    def matching(self, expression: str | Expression) -> ColumnTable:
+        """Return the contacts matching an expression.
+
+        Parameters:
+        - expression (str | Expression): The segment expression.
+
+        Returns:
+        - ColumnTable: The matching rows of the table.
+        """
+        mask = self.mask(expression)
+        return ColumnTable(
+            {
+                name: [value for value, keep in zip(column, mask) if keep]
+                for name, column in self.table.columns.items()
+            },
+        )
+
+    def _evaluate(self, node: Node) -> Any:
+        if isinstance(node, Comparison):
+            return self._compare(node)
+        if isinstance(node, InPreviousDays):
+            now = time.time() if self.now is None else self.now
+            values = self._view("timestamp", node.name)
+            return self._combine(
+                "and",
+                [
+                    _apply(operator.ge, values, now - node.days * _DAY),
+                    _apply(operator.le, values, now),
+                ],
+            )
+        if isinstance(node, Not):
+            operand = self._evaluate(node.operand)
+            if np is not None:
+                return ~operand
+            return [not value for value in operand]
+        return self._combine(
+            node.op,
+            [self._evaluate(operand) for operand in node.operands],
+        )
+
+    def _compare(self, node: Comparison) -> Any:
+        compare = _OPERATORS[node.op]
+        if isinstance(node.value, bool):
+            if node.op not in {"=", "!="}:
+                msg = f"{node.name}{node.op}{_text(node.value)}: booleans only support = and !="
+                raise ExpressionSyntaxError(msg)
+            return _apply(compare, self._view("lower", node.name), _text(node.value))
+        if isinstance(node.value, float):
+            values = self._view("number", node.name)
+            matches = _apply(compare, values, node.value)
+            if node.op != "!=":
+                return matches
+            return self._combine("and", [matches, _apply(operator.eq, values, values)])
+        return _apply(compare, self._view("text", node.name), node.value)
+
+    @staticmethod
+    def _combine(op: str, masks: list[Any]) -> Any:
+        if np is not None:
+            combine = np.logical_and if op == "and" else np.logical_or
+            return combine.reduce(masks)
+        reduce = all if op == "and" else any
+        return [reduce(values) for values in zip(*masks)]
+
+    def _view(self, kind: str, name: str) -> Any:
+        key = (kind, name.lower())
+        if key not in self._views:
+            column = self._names.get(name.lower())
+            values = (
+                list(self.table[column]) if column is not None else [None] * self._size
+            )
+            if kind == "number":
+                converted: list[Any] = [_number(value) for value in values]
+            elif kind == "timestamp":
+                converted = [_timestamp(value) for value in values]
+            elif kind == "lower":
+                converted = [_text(value).lower() for value in values]
+            else:
+                converted = [_text(value) for value in values]
+            if np is not None:
+                self._views[key] = np.array(
+                    converted,
+                    dtype=float if kind in {"number", "timestamp"} else str,
+                )
+            else:
+                self._views[key] = converted
+        return self._views[key]
@@ -0,0 +1,353 @@
+"""Parallel retrieval and aggregation of campaign statistics.
+
+Reports over hundreds of campaigns need `statistics_linkClick`,
+`statistics_recipientEsp`, `geostatistics` and `statcounters` for every
+campaign. `StatsAggregator` fetches all of them concurrently and assembles the
+records of each report into a `ColumnTable`, an in-memory columnar table with
+filtering and group-by/sum helpers.
+
+When NumPy is installed, numeric columns are stored as NumPy arrays and sums
+are vectorized; otherwise plain lists and Python loops are used, with the same
+results.
+
+Classes:
+    - ColumnTable: An in-memory columnar table.
+    - StatsReport: The tables of every fetched report.
+    - StatsAggregator: Fetches campaign statistics concurrently.
+
+Attributes:
+    - REPORTS (dict): The supported reports, by name.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Callable
+
+from mailjet_rest.utils.pagination import MAX_PAGE_SIZE
+from mailjet_rest.utils.pagination import iter_records
+
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when NumPy is missing
+    np = None  # type: ignore[assignment]
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+    from collections.abc import Mapping
+    from collections.abc import Sequence
+
+    from mailjet_rest.client import Client
+
+
+REPORTS: dict[str, tuple[str, Callable[[str], dict[str, Any]]]] = {
+    "link_click": (
+        "statistics_linkClick",
+        lambda campaign_id: {"CampaignId": campaign_id},
+    ),
+    "recipient_esp": (
+        "statistics_recipientEsp",
+        lambda campaign_id: {"CampaignId": campaign_id},
+    ),
+    "geo": ("geostatistics", lambda campaign_id: {"CampaignID": campaign_id}),
+    "counters": (
+        "statcounters",
+        lambda campaign_id: {
+            "SourceId": campaign_id,
+            "CounterSource": "Campaign",
+            "CounterTiming": "Message",
+            "CounterResolution": "Lifetime",
+        },
+    ),
+}
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _column(values: list[Any]) -> Any:
+    """Store a column as a NumPy array if it is numeric and NumPy is available."""
+    if np is not None and values and all(_is_number(value) for value in values):
+        return np.asarray(values)
+    return values
+
+
+class ColumnTable:
+    """An in-memory table stored column by column.
+
+    Every column has one value per row. Numeric columns are NumPy arrays when
+    NumPy is installed, and lists otherwise.
+
+    Attributes:
+    - columns (dict[str, Any]): The columns, by name.
+    """
+
+    def __init__(self, columns: Mapping[str, Sequence[Any]] | None = None) -> None:
+        """Initialize a new ColumnTable instance.
+
+        Parameters:
+        - columns (Mapping[str, Sequence[Any]] | None): The columns, by name; all must have the same length.
+
+        Raises:
+        - ValueError: If the columns do not have the same length.
+        """
+        self.columns: dict[str, Any] = {
+            name: _column(list(values)) for name, values in (columns or {}).items()
+        }
+        if len({len(values) for values in self.columns.values()}) > 1:
+            msg = "all columns must have the same length"
+            raise ValueError(msg)
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Iterable[Mapping[str, Any]],
+        columns: Sequence[str] | None = None,
+    ) -> ColumnTable:
+        """Build a table from records, e.g. the `Data` of API responses.
+
+        Parameters:
+        - records (Iterable[Mapping[str, Any]]): The rows.
+        - columns (Sequence[str] | None): The fields to keep. Defaults to every field seen, in order of appearance.
+
+        Returns:
+        - ColumnTable: The table; fields missing from a record are None.
+        """
+        records = list(records)
+        if columns is None:
+            columns = list(dict.fromkeys(key for record in records for key in record))
+        return cls({name: [record.get(name) for record in records] for name in columns})
+
+    @classmethod
+    def concat(cls, tables: Iterable[ColumnTable]) -> ColumnTable:
+        """Stack tables on top of each other.
+
+        Parameters:
+        - tables (Iterable[ColumnTable]): The tables; columns missing from a table are None.
+
+        Returns:
+        - ColumnTable: The stacked table.
+        """
+        tables = list(tables)
+        names = list(dict.fromkeys(name for table in tables for name in table.columns))
+        return cls(
+            {
+                name: [
+                    value
+                    for table in tables
+                    for value in (
+                        list(table.columns[name])
+                        if name in table.columns
+                        else [None] * len(table)
+                    )
+                ]
+                for name in names
+            },
+        )
+
+    def __len__(self) -> int:
+        """Return the number of rows."""
+        return len(next(iter(self.columns.values()), ()))
+
+    def __getitem__(self, name: str) -> Any:
+        """Return a column.
+
+        Parameters:
+        - name (str): The name of the column.
+
+        Returns:
+        - Any: The column, as a NumPy array or a list.
+        """
+        return self.columns[name]
+
+    def rows(self) -> Iterator[dict[str, Any]]:
+        """Yield the rows as dicts.
+
+        Yields:
+        - dict[str, Any]: Each row, with plain Python values.
+        """
+        names = list(self.columns)
+        values = [self._values(name) for name in names]
+        for row in zip(*values):
+            yield dict(zip(names, row))
+
+    def _values(self, name: str) -> list[Any]:
+        column = self.columns[name]
+        return column.tolist() if hasattr(column, "tolist") else list(column)
+
+    def where(self, predicate: Callable[[dict[str, Any]], bool]) -> ColumnTable:
+        """Return the rows matching a predicate.
+
+        Parameters:
+        - predicate (Callable[[dict[str, Any]], bool]): Tells whether a row is kept.
+
+        Returns:
+        - ColumnTable: The matching rows.
+        """
+        return ColumnTable.from_records(
+            (row for row in self.rows() if predicate(row)),
+            columns=list(self.columns),
+        )
+
+    def sum(self, name: str) -> float:
+        """Return the sum of a numeric column, ignoring missing values.
+
+        Parameters:
+        - name (str): The name of the column.
+
+        Returns:
+        - float: The sum.
+        """
+        column = self.columns[name]
+        if np is not None and isinstance(column, np.ndarray):
+            return column.sum().item()
+        return sum(value for value in column if value is not None)
+
+    def group_sum(self, by: str | Sequence[str], values: Sequence[str]) -> ColumnTable:
+        """Sum numeric columns per group.
+
+        Parameters:
+        - by (str | Sequence[str]): The column(s) identifying a group.
+        - values (Sequence[str]): The numeric columns to sum.
+
+        Returns:
+        - ColumnTable: One row per group, in order of first appearance, with the group columns and the sums.
+        """
+        keys = [by] if isinstance(by, str) else list(by)
+        groups: dict[tuple[Any, ...], int] = {}
+        codes = [
+            groups.setdefault(key, len(groups))
+            for key in zip(*(self._values(name) for name in keys))
+        ]
+        result: dict[str, list[Any]] = {
+            name: [key[i] for key in groups] for i, name in enumerate(keys)
+        }
+        for name in values:
+            column = self.columns[name]
+            if np is not None and isinstance(column, np.ndarray):
+                sums = np.bincount(codes, weights=column, minlength=len(groups))
+                if column.dtype.kind in "iu":
+                    sums = sums.astype(column.dtype)
+                result[name] = sums.tolist()
+            else:
+                totals = [0] * len(groups)
+                for code, value in zip(codes, column):
+                    if value is not None:
+                        totals[code] += value
+                result[name] = totals
+        return ColumnTable(result)
+
+
+@dataclass(frozen=True)
+class StatsReport:
+    """The tables of every fetched report.
+
+    Attributes:
+    - tables (dict[str, ColumnTable]): One table per report name, with a `CampaignID` column added to every record.
+    - errors (dict[tuple[str, str], str]): The failed fetches, by (report, campaign ID).
+    """
+
+    tables: dict[str, ColumnTable]
+    errors: dict[tuple[str, str], str]
+
+    def __getitem__(self, report: str) -> ColumnTable:
+        """Return the table of a report.
+
+        Parameters:
+        - report (str): The name of the report, e.g. "link_click".
+
+        Returns:
+        - ColumnTable: The table.
+        """
+        return self.tables[report]
+
+
+class StatsAggregator:
+    """Fetch the statistics of many campaigns concurrently.
+
+    Attributes:
+    - client (Client): The client used to call the API (version v3).
+    - max_workers (int): The largest number of requests running at once.
+    - page_size (int): The `Limit` used for every page request.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        max_workers: int = 16,
+        page_size: int = MAX_PAGE_SIZE,
+    ) -> None:
+        """Initialize a new StatsAggregator instance.
+
+        Parameters:
+        - client (Client): The client used to call the API (version v3).
+        - max_workers (int): The largest number of requests running at once.
+        - page_size (int): The `Limit` used for every page request.
+        """
+        self.client = client
+        self.max_workers = max_workers
+        self.page_size = page_size
+
+    def _fetch(self, report: str, campaign_id: str) -> list[dict[str, Any]]:
+        resource, make_filters = REPORTS[report]
+        endpoint = getattr(self.client, resource)
+        return [
+            {"CampaignID": campaign_id, **record}
+            for record in iter_records(
+                endpoint,
+                filters=make_filters(campaign_id),
+                limit=self.page_size,
+            )
+        ]
+
+    def fetch(
+        self,
+        campaign_ids: Iterable[str | int],
+        reports: Sequence[str] = tuple(REPORTS),
+    ) -> StatsReport:
+        """Fetch reports for many campaigns and build one table per report.
+
+        A failed fetch does not stop the others; it is reported in `errors`.
+
+        Parameters:
+        - campaign_ids (Iterable[str | int]): The campaigns.
+        - reports (Sequence[str]): The names of the reports to fetch, among `REPORTS`.
+
+        Returns:
+        - StatsReport: The tables and the failures.
+
+        Raises:
+        - ValueError: If a report name is unknown.
+        """
+        unknown = set(reports) - set(REPORTS)
+        if unknown:
+            msg = f"Unknown reports: {', '.join(sorted(unknown))}"
+            raise ValueError(msg)
+        jobs = [
+            (report, str(campaign_id))
+            for campaign_id in campaign_ids
+            for report in reports
+        ]
+        records: dict[str, list[dict[str, Any]]] = {report: [] for report in reports}
+        errors: dict[tuple[str, str], str] = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self._fetch, *job) for job in jobs]
+            for job, future in zip(jobs, futures):
+                try:
+                    records[job[0]].extend(future.result())
+                except Exception as err:  # noqa: BLE001, PERF203
+                    errors[job] = str(err) or type(err).__name__
+        return StatsReport(
+            {
+                report: ColumnTable.from_records(rows)
+                for report, rows in records.items()
+            },
+            errors,
+        )
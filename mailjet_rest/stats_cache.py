@@ -0,0 +1,407 @@
+"""A persistent cache of statistics responses.
+
+Statistics of closed periods never change, yet reports fetch them again and
+again. `StatsCacheTransport` wraps another transport and serves GET requests
+on the statistics resources (`statcounters`, `statistics/link-click`,
+`geostatistics`...) from a `StatsCache`, a SQLite file shared between runs.
+
+How long a response is kept depends on what it describes (see `stats_ttl`):
+
+- a period that ended (`ToTS`) more than `settle` seconds ago is closed, and
+  kept for `closed_ttl` (30 days by default). The settle delay covers the
+  events that keep arriving after the end of a period, e.g. late opens of
+  messages counted with `CounterTiming=Message`;
+- otherwise, the TTL depends on the `CounterResolution`: counters of the
+  current hour change faster than lifetime totals.
+
+The cache is bounded both in number of entries and in bytes; the least
+recently used entries are evicted first.
+
+Classes:
+    - StatsCache: A SQLite cache of responses with per-entry TTLs and LRU eviction.
+    - StatsCacheTransport: Serves statistics GET requests from a StatsCache.
+
+Functions:
+    - stats_ttl: Return how long a statistics response may be cached.
+
+Attributes:
+    - STATISTICS_RESOURCES (frozenset[str]): The cached resources.
+    - DEFAULT_TTLS (dict[str, float]): The TTL of open periods, by counter resolution.
+    - DEFAULT_TTL (float): The TTL of open periods of other resolutions.
+    - CLOSED_TTL (float): The default TTL of closed periods.
+    - SETTLE (float): The default delay after which a period is closed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from datetime import timezone
+from typing import TYPE_CHECKING
+from typing import Any
+from urllib.parse import parse_qsl
+from urllib.parse import urlsplit
+
+from mailjet_rest.transport import Transport
+from mailjet_rest.transport import make_response
+
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from pathlib import Path
+
+    from requests.models import Response  # type: ignore[import-untyped]
+
+
+STATISTICS_RESOURCES: frozenset[str] = frozenset(
+    {
+        "bouncestatistics",
+        "campaigngraphstatistics",
+        "campaignstatistics",
+        "clickstatistics",
+        "contactstatistics",
+        "domainstatistics",
+        "geostatistics",
+        "graphstatistics",
+        "liststatistics",
+        "openinformation",
+        "senderstatistics",
+        "statcounters",
+        "statistics",
+        "toplinkclicked",
+        "useragentstatistics",
+    },
+)
+DEFAULT_TTLS: dict[str, float] = {
+    "hour": 300.0,
+    "day": 3600.0,
+    "lifetime": 900.0,
+}
+DEFAULT_TTL: float = 300.0
+CLOSED_TTL: float = 30 * 86400.0
+SETTLE: float = 86400.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stats_cache (
+    key TEXT PRIMARY KEY,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS stats_cache_accessed ON stats_cache (accessed);
+"""
+_RESPONSE_HEADERS = ("Content-Type", "X-MJ-Request-GUID")
+
+
+def _timestamp(value: str) -> float | None:
+    """Parse a `FromTS`/`ToTS` value, given as a Unix timestamp or in RFC 3339."""
+    value = value.strip()
+    if value.lstrip("-").isdigit():
+        return float(value)
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def stats_ttl(
+    query: Mapping[str, str],
+    now: float | None = None,
+    ttls: Mapping[str, float] | None = None,
+    closed_ttl: float = CLOSED_TTL,
+    settle: float = SETTLE,
+) -> float:
+    """Return how long a statistics response may be cached.
+
+    Parameters:
+    - query (Mapping[str, str]): The query parameters of the request; names are case-insensitive.
+    - now (float | None): The current Unix time. Defaults to `time.time()`.
+    - ttls (Mapping[str, float] | None): The TTL of open periods, by lowercase `CounterResolution`. Defaults to `DEFAULT_TTLS`.
+    - closed_ttl (float): The TTL of closed periods, in seconds.
+    - settle (float): How long after `ToTS` a period is considered closed, in seconds.
+
+    Returns:
+    - float: The TTL, in seconds.
+    """
+    now = time.time() if now is None else now
+    params = {name.lower(): value for name, value in query.items()}
+    end = _timestamp(params["tots"]) if params.get("tots") else None
+    if end is not None and end + settle <= now:
+        return closed_ttl
+    resolution = params.get("counterresolution", "").lower()
+    return (DEFAULT_TTLS if ttls is None else ttls).get(resolution, DEFAULT_TTL)
+
+
+class StatsCache:
+    """A SQLite cache of responses, with per-entry TTLs and LRU eviction.
+
+    The instance can be shared between threads: every database access is
+    serialised by an internal lock.
+
+    Attributes:
+    - max_entries (int): The largest number of entries kept.
+    - max_bytes (int): The largest total size of the bodies kept, in bytes.
+    - hits (int): The number of lookups served from the cache.
+    - misses (int): The number of lookups not found or expired.
+    - evictions (int): The number of entries evicted to respect the limits.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = ":memory:",
+        max_entries: int = 10_000,
+        max_bytes: int = 64 * 1024 * 1024,
+    ) -> None:
+        """Initialize a new StatsCache instance.
+
+        Parameters:
+        - path (str | Path): The SQLite file. Defaults to an in-memory database.
+        - max_entries (int): The largest number of entries kept.
+        - max_bytes (int): The largest total size of the bodies kept, in bytes.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+
+    def __len__(self) -> int:
+        """Return the number of entries, including expired ones not purged yet."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM stats_cache").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM stats_cache")
+
+    def get(self, key: str) -> tuple[int, dict[str, str], bytes] | None:
+        """Return a cached response.
+
+        Parameters:
+        - key (str): The key of the entry.
+
+        Returns:
+        - tuple[int, dict[str, str], bytes] | None: The status, headers and body, or None if missing or expired.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT status, headers, body, expires FROM stats_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None or row[3] <= now:
+                self.misses += 1
+                if row is not None:
+                    self._conn.execute("DELETE FROM stats_cache WHERE key = ?", (key,))
+                return None
+            self._conn.execute(
+                "UPDATE stats_cache SET accessed = ? WHERE key = ?",
+                (now, key),
+            )
+            self.hits += 1
+        return row[0], json.loads(row[1]), bytes(row[2])
+
+    def set(
+        self,
+        key: str,
+        status: int,
+        headers: Mapping[str, str],
+        body: bytes,
+        ttl: float,
+    ) -> None:
+        """Store a response, then evict entries beyond the limits.
+
+        Parameters:
+        - key (str): The key of the entry.
+        - status (int): The status of the response.
+        - headers (Mapping[str, str]): The headers to restore with the response.
+        - body (bytes): The body of the response.
+        - ttl (float): How long the entry is valid, in seconds.
+        """
+        if ttl <= 0 or len(body) > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO stats_cache "
+                "(key, status, headers, body, size, expires, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    status,
+                    json.dumps(dict(headers)),
+                    body,
+                    len(body),
+                    now + ttl,
+                    now,
+                ),
+            )
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        """Purge expired entries, then the least recently used beyond the limits."""
+        self._conn.execute("DELETE FROM stats_cache WHERE expires <= ?", (now,))
+        count, size = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM stats_cache",
+        ).fetchone()
+        if count <= self.max_entries and size <= self.max_bytes:
+            return
+        evicted = []
+        for key, entry_size in self._conn.execute(
+            "SELECT key, size FROM stats_cache ORDER BY accessed",
+        ):
+            if count <= self.max_entries and size <= self.max_bytes:
+                break
+            evicted.append((key,))
+            count -= 1
+            size -= entry_size
+        self._conn.executemany("DELETE FROM stats_cache WHERE key = ?", evicted)
+        self.evictions += len(evicted)
+
+
+class StatsCacheTransport(Transport):
+    """Serve GET requests on statistics resources from a StatsCache.
+
+    Only successful responses are cached. Entries are keyed by API key, URL
+    and query parameters, so accounts sharing a cache file never see each
+    other's statistics.
+
+    Attributes:
+    - transport (Transport): The transport doing the actual requests.
+    - cache (StatsCache): The cache.
+    - ttls (Mapping[str, float] | None): The TTL of open periods, by lowercase counter resolution.
+    - closed_ttl (float): The TTL of closed periods, in seconds.
+    - settle (float): How long after `ToTS` a period is considered closed, in seconds.
+    - owns_transport (bool): Whether closing this transport closes the wrapped one.
+    """
+
+    def __init__(
+        self,
+        transport: Transport,
+        cache: StatsCache,
+        ttls: Mapping[str, float] | None = None,
+        closed_ttl: float = CLOSED_TTL,
+        settle: float = SETTLE,
+        owns_transport: bool = True,
+    ) -> None:
+        """Initialize a new StatsCacheTransport instance.
+
+        Parameters:
+        - transport (Transport): The transport doing the actual requests.
+        - cache (StatsCache): The cache.
+        - ttls (Mapping[str, float] | None): The TTL of open periods, by lowercase counter resolution. Defaults to `DEFAULT_TTLS`.
+        - closed_ttl (float): The TTL of closed periods, in seconds.
+        - settle (float): How long after `ToTS` a period is considered closed, in seconds.
+        - owns_transport (bool): Whether closing this transport closes the wrapped one.
+        """
+        self.transport = transport
+        self.cache = cache
+        self.ttls = ttls
+        self.closed_ttl = closed_ttl
+        self.settle = settle
+        self.owns_transport = owns_transport
+
+    @property
+    def session(self) -> Any:
+        """Return the session of the wrapped transport, if it has one."""
+        return getattr(self.transport, "session", None)
+
+    @staticmethod
+    def _cached_resource(url: str) -> bool:
+        parts = urlsplit(url).path.strip("/").split("/")
+        return (
+            len(parts) >= 3
+            and parts[1] == "REST"
+            and parts[2].lower() in STATISTICS_RESOURCES
+        )
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        *,
+        data: str | bytes | Any | None = None,
+        params: str | None = None,
+        headers: Mapping[str, str] | None = None,
+        auth: tuple[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> Response:
+        """Serve a statistics GET request from the cache, or forward it.
+
+        Parameters:
+        - method (str): The HTTP method, in lowercase (e.g. 'get').
+        - url (str): The full URL of the request, without the query string.
+        - data (str | bytes | Any | None): The request body.
+        - params (str | None): The encoded query string.
+        - headers (Mapping[str, str] | None): The request headers.
+        - auth (tuple[str, str] | None): The basic authentication credentials.
+        - timeout (float | None): The timeout of the request in seconds.
+
+        Returns:
+        - Response: The cached response, or the response of the wrapped transport.
+        """
+
+        def forward() -> Response:
+            return self.transport.send(
+                method,
+                url,
+                data=data,
+                params=params,
+                headers=headers,
+                auth=auth,
+                timeout=timeout,
+            )
+
+        if method.lower() != "get" or not self._cached_resource(url):
+            return forward()
+        query = sorted(parse_qsl(params or "", keep_blank_values=True))
+        key = hashlib.sha256(
+            json.dumps([auth[0] if auth else None, url, query]).encode("utf-8"),
+        ).hexdigest()
+        cached = self.cache.get(key)
+        if cached is not None:
+            status, cached_headers, body = cached
+            return make_response(status, body, cached_headers, url=url)
+        response = forward()
+        if response.status_code == 200:
+            self.cache.set(
+                key,
+                response.status_code,
+                {
+                    name: response.headers[name]
+                    for name in _RESPONSE_HEADERS
+                    if name in response.headers
+                },
+                response.content,
+                stats_ttl(
+                    dict(query),
+                    ttls=self.ttls,
+                    closed_ttl=self.closed_ttl,
+                    settle=self.settle,
+                ),
+            )
+        return response
+
+    def close(self) -> None:
+        """Close the wrapped transport, if this transport owns it."""
+        if self.owns_transport:
+            self.transport.close()
@@ -0,0 +1,793 @@
+"""A stateful stand-in for the Mailjet API, for tests and load tests.
+
+`MockMailjet` keeps contacts, contact properties, contact lists, list
+recipients, messages, templates and CSV import jobs in memory and answers the
+core REST calls on them, the `contact/managemanycontacts` and
+`contactslist/{id}/managemanycontacts` bulk jobs, as well as the v3.1 `send`
+API. It supports `Limit`/`Offset`
+pagination, `Sort`, equality filters, the `countOnly` mode, simulated latency
+and injected `429 Too Many Requests` responses.
+
+The stand-in is reachable in two ways:
+
+- in-process, through its `transport`, an `InMemoryTransport`
+  (`Client(transport=mock.transport)`);
+- over HTTP, through `MockMailjetServer`, which serves it on a local port
+  (`Client(api_url=server.url)`), e.g. for load tests of the full HTTP stack.
+
+Example pytest fixture:
+
+    @pytest.fixture
+    def mailjet_server():
+        with MockMailjetServer() as server:
+            yield server
+
+    def test_export(mailjet_server):
+        mailjet_server.mock.seed("contact", [{"Email": "passenger@mailjet.com"}])
+        client = mailjet_server.client()
+        assert client.contact.count() == 1
+
+Classes:
+    - MockMailjet: The in-memory state and request handlers.
+    - MockMailjetServer: Serves a MockMailjet over HTTP on a local port.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import csv
+import io
+import itertools
+import json
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+from datetime import timezone
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from typing import TYPE_CHECKING
+from typing import Any
+
+from mailjet_rest.client import Client
+from mailjet_rest.transport import InMemoryRequest
+from mailjet_rest.transport import InMemoryTransport
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from mailjet_rest.transport import Handler
+
+
+RESOURCES: tuple[str, ...] = (
+    "contact",
+    "contactdata",
+    "contactslist",
+    "listrecipient",
+    "message",
+    "template",
+    "csvimport",
+)
+DEFAULT_LIMIT: int = 10
+MAX_LIMIT: int = 1000
+
+_READ_ONLY = frozenset({"message"})
+_REQUIRED: dict[str, tuple[str, ...]] = {
+    "contact": ("Email",),
+    "contactslist": ("Name",),
+    "listrecipient": ("ListID",),
+    "template": ("Name",),
+    "csvimport": ("ContactsListID", "DataID"),
+}
+_RESERVED_FILTERS = frozenset({"limit", "offset", "sort", "countonly"})
+_FILTER_FIELDS: dict[str, dict[str, str]] = {
+    "listrecipient": {
+        "contact": "ContactID",
+        "contactslist": "ListID",
+        "unsub": "IsUnsubscribed",
+    },
+}
+_LIST_ACTIONS = frozenset({"addforce", "addnoforce", "remove", "unsub"})
+
+
+def _now() -> str:
+    return datetime.now(tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _sort_key(value: Any) -> tuple[bool, bool, float, str]:
+    """Order missing values last, numbers numerically and any other value as text."""
+    if value is None:
+        return (True, True, 0.0, "")
+    if isinstance(value, (int, float)):
+        return (False, False, float(value), "")
+    return (False, True, 0.0, str(value))
+
+
+def _error(status_code: int, message: str) -> tuple[int, dict[str, Any]]:
+    return status_code, {
+        "ErrorInfo": "",
+        "ErrorMessage": message,
+        "StatusCode": status_code,
+    }
+
+
+def _page(records: list[dict[str, Any]], total: int | None = None) -> dict[str, Any]:
+    return {
+        "Count": len(records),
+        "Data": records,
+        "Total": len(records) if total is None else total,
+    }
+
+
+class MockMailjet:
+    """The in-memory state of the stand-in and its request handlers.
+
+    Every record gets an integer `ID` from a single sequence. Handlers are
+    serialised by a lock, but the simulated latency is spent outside of it, so
+    concurrent requests overlap like they would against the real API.
+
+    Attributes:
+    - transport (InMemoryTransport): Routes requests to the handlers, in-process.
+    - latency (float): The simulated latency of every request, in seconds.
+    - jitter (float): The maximum random deviation added to the latency, in seconds.
+    - throttle_rate (float): The probability of answering a request with 429.
+    - credentials (tuple[str, str] | None): The only accepted credentials, if set.
+    - request_count (int): The number of requests received.
+    - throttled (int): The number of requests answered with an injected error.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        throttle_rate: float = 0.0,
+        seed: int | None = None,
+        credentials: tuple[str, str] | None = None,
+    ) -> None:
+        """Initialize a new, empty MockMailjet instance.
+
+        Parameters:
+        - latency (float): The simulated latency of every request, in seconds.
+        - jitter (float): The maximum random deviation added to the latency, in seconds.
+        - throttle_rate (float): The probability, between 0 and 1, of answering a request with 429.
+        - seed (int | None): The seed of the jitter and throttling generator, for reproducible runs.
+        - credentials (tuple[str, str] | None): The only accepted credentials. If None, any credentials are accepted.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle_rate = throttle_rate
+        self.credentials = credentials
+        self.request_count = 0
+        self.throttled = 0
+        self.store: dict[str, dict[int, dict[str, Any]]] = {
+            resource: {} for resource in RESOURCES
+        }
+        self._csv_data: dict[int, bytes] = {}
+        self._jobs: dict[int, dict[str, Any]] = {}
+        self._ids = itertools.count(1)
+        self._random = random.Random(seed)
+        self._injected: deque[int] = deque()
+        self._lock = threading.RLock()
+        self.transport = InMemoryTransport()
+        self._add_routes()
+
+    def _add_routes(self) -> None:
+        routes: list[tuple[str, str, Handler]] = [
+            ("POST", "/v3.1/send", self._send),
+            (
+                "POST",
+                "/{version}/DATA/contactslist/{id}/{action}/text:plain",
+                self._upload,
+            ),
+            (
+                "POST",
+                "/{version}/REST/contact/managemanycontacts",
+                self._manage_contacts,
+            ),
+            (
+                "GET",
+                "/{version}/REST/contact/managemanycontacts/{job_id}",
+                self._job,
+            ),
+            (
+                "POST",
+                "/{version}/REST/contactslist/{id}/managemanycontacts",
+                self._manage_list,
+            ),
+            (
+                "GET",
+                "/{version}/REST/contactslist/{id}/managemanycontacts/{job_id}",
+                self._job,
+            ),
+            ("GET", "/{version}/REST/{resource}", self._list),
+            ("GET", "/{version}/REST/{resource}/{id}", self._get),
+            ("POST", "/{version}/REST/{resource}", self._create),
+            ("PUT", "/{version}/REST/{resource}/{id}", self._update),
+            ("DELETE", "/{version}/REST/{resource}/{id}", self._delete),
+        ]
+        for method, path, handler in routes:
+            self.transport.add_route(method, path, self._wrap(handler))
+
+    def inject(self, status_code: int = 429, count: int = 1) -> None:
+        """Answer the next requests with an error, whatever they are.
+
+        Parameters:
+        - status_code (int): The status of the injected responses.
+        - count (int): The number of requests to answer with it.
+        """
+        with self._lock:
+            self._injected.extend([status_code] * count)
+
+    def seed(
+        self,
+        resource: str,
+        records: Iterable[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """Store records directly, without going through requests.
+
+        Parameters:
+        - resource (str): The resource, e.g. "contact".
+        - records (Iterable[dict[str, Any]]): The records; missing IDs and defaults are filled in.
+
+        Returns:
+        - list[dict[str, Any]]: The stored records.
+        """
+        with self._lock:
+            return [self._insert(resource, dict(record)) for record in records]
+
+    def records(self, resource: str) -> list[dict[str, Any]]:
+        """Return the stored records of a resource, by ascending ID.
+
+        Parameters:
+        - resource (str): The resource, e.g. "contact".
+
+        Returns:
+        - list[dict[str, Any]]: Copies of the records.
+        """
+        with self._lock:
+            table = self.store[resource]
+            return [dict(table[record_id]) for record_id in sorted(table)]
+
+    def _wrap(self, handler: Handler) -> Handler:
+        def wrapped(request: InMemoryRequest) -> Any:
+            delay = self.latency
+            with self._lock:
+                self.request_count += 1
+                if self.jitter:
+                    delay += self._random.uniform(-self.jitter, self.jitter)
+                injected = self._injected.popleft() if self._injected else None
+                if (
+                    injected is None
+                    and self.throttle_rate
+                    and self._random.random() < self.throttle_rate
+                ):
+                    injected = 429
+                if injected is not None:
+                    self.throttled += 1
+            if delay > 0:
+                time.sleep(delay)
+            if self.credentials is not None and request.auth != self.credentials:
+                return _error(401, "API key authentication/authorization failure")
+            if injected is not None:
+                return _error(injected, "Too Many Requests")
+            resource = request.path_params.get("resource")
+            if resource is not None and resource not in self.store:
+                return _error(404, f"Unknown resource: {resource}")
+            with self._lock:
+                return handler(request)
+
+        return wrapped
+
+    def _insert(self, resource: str, record: dict[str, Any]) -> dict[str, Any]:
+        record_id = int(record.get("ID") or next(self._ids))
+        record["ID"] = record_id
+        record.setdefault("CreatedAt", _now())
+        if resource == "contact":
+            record.setdefault("Name", "")
+            record.setdefault("IsExcludedFromCampaigns", False)
+        elif resource == "contactslist":
+            record.setdefault("Address", uuid.uuid4().hex[:10])
+            record.setdefault("IsDeleted", False)
+            record.setdefault("SubscriberCount", 0)
+        elif resource == "listrecipient":
+            record.setdefault("IsUnsubscribed", False)
+            record.setdefault("SubscribedAt", record["CreatedAt"])
+        self.store[resource][record_id] = record
+        return record
+
+    def _find(self, resource: str, key: str) -> dict[str, Any] | None:
+        if resource == "contactdata":
+            contact = self._find("contact", key)
+            return self._contactdata(contact["ID"]) if contact else None
+        table = self.store[resource]
+        if key.isdigit():
+            return table.get(int(key))
+        if resource == "contact":
+            email = key.lower()
+            return next(
+                (r for r in table.values() if r.get("Email", "").lower() == email),
+                None,
+            )
+        return None
+
+    def _contactdata(self, contact_id: int) -> dict[str, Any]:
+        """Return the properties record of a contact, creating it if needed."""
+        table = self.store["contactdata"]
+        if contact_id not in table:
+            table[contact_id] = {"ID": contact_id, "ContactID": contact_id, "Data": []}
+        return table[contact_id]
+
+    def _set_properties(self, contact_id: int, data: Iterable[dict[str, Any]]) -> None:
+        """Set the given `{"Name", "Value"}` properties, keeping the others."""
+        record = self._contactdata(contact_id)
+        values = {item["Name"]: item.get("Value") for item in record["Data"]}
+        values.update((item["Name"], item.get("Value")) for item in data)
+        record["Data"] = [
+            {"Name": name, "Value": value} for name, value in values.items()
+        ]
+
+    def _filter(
+        self,
+        resource: str,
+        query: dict[str, str],
+    ) -> list[dict[str, Any]]:
+        records = list(self.store[resource].values())
+        for name, value in query.items():
+            if name.lower() in _RESERVED_FILTERS:
+                continue
+            if resource == "contact" and name.lower() == "contactslist":
+                members = {
+                    r.get("ContactID")
+                    for r in self.store["listrecipient"].values()
+                    if str(r.get("ListID")) == value
+                }
+                records = [r for r in records if r["ID"] in members]
+                continue
+            field = _FILTER_FIELDS.get(resource, {}).get(name.lower(), name).lower()
+            records = [
+                r
+                for r in records
+                if any(
+                    k.lower() == field
+                    and (
+                        str(v).lower() == value.lower()
+                        if isinstance(v, bool)
+                        else str(v) == value
+                    )
+                    for k, v in r.items()
+                )
+            ]
+        return records
+
+    def _list(self, request: InMemoryRequest) -> Any:
+        resource = request.path_params["resource"]
+        query = request.query
+        records = self._filter(resource, query)
+        total = len(records)
+        if query.get("countOnly") in {"1", "true", "True"}:
+            return _page([], total)
+        field, _, direction = query.get("Sort", "ID").replace("+", " ").partition(" ")
+        records.sort(
+            key=lambda r: _sort_key(r.get(field)),
+            reverse=direction.strip().upper() == "DESC",
+        )
+        try:
+            limit = min(int(query.get("Limit", DEFAULT_LIMIT)), MAX_LIMIT)
+            offset = int(query.get("Offset", 0))
+        except ValueError:
+            return _error(400, "Limit and Offset must be integers")
+        if limit <= 0:
+            limit = MAX_LIMIT
+        return _page([dict(r) for r in records[offset : offset + limit]], total)
+
+    def _get(self, request: InMemoryRequest) -> Any:
+        resource = request.path_params["resource"]
+        record = self._find(resource, request.path_params["id"])
+        if record is None:
+            return _error(404, "Object not found")
+        return _page([dict(record)])
+
+    def _create(self, request: InMemoryRequest) -> Any:
+        resource = request.path_params["resource"]
+        if resource in _READ_ONLY:
+            return _error(405, f"Operation not allowed on {resource}")
+        try:
+            payload = request.json() or {}
+        except ValueError:
+            return _error(400, "Invalid JSON payload")
+        missing = [name for name in _REQUIRED.get(resource, ()) if name not in payload]
+        if resource == "listrecipient" and not {"ContactID", "ContactAlt"} & set(
+            payload,
+        ):
+            missing.append("ContactID")
+        if missing:
+            return _error(400, f"Missing required properties: {', '.join(missing)}")
+        payload.pop("ID", None)
+        if resource == "contact" and self._find("contact", payload["Email"]):
+            return _error(
+                400,
+                f'MJ18 A Contact resource with value "{payload["Email"]}" for Email already exists.',
+            )
+        if resource == "listrecipient" and "ContactID" not in payload:
+            contact = self._find("contact", str(payload["ContactAlt"]))
+            if contact is None:
+                contact = self._insert("contact", {"Email": payload["ContactAlt"]})
+            payload["ContactID"] = contact["ID"]
+        record = self._insert(resource, payload)
+        if resource == "csvimport":
+            self._import(record)
+        return 201, _page([dict(record)])
+
+    def _update(self, request: InMemoryRequest) -> Any:
+        resource = request.path_params["resource"]
+        if resource in _READ_ONLY:
+            return _error(405, f"Operation not allowed on {resource}")
+        record = self._find(resource, request.path_params["id"])
+        if record is None:
+            return _error(404, "Object not found")
+        try:
+            payload = request.json() or {}
+        except ValueError:
+            return _error(400, "Invalid JSON payload")
+        payload.pop("ID", None)
+        if resource == "contactdata":
+            self._set_properties(record["ContactID"], payload.get("Data", []))
+        else:
+            record.update(payload)
+        return _page([dict(record)])
+
+    def _delete(self, request: InMemoryRequest) -> Any:
+        resource = request.path_params["resource"]
+        record = self._find(resource, request.path_params["id"])
+        if record is None:
+            return _error(404, "Object not found")
+        del self.store[resource][record["ID"]]
+        return 204, None
+
+    def _upload(self, request: InMemoryRequest) -> Any:
+        if request.path_params["action"].lower() != "csvdata":
+            return _error(404, "Unknown data action")
+        if self._find("contactslist", request.path_params["id"]) is None:
+            return _error(404, "Object not found")
+        data_id = next(self._ids)
+        self._csv_data[data_id] = request.body or b""
+        return {"ID": data_id}
+
+    def _import(self, job: dict[str, Any]) -> None:
+        """Run a CSV import job synchronously, adding the contacts to the list."""
+        data = self._csv_data.get(int(job["DataID"]))
+        if data is None:
+            job.update(Status="Error", Error="Unknown DataID")
+            return
+        list_id = int(job["ContactsListID"])
+        members = {
+            r["ContactID"]
+            for r in self.store["listrecipient"].values()
+            if r.get("ListID") == list_id
+        }
+        imported = errors = 0
+        rows = csv.DictReader(io.StringIO(data.decode("utf-8")))
+        for row in rows:
+            email = next(
+                (v for k, v in row.items() if k and k.strip().lower() == "email"),
+                "",
+            ).strip()
+            if "@" not in email:
+                errors += 1
+                continue
+            contact = self._find("contact", email) or self._insert(
+                "contact",
+                {"Email": email},
+            )
+            if contact["ID"] not in members:
+                self._insert(
+                    "listrecipient",
+                    {"ContactID": contact["ID"], "ListID": list_id},
+                )
+                members.add(contact["ID"])
+            imported += 1
+        job.update(Status="Completed", Count=imported, Errcount=errors)
+
+    def _manage_contacts(self, request: InMemoryRequest) -> Any:
+        """Run a `managemanycontacts` job synchronously and return its ID."""
+        try:
+            payload = request.json() or {}
+        except ValueError:
+            return _error(400, "Invalid JSON payload")
+        contacts = payload.get("Contacts")
+        if not isinstance(contacts, list) or not contacts:
+            return _error(400, "Contacts must be a non-empty list")
+        job_id = next(self._ids)
+        errors = []
+        for item in contacts:
+            email = str(item.get("Email", "")).strip()
+            if "@" not in email:
+                errors.append(email)
+                continue
+            contact = self._find("contact", email) or self._insert(
+                "contact",
+                {"Email": email, "Name": item.get("Name", "")},
+            )
+            if "IsExcludedFromCampaigns" in item:
+                contact["IsExcludedFromCampaigns"] = item["IsExcludedFromCampaigns"]
+            for membership in payload.get("ContactsLists") or []:
+                self._list_action(
+                    int(membership["ListID"]),
+                    contact,
+                    str(membership.get("Action", "addnoforce")).lower(),
+                )
+            self._set_properties(
+                contact["ID"],
+                (
+                    {"Name": name, "Value": value}
+                    for name, value in (item.get("Properties") or {}).items()
+                ),
+            )
+        self._jobs[job_id] = {
+            "Count": len(contacts) - len(errors),
+            "Error": f"Invalid email addresses: {', '.join(errors)}" if errors else "",
+            "ErrorFile": "",
+            "JobEnd": _now(),
+            "JobStart": _now(),
+            "Status": "Completed",
+        }
+        return 201, _page([{"JobID": job_id}])
+
+    def _manage_list(self, request: InMemoryRequest) -> Any:
+        """Run a `contactslist_managemanycontacts` job synchronously and return its ID."""
+        contacts_list = self._find("contactslist", request.path_params["id"])
+        if contacts_list is None:
+            return _error(404, "Object not found")
+        try:
+            payload = request.json() or {}
+        except ValueError:
+            return _error(400, "Invalid JSON payload")
+        action = str(payload.get("Action", "")).lower()
+        contacts = payload.get("Contacts")
+        if action not in _LIST_ACTIONS:
+            return _error(400, f"Invalid Action: {payload.get('Action')!r}")
+        if not isinstance(contacts, list) or not contacts:
+            return _error(400, "Contacts must be a non-empty list")
+        job_id = next(self._ids)
+        errors = []
+        for item in contacts:
+            email = str(item.get("Email", "")).strip()
+            contact = self._find("contact", email) if "@" in email else None
+            if contact is None and "@" in email and action.startswith("add"):
+                contact = self._insert(
+                    "contact",
+                    {"Email": email, "Name": item.get("Name", "")},
+                )
+            if contact is None:
+                errors.append(email)
+                continue
+            self._list_action(contacts_list["ID"], contact, action)
+        self._jobs[job_id] = {
+            "Count": len(contacts) - len(errors),
+            "Error": f"Unknown contacts: {', '.join(errors)}" if errors else "",
+            "ErrorFile": "",
+            "JobEnd": _now(),
+            "JobStart": _now(),
+            "Status": "Completed",
+        }
+        return 201, _page([{"JobID": job_id}])
+
+    def _list_action(self, list_id: int, contact: dict[str, Any], action: str) -> None:
+        """Apply an addforce, addnoforce, remove or unsub action to a list membership."""
+        membership = next(
+            (
+                r
+                for r in self.store["listrecipient"].values()
+                if r.get("ListID") == list_id and r.get("ContactID") == contact["ID"]
+            ),
+            None,
+        )
+        if action == "remove":
+            if membership is not None:
+                del self.store["listrecipient"][membership["ID"]]
+        elif action == "unsub":
+            if membership is not None:
+                membership.update(IsUnsubscribed=True, UnsubscribedAt=_now())
+        elif membership is None:
+            self._insert(
+                "listrecipient",
+                {"ContactID": contact["ID"], "ListID": list_id},
+            )
+        elif action == "addforce":
+            membership.update(IsUnsubscribed=False, SubscribedAt=_now())
+
+    def _job(self, request: InMemoryRequest) -> Any:
+        job_id = request.path_params["job_id"]
+        job = self._jobs.get(int(job_id)) if job_id.isdigit() else None
+        if job is None:
+            return _error(404, "Object not found")
+        return _page([dict(job)])
+
+    def _send(self, request: InMemoryRequest) -> Any:
+        try:
+            payload = request.json() or {}
+        except ValueError:
+            return _error(400, "Invalid JSON payload")
+        messages = payload.get("Messages")
+        if not isinstance(messages, list) or not messages:
+            return _error(400, "Messages must be a non-empty list")
+        results = []
+        failed = False
+        for message in messages:
+            recipients = [
+                *message.get("To", []),
+                *message.get("Cc", []),
+                *message.get("Bcc", []),
+            ]
+            if not message.get("From", {}).get("Email") or not recipients:
+                failed = True
+                results.append(
+                    {
+                        "Status": "error",
+                        "Errors": [
+                            {
+                                "ErrorCode": "send-0003",
+                                "ErrorMessage": "At least From and To are required.",
+                                "StatusCode": 400,
+                            },
+                        ],
+                    },
+                )
+                continue
+            sent = []
+            for recipient in recipients:
+                stored = self._insert(
+                    "message",
+                    {
+                        "ArrivedAt": _now(),
+                        "ContactAlt": recipient["Email"],
+                        "Status": "sent",
+                        "Subject": message.get("Subject", ""),
+                        "CustomID": message.get("CustomID", ""),
+                        "MessageUUID": str(uuid.uuid4()),
+                    },
+                )
+                sent.append(
+                    {
+                        "Email": recipient["Email"],
+                        "MessageUUID": stored["MessageUUID"],
+                        "MessageID": stored["ID"],
+                        "MessageHref": f"https://api.mailjet.com/v3/REST/message/{stored['ID']}",
+                    },
+                )
+            results.append(
+                {
+                    "Status": "success",
+                    "CustomID": message.get("CustomID", ""),
+                    "To": sent,
+                },
+            )
+        return (400 if failed else 200), {"Messages": results}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: _Server
+
+    def _dispatch(self) -> None:
+        path, _, query = self.path.partition("?")
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else None
+        auth = None
+        scheme, _, token = (self.headers.get("Authorization") or "").partition(" ")
+        if scheme.lower() == "basic":
+            try:
+                decoded = base64.b64decode(token, validate=True).decode("utf-8")
+            except (binascii.Error, UnicodeDecodeError):
+                self._respond_error(401, "API key authentication/authorization failure")
+                return
+            user, _, password = decoded.partition(":")
+            auth = (user, password)
+        try:
+            response = self.server.mock.transport.send(
+                self.command.lower(),
+                f"http://localhost{path}",
+                data=body,
+                params=query or None,
+                headers=dict(self.headers),
+                auth=auth,
+            )
+        except Exception as err:  # noqa: BLE001
+            self._respond_error(500, f"Internal server error: {err!r}")
+            return
+        self._respond(
+            response.status_code,
+            response.content,
+            response.headers.get("Content-Type", "application/json"),
+        )
+
+    def _respond_error(self, status_code: int, message: str) -> None:
+        status_code, payload = _error(status_code, message)
+        self._respond(status_code, json.dumps(payload).encode(), "application/json")
+
+    def _respond(self, status_code: int, content: bytes, content_type: str) -> None:
+        self.send_response(status_code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _dispatch  # noqa: N815
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Keep the test output quiet."""
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    mock: MockMailjet
+
+
+class MockMailjetServer:
+    """Serve a MockMailjet over HTTP on a local port.
+
+    Attributes:
+    - mock (MockMailjet): The served stand-in.
+    - url (str): The base URL to pass as `api_url`, once started.
+    """
+
+    def __init__(
+        self,
+        mock: MockMailjet | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        """Initialize a new MockMailjetServer instance.
+
+        Parameters:
+        - mock (MockMailjet | None): The stand-in to serve. Defaults to a new, empty MockMailjet.
+        - host (str): The interface to listen on.
+        - port (int): The port to listen on. Defaults to a free port.
+        """
+        self.mock = mock or MockMailjet()
+        self.host = host
+        self.port = port
+        self.url = ""
+        self._server: _Server | None = None
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> MockMailjetServer:  # noqa: PYI034
+        """Start the server when entering the context."""
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Stop the server when leaving the context."""
+        self.stop()
+
+    def start(self) -> None:
+        """Start serving in a background thread."""
+        self._server = _Server((self.host, self.port), _Handler)
+        self._server.mock = self.mock
+        self.url = f"http://{self.host}:{self._server.server_port}/"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop serving and close the listening socket."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def client(self, **kwargs: Any) -> Client:
+        """Return a client sending its requests to this server.
+
+        Parameters:
+        - **kwargs (Any): Options passed to `Client`, such as `auth` or `version`.
+
+        Returns:
+        - Client: The client.
+        """
+        kwargs.setdefault("auth", self.mock.credentials or ("key", "secret"))
+        return Client(api_url=self.url, **kwargs)
@@ -0,0 +1,312 @@
+"""Per-request traces written as JSON lines by a background thread.
+
+`TracingTransport` wraps another transport and describes every request in a
+trace record: when it started, the endpoint, method and URL template (with
+the IDs replaced by `{id}`), the status, the durations, the payload sizes and
+the Mailjet request identifiers of the response headers. Records are handed
+to a `Tracer`, which queues them and writes them to a JSON-lines file from a
+background thread, so the requests never wait on disk I/O.
+
+A trace record looks like:
+
+    {"ts": 1718000000.123, "method": "GET", "resource": "contact",
+     "url_template": "/v3/REST/contact/{id}", "status": 200,
+     "duration_ms": 84.2, "elapsed_ms": 83.9, "request_bytes": 0,
+     "response_bytes": 412, "request_ids": {"X-MJ-Request-GUID": "..."}}
+
+Classes:
+    - Tracer: Writes trace records to a file from a background thread.
+    - TracingTransport: Traces every request sent through another transport.
+
+Functions:
+    - url_template: Return the path of a URL with the IDs replaced by `{id}`.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import re
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from urllib.parse import unquote
+from urllib.parse import urlsplit
+
+from mailjet_rest.transport import Transport
+
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from typing import TextIO
+
+    from requests.models import Response  # type: ignore[import-untyped]
+
+
+logger = logging.getLogger(__name__)
+
+_ID_SEGMENT = re.compile(
+    r"^(\d+|[^/]*@[^/]*|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|\$.*)$",
+    re.IGNORECASE,
+)
+_STOP = object()
+
+
+def url_template(url: str) -> str:
+    """Return the path of a URL with the IDs replaced by `{id}`.
+
+    Numeric IDs, email addresses, UUIDs and `$` placeholders are replaced, so
+    requests on different records of a resource share one template.
+
+    Parameters:
+    - url (str): The URL of a request.
+
+    Returns:
+    - str: The path template, e.g. "/v3/REST/contact/{id}".
+    """
+    segments = urlsplit(url).path.split("/")
+    return "/".join(
+        "{id}" if segment and _ID_SEGMENT.match(unquote(segment)) else segment
+        for segment in segments
+    )
+
+
+def _resource(template: str) -> str:
+    segments = [segment for segment in template.split("/") if segment]
+    if len(segments) >= 3 and segments[1] in {"REST", "DATA"}:
+        return segments[2]
+    return segments[-1] if segments else ""
+
+
+def _size(data: Any) -> int | None:
+    if data is None:
+        return 0
+    if isinstance(data, str):
+        return len(data.encode("utf-8"))
+    if isinstance(data, memoryview):
+        return data.nbytes
+    if isinstance(data, (bytes, bytearray)):
+        return len(data)
+    return None
+
+
+class Tracer:
+    """Write trace records to a JSON-lines file from a background thread.
+
+    `record` only puts the record on a bounded queue. When the queue is full
+    (the disk cannot keep up), records are dropped and counted rather than
+    slowing the requests down. Records that cannot be written (e.g. values
+    that are not JSON-serializable, or a full disk) are logged and counted as
+    dropped.
+
+    Attributes:
+    - path (Path): The trace file; records are appended to it.
+    - written (int): The number of records written so far.
+    - dropped (int): The number of records dropped because the queue was full.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_queue: int = 10_000,
+        flush_interval: float = 1.0,
+    ) -> None:
+        """Initialize a new Tracer instance and start its writer thread.
+
+        Parameters:
+        - path (str | Path): The trace file; records are appended to it.
+        - max_queue (int): The largest number of records waiting to be written.
+        - flush_interval (float): The longest time a written record stays in the file buffer, in seconds.
+
+        Raises:
+        - OSError: If the trace file cannot be opened for appending.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file: TextIO = self.path.open("a", encoding="utf-8")
+        self.written = 0
+        self.dropped = 0
+        self._flush_interval = flush_interval
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._write,
+            name="mailjet-tracer",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def __enter__(self) -> Tracer:  # noqa: PYI034
+        """Return the tracer itself when used as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Write the pending records and stop the writer thread."""
+        self.close()
+
+    def record(self, record: dict[str, Any]) -> None:
+        """Queue a record to be written, without waiting.
+
+        Parameters:
+        - record (dict[str, Any]): A JSON-serializable trace record.
+        """
+        if self._closed:
+            self.dropped += 1
+            return
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self) -> None:
+        """Write the pending records and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        while self._thread.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=self._flush_interval)
+            except queue.Full:
+                continue
+            break
+        self._thread.join()
+        self._file.close()
+
+    def _write(self) -> None:
+        while True:
+            try:
+                item = self._queue.get(timeout=self._flush_interval)
+            except queue.Empty:
+                self._flush()
+                continue
+            batch = [item]
+            while item is not _STOP:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(item)
+            self._write_records([record for record in batch if record is not _STOP])
+            if batch[-1] is _STOP:
+                self._flush()
+                return
+
+    def _write_records(self, records: list[Any]) -> None:
+        for record in records:
+            try:
+                self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+            except Exception:  # noqa: PERF203
+                logger.exception("Could not write a trace record to %s", self.path)
+                self.dropped += 1
+            else:
+                self.written += 1
+
+    def _flush(self) -> None:
+        try:
+            self._file.flush()
+        except OSError:
+            logger.exception("Could not flush the trace file %s", self.path)
+
+
+class TracingTransport(Transport):
+    """Trace every request sent through another transport.
+
+    Attributes:
+    - transport (Transport): The transport doing the actual requests.
+    - tracer (Tracer): Receives a record per request.
+    - owns_transport (bool): Whether closing this transport closes the wrapped one.
+    """
+
+    def __init__(
+        self,
+        transport: Transport,
+        tracer: Tracer,
+        owns_transport: bool = True,
+    ) -> None:
+        """Initialize a new TracingTransport instance.
+
+        Parameters:
+        - transport (Transport): The transport doing the actual requests.
+        - tracer (Tracer): Receives a record per request.
+        - owns_transport (bool): Whether closing this transport closes the wrapped one.
+        """
+        self.transport = transport
+        self.tracer = tracer
+        self.owns_transport = owns_transport
+
+    @property
+    def session(self) -> Any:
+        """Return the session of the wrapped transport, if it has one."""
+        return getattr(self.transport, "session", None)
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        *,
+        data: str | bytes | Any | None = None,
+        params: str | None = None,
+        headers: Mapping[str, str] | None = None,
+        auth: tuple[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> Response:
+        """Forward a request and trace it.
+
+        Parameters:
+        - method (str): The HTTP method, in lowercase (e.g. 'get').
+        - url (str): The full URL of the request, without the query string.
+        - data (str | bytes | Any | None): The request body.
+        - params (str | None): The encoded query string.
+        - headers (Mapping[str, str] | None): The request headers.
+        - auth (tuple[str, str] | None): The basic authentication credentials.
+        - timeout (float | None): The timeout of the request in seconds.
+
+        Returns:
+        - Response: The response of the wrapped transport.
+        """
+        template = url_template(url)
+        record: dict[str, Any] = {
+            "ts": round(time.time(), 6),
+            "method": method.upper(),
+            "resource": _resource(template),
+            "url_template": template,
+            "request_bytes": _size(data),
+        }
+        started = time.perf_counter()
+        try:
+            response = self.transport.send(
+                method,
+                url,
+                data=data,
+                params=params,
+                headers=headers,
+                auth=auth,
+                timeout=timeout,
+            )
+        except Exception as err:
+            record["duration_ms"] = round((time.perf_counter() - started) * 1000, 3)
+            record["status"] = None
+            record["error"] = type(err).__name__
+            self.tracer.record(record)
+            raise
+        record["duration_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        record["status"] = response.status_code
+        elapsed = getattr(response, "elapsed", None)
+        if elapsed:
+            record["elapsed_ms"] = round(elapsed.total_seconds() * 1000, 3)
+        record["response_bytes"] = len(response.content or b"")
+        record["request_ids"] = {
+            name: value
+            for name, value in response.headers.items()
+            if name.lower().startswith("x-mj-")
+        }
+        self.tracer.record(record)
+        return response
+
+    def close(self) -> None:
+        """Close the wrapped transport, if this transport owns it."""
+        if self.owns_transport:
+            self.transport.close()
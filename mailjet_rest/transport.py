@@ -0,0 +1,807 @@
+"""Pluggable HTTP transports for the Mailjet REST API client.
+
+A transport sends one prepared HTTP request and returns a `requests.Response`.
+`Client` sends every request through its transport, so the HTTP stack can be
+swapped (for example for an HTTP/2 capable library) without touching the rest
+of the library, and tests or benchmarks can route requests to plain Python
+handlers instead of sockets.
+
+Transports report failures by raising `requests.exceptions.Timeout` or
+`requests.RequestException` (which `api_call` turns into `TimeoutError` and
+`ApiError`), or by raising those library errors directly.
+
+Classes:
+    - Transport: Base class of synchronous transports.
+    - AsyncTransport: Base class of asynchronous transports.
+    - RequestsTransport: The default transport, backed by a pooled `requests.Session`.
+    - FreshHTTPAdapter: A `requests` adapter closing pooled connections past a maximum age or idle time.
+    - ThreadedAsyncTransport: Runs a synchronous transport in worker threads.
+    - InMemoryRequest: The request passed to in-memory handlers.
+    - InMemoryTransport: Routes requests to Python handlers without sockets.
+    - AsyncInMemoryTransport: The asynchronous variant of InMemoryTransport.
+
+Functions:
+    - make_response: Builds a `requests.Response` from a status, a body and headers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+import json
+import re
+import threading
+import time
+from abc import ABC
+from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from dataclasses import field
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Callable
+from urllib.parse import parse_qsl
+from urllib.parse import urlsplit
+
+import requests  # type: ignore[import-untyped]
+from requests.adapters import HTTPAdapter  # type: ignore[import-untyped]
+from requests.structures import CaseInsensitiveDict  # type: ignore[import-untyped]
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.connectionpool import HTTPSConnectionPool
+
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from requests.models import Response  # type: ignore[import-untyped]
+
+
+Handler = Callable[..., Any]
+
+
+class Transport(ABC):
+    """Base class of synchronous transports.
+
+    Subclasses implement `send`. Instances may be used from many threads at
+    once by a shared `Client`.
+    """
+
+    @abstractmethod
+    def send(
+        self,
+        method: str,
+        url: str,
+        *,
+        data: str | bytes | Any | None = None,
+        params: str | None = None,
+        headers: Mapping[str, str] | None = None,
+        auth: tuple[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> Response:
+        """Send a request and return its response.
+
+        Parameters:
+        - method (str): The HTTP method, in lowercase (e.g. 'get').
+        - url (str): The full URL of the request, without the query string.
+        - data (str | bytes | Any | None): The request body.
+        - params (str | None): The encoded query string.
+        - headers (Mapping[str, str] | None): The request headers.
+        - auth (tuple[str, str] | None): The basic authentication credentials.
+        - timeout (float | None): The timeout of the request in seconds.
+
+        Returns:
+        - Response: The response of the server.
+        """
+
+    def close(self) -> None:  # noqa: B027
+        """Release the resources held by the transport."""
+
+
+class AsyncTransport(ABC):
+    """Base class of asynchronous transports.
+
+    Subclasses implement the coroutine `send`, which takes the same arguments
+    as `Transport.send`.
+    """
+
+    @abstractmethod
+    async def send(
+        self,
+        method: str,
+        url: str,
+        *,
+        data: str | bytes | Any | None = None,
+        params: str | None = None,
+        headers: Mapping[str, str] | None = None,
+        auth: tuple[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> Response:
+        """Send a request and return its response.
+
+        Parameters:
+        - method (str): The HTTP method, in lowercase (e.g. 'get').
+        - url (str): The full URL of the request, without the query string.
+        - data (str | bytes | Any | None): The request body.
+        - params (str | None): The encoded query string.
+        - headers (Mapping[str, str] | None): The request headers.
+        - auth (tuple[str, str] | None): The basic authentication credentials.
+        - timeout (float | None): The timeout of the request in seconds.
+
+        Returns:
+        - Response: The response of the server.
+        """
+
+    async def aclose(self) -> None:  # noqa: B027
+        """Release the resources held by the transport."""
+
+
+def _is_stale(
+    conn: Any,
+    now: float,
+    max_age: float | None,
+    max_idle: float | None,
+) -> bool:
+    """Tell whether an open pooled connection is past its maximum age or idle time."""
+    if getattr(conn, "sock", None) is None or not hasattr(conn, "_mj_opened"):
+        return False
+    if max_age is not None and now - conn._mj_opened > max_age:  # noqa: SLF001
+        return True
+    return max_idle is not None and now - conn._mj_released > max_idle  # noqa: SLF001
+
+
+class _FreshHTTPConnectionPool(HTTPConnectionPool):
+    """A connection pool closing the connections past a maximum age or idle time.
+
+    The time a connection was opened and last released are stamped on it when
+    it returns to the pool. A stale connection is closed when it is taken from
+    the pool, and transparently reopened by the request using it.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        max_age: float | None = None,
+        max_idle: float | None = None,
+        **kwargs: Any,
+    ) -> None:
+        self.max_age = max_age
+        self.max_idle = max_idle
+        super().__init__(*args, **kwargs)
+
+    def _get_conn(self, timeout: float | None = None) -> Any:
+        conn = super()._get_conn(timeout)
+        if _is_stale(conn, time.monotonic(), self.max_age, self.max_idle):
+            conn.close()
+        return conn
+
+    def _put_conn(self, conn: Any) -> None:
+        if conn is not None:
+            now = time.monotonic()
+            sock = getattr(conn, "sock", None)
+            if sock is not None and getattr(conn, "_mj_sock", None) is not sock:
+                # The socket was opened by the request that just finished.
+                conn._mj_sock = sock  # noqa: SLF001
+                conn._mj_opened = now  # noqa: SLF001
+            conn._mj_released = now  # noqa: SLF001
+        super()._put_conn(conn)
+
+
+class _FreshHTTPSConnectionPool(_FreshHTTPConnectionPool, HTTPSConnectionPool):
+    """The HTTPS variant of `_FreshHTTPConnectionPool`."""
+
+
+class FreshHTTPAdapter(HTTPAdapter):
+    """A `requests` adapter closing pooled connections past a maximum age or idle time.
+
+    Servers and load balancers drop connections that stay idle too long, and
+    long-lived connections stick to the same backend. Stale connections are
+    closed before they are reused, so requests after a quiet period do not
+    fail or stall on a dead connection.
+
+    Attributes:
+    - max_age (float | None): The longest time a connection is reused after being opened, in seconds.
+    - max_idle (float | None): The longest time a connection may stay unused in the pool, in seconds.
+    """
+
+    __attrs__ = [*HTTPAdapter.__attrs__, "max_age", "max_idle"]  # noqa: RUF012
+
+    def __init__(
+        self,
+        max_age: float | None = None,
+        max_idle: float | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize a new FreshHTTPAdapter instance.
+
+        Parameters:
+        - max_age (float | None): The longest time a connection is reused after being opened, in seconds. If None, there is no limit.
+        - max_idle (float | None): The longest time a connection may stay unused in the pool, in seconds. If None, there is no limit.
+        - **kwargs (Any): The options of `HTTPAdapter`, such as `pool_connections` and `pool_maxsize`.
+        """
+        self.max_age = max_age
+        self.max_idle = max_idle
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        """Create the pool manager, with pools enforcing the age and idle limits."""
+        super().init_poolmanager(*args, **kwargs)
+        limits = {"max_age": self.max_age, "max_idle": self.max_idle}
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": functools.partial(_FreshHTTPConnectionPool, **limits),
+            "https": functools.partial(_FreshHTTPSConnectionPool, **limits),
+        }
+
+
+class RequestsTransport(Transport):
+    """Send requests with a pooled `requests.Session`.
+
+    Attributes:
+    - session (requests.Session): The session holding the pooled connections.
+    - max_age (float | None): The longest time a pooled connection is reused after being opened, in seconds.
+    - max_idle (float | None): The longest time a connection may stay unused in the pool, in seconds.
+    """
+
+    def __init__(
+        self,
+        session: requests.Session | None = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        max_age: float | None = None,
+        max_idle: float | None = None,
+        reap_interval: float | None = None,
+    ) -> None:
+        """Initialize a new RequestsTransport instance.
+
+        Parameters:
+        - session (requests.Session | None): The session to use. If None, a new session is
+          created and mounted with an adapter sized by the pool options.
+        - pool_connections (int): The number of hosts whose connections are kept.
+        - pool_maxsize (int): The number of connections kept per host.
+        - pool_block (bool): Whether to wait for a free connection when the pool is exhausted.
+        - max_age (float | None): Close pooled connections opened more than this many seconds ago
+          before reusing them. Only applies to the session created by the transport.
+        - max_idle (float | None): Close pooled connections unused for more than this many seconds
+          before reusing them. Only applies to the session created by the transport.
+        - reap_interval (float | None): If set, close the stale idle connections every this many
+          seconds from a background thread, instead of only when they are about to be reused.
+        """
+        if session is None:
+            session = requests.Session()
+            adapter = FreshHTTPAdapter(
+                max_age=max_age,
+                max_idle=max_idle,
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                pool_block=pool_block,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+        self.max_age = max_age
+        self.max_idle = max_idle
+        self._closed = threading.Event()
+        if reap_interval is not None:
+            threading.Thread(
+                target=self._reap_every,
+                args=(reap_interval,),
+                name="mailjet-pool-reaper",
+                daemon=True,
+            ).start()
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        *,
+        data: str | bytes | Any | None = None,
+        params: str | None = None,
+        headers: Mapping[str, str] | None = None,
+        auth: tuple[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> Response:
+        """Send a request through the session.
+
+        Parameters:
+        - method (str): The HTTP method, in lowercase (e.g. 'get').
+        - url (str): The full URL of the request, without the query string.
+        - data (str | bytes | Any | None): The request body.
+        - params (str | None): The encoded query string.
+        - headers (Mapping[str, str] | None): The request headers.
+        - auth (tuple[str, str] | None): The basic authentication credentials.
+        - timeout (float | None): The timeout of the request in seconds.
+
+        Returns:
+        - Response: The response of the server.
+        """
+        return self.session.request(
+            method,
+            url,
+            data=data,
+            params=params,
+            headers=headers,
+            auth=auth,
+            timeout=timeout,
+            verify=True,
+            stream=False,
+        )
+
+    def warmup(
+        self,
+        url: str,
+        n_connections: int,
+        timeout: float | None = 10.0,
+    ) -> int:
+        """Open connections to a server ahead of time and keep them in the pool.
+
+        The connections are opened in parallel, including their TLS handshake,
+        in the pool the session uses for the URL. At most as many connections
+        as the pool keeps per host are opened.
+
+        Parameters:
+        - url (str): A URL of the server, e.g. the API URL of the client.
+        - n_connections (int): The number of connections wanted in the pool.
+        - timeout (float | None): The connection timeout, in seconds.
+
+        Returns:
+        - int: The number of connections opened; connections already open in the pool are reused.
+
+        Raises:
+        - requests.exceptions.ConnectionError: If a connection cannot be opened.
+        """
+        adapter = self.session.get_adapter(url)
+        if not isinstance(adapter, HTTPAdapter):
+            return 0
+        settings = self.session.merge_environment_settings(url, {}, False, True, None)  # noqa: FBT003
+        request = requests.Request("GET", url).prepare()
+        get_pool = getattr(adapter, "get_connection_with_tls_context", None)
+        if get_pool is not None:
+            pool = get_pool(
+                request,
+                settings["verify"],
+                settings["proxies"],
+                settings["cert"],
+            )
+        else:  # requests < 2.32
+            pool = adapter.get_connection(url, settings["proxies"])
+        if pool.pool is not None and pool.pool.maxsize:
+            n_connections = min(n_connections, pool.pool.maxsize)
+        conns = [pool._get_conn() for _ in range(n_connections)]  # noqa: SLF001
+        closed = [conn for conn in conns if getattr(conn, "sock", None) is None]
+
+        def connect(conn: Any) -> None:
+            conn.timeout = timeout
+            conn.connect()
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(len(closed), 1)) as executor:
+                list(executor.map(connect, closed))
+        except Exception as err:
+            for conn in closed:
+                conn.close()
+            raise requests.exceptions.ConnectionError(err) from err
+        finally:
+            for conn in conns:
+                pool._put_conn(conn)  # noqa: SLF001
+        return len(closed)
+
+    def reap(self) -> int:
+        """Close the idle pooled connections past the maximum age or idle time.
+
+        Returns:
+        - int: The number of connections closed.
+        """
+        if self.max_age is None and self.max_idle is None:
+            return 0
+        now = time.monotonic()
+        reaped = 0
+        for adapter in self.session.adapters.values():
+            pools = getattr(getattr(adapter, "poolmanager", None), "pools", None)
+            if pools is None:
+                continue
+            for key in pools.keys():  # noqa: SIM118
+                pool = pools.get(key)
+                idle = getattr(pool, "pool", None)
+                if idle is None:
+                    continue
+                with idle.mutex:
+                    for conn in idle.queue:
+                        if _is_stale(conn, now, self.max_age, self.max_idle):
+                            conn.close()
+                            reaped += 1
+        return reaped
+
+    def _reap_every(self, interval: float) -> None:
+        while not self._closed.wait(interval):
+            self.reap()
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self._closed.set()
+        self.session.close()
+
+
+class ThreadedAsyncTransport(AsyncTransport):
+    """Expose a synchronous transport as an asynchronous one.
+
+    Every request runs in the default executor of the running event loop, so
+    any synchronous HTTP stack can be used from coroutines.
+
+    Attributes:
+    - transport (Transport): The wrapped synchronous transport.
+    """
+
+    def __init__(self, transport: Transport) -> None:
+        """Initialize a new ThreadedAsyncTransport instance.
+
+        Parameters:
+        - transport (Transport): The synchronous transport to run in threads.
+        """
+        self.transport = transport
+
+    async def send(
+        self,
+        method: str,
+        url: str,
+        *,
+        data: str | bytes | Any | None = None,
+        params: str | None = None,
+        headers: Mapping[str, str] | None = None,
+        auth: tuple[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> Response:
+        """Send a request with the wrapped transport in a worker thread.
+
+        Parameters:
+        - method (str): The HTTP method, in lowercase (e.g. 'get').
+        - url (str): The full URL of the request, without the query string.
+        - data (str | bytes | Any | None): The request body.
+        - params (str | None): The encoded query string.
+        - headers (Mapping[str, str] | None): The request headers.
+        - auth (tuple[str, str] | None): The basic authentication credentials.
+        - timeout (float | None): The timeout of the request in seconds.
+
+        Returns:
+        - Response: The response of the server.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None,
+            lambda: self.transport.send(
+                method,
+                url,
+                data=data,
+                params=params,
+                headers=headers,
+                auth=auth,
+                timeout=timeout,
+            ),
+        )
+
+
+def make_response(
+    status_code: int,
+    body: Any = None,
+    headers: Mapping[str, str] | None = None,
+    url: str = "",
+    request: requests.PreparedRequest | None = None,
+) -> Response:
+    """Build a `requests.Response` without any network activity.
+
+    Parameters:
+    - status_code (int): The HTTP status code.
+    - body (Any): The body. `bytes` and `str` are used as is; anything else is serialised to JSON.
+    - headers (Mapping[str, str] | None): The response headers.
+    - url (str): The URL of the response.
+    - request (requests.PreparedRequest | None): The request the response answers.
+
+    Returns:
+    - Response: The response object.
+    """
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers = CaseInsensitiveDict(headers or {})
+    if body is None:
+        content = b""
+    elif isinstance(body, bytes):
+        content = body
+    elif isinstance(body, str):
+        content = body.encode("utf-8")
+    else:
+        content = json.dumps(body).encode("utf-8")
+        response.headers.setdefault("Content-Type", "application/json")
+    response._content = content  # noqa: SLF001
+    response.encoding = "utf-8"
+    response.url = url
+    response.request = request
+    return response
+
+
+@dataclass
+class InMemoryRequest:
+    """A request routed to an in-memory handler.
+
+    Attributes:
+    - method (str): The HTTP method, in uppercase.
+    - url (str): The full URL, including the query string.
+    - path (str): The path of the URL.
+    - query (dict[str, str]): The decoded query parameters.
+    - headers (CaseInsensitiveDict): The request headers.
+    - body (bytes | None): The request body.
+    - auth (tuple[str, str] | None): The basic authentication credentials.
+    - path_params (dict[str, str]): The values captured by the `{name}` placeholders of the route.
+    """
+
+    method: str
+    url: str
+    path: str
+    query: dict[str, str]
+    headers: CaseInsensitiveDict
+    body: bytes | None
+    auth: tuple[str, str] | None = None
+    path_params: dict[str, str] = field(default_factory=dict)
+
+    def json(self) -> Any:
+        """Decode the body as JSON.
+
+        Returns:
+        - Any: The decoded body, or None if the request has no body.
+        """
+        return json.loads(self.body) if self.body else None
+
+
+class InMemoryTransport(Transport):
+    """Route requests to Python handlers, without sockets.
+
+    Routes are registered per method and path. A path may contain `{name}`
+    placeholders, which match one path segment each. Handlers receive an
+    `InMemoryRequest` and return either a `requests.Response`, a
+    `(status_code, body)` or `(status_code, body, headers)` tuple, or a body
+    alone (answered with status 200). Unmatched requests get a 404 response.
+
+    Attributes:
+    - requests (list[InMemoryRequest]): Every request received, when `record=True`.
+
+    Example:
+        transport = InMemoryTransport()
+        transport.add_route("GET", "/v3/REST/contact/{id}", lambda request: {"Data": []})
+        client = Client(auth=("key", "secret"), transport=transport)
+    """
+
+    def __init__(self, record: bool = False) -> None:
+        """Initialize a new InMemoryTransport instance.
+
+        Parameters:
+        - record (bool): Whether to keep every received request in `requests`.
+        """
+        self._routes: list[tuple[str, re.Pattern[str], Handler]] = []
+        self.record = record
+        self.requests: list[InMemoryRequest] = []
+
+    def add_route(self, method: str, path: str, handler: Handler) -> None:
+        """Register a handler for a method and a path.
+
+        Parameters:
+        - method (str): The HTTP method, or '*' for any method.
+        - path (str): The URL path, possibly with `{name}` placeholders.
+        - handler (Handler): The callable answering matching requests.
+        """
+        parts = re.split(r"\{(\w+)\}", path)
+        pattern = "".join(
+            f"(?P<{part}>[^/]+)" if index % 2 else re.escape(part)
+            for index, part in enumerate(parts)
+        )
+        self._routes.append((method.upper(), re.compile(pattern + "$"), handler))
+
+    def route(self, method: str, path: str) -> Callable[[Handler], Handler]:
+        """Register the decorated function as a handler.
+
+        Parameters:
+        - method (str): The HTTP method, or '*' for any method.
+        - path (str): The URL path, possibly with `{name}` placeholders.
+
+        Returns:
+        - Callable[[Handler], Handler]: The decorator.
+        """
+
+        def decorator(handler: Handler) -> Handler:
+            self.add_route(method, path, handler)
+            return handler
+
+        return decorator
+
+    def build_request(
+        self,
+        method: str,
+        url: str,
+        *,
+        data: str | bytes | Any | None = None,
+        params: str | None = None,
+        headers: Mapping[str, str] | None = None,
+        auth: tuple[str, str] | None = None,
+    ) -> InMemoryRequest:
+        """Describe a request as an InMemoryRequest.
+
+        Parameters:
+        - method (str): The HTTP method.
+        - url (str): The URL of the request, without the query string.
+        - data (str | bytes | Any | None): The request body.
+        - params (str | None): The encoded query string.
+        - headers (Mapping[str, str] | None): The request headers.
+        - auth (tuple[str, str] | None): The basic authentication credentials.
+
+        Returns:
+        - InMemoryRequest: The request.
+        """
+        if params:
+            url = f"{url}?{params}"
+        parts = urlsplit(url)
+        body: bytes | None
+        if data is None or isinstance(data, bytes):
+            body = data
+        elif isinstance(data, str):
+            body = data.encode("utf-8")
+        elif isinstance(data, memoryview):
+            body = data.tobytes()
+        elif hasattr(data, "read"):
+            body = data.read()
+        else:
+            body = bytes(data)
+        return InMemoryRequest(
+            method=method.upper(),
+            url=url,
+            path=parts.path,
+            query=dict(parse_qsl(parts.query, keep_blank_values=True)),
+            headers=CaseInsensitiveDict(headers or {}),
+            body=body,
+            auth=auth,
+        )
+
+    def match(self, request: InMemoryRequest) -> Handler | None:
+        """Find the handler of a request and fill in its path parameters.
+
+        Parameters:
+        - request (InMemoryRequest): The request to route.
+
+        Returns:
+        - Handler | None: The matching handler, or None if no route matches.
+        """
+        for method, pattern, handler in self._routes:
+            if method not in {"*", request.method}:
+                continue
+            found = pattern.match(request.path)
+            if found:
+                request.path_params = found.groupdict()
+                return handler
+        return None
+
+    def respond(self, request: InMemoryRequest, result: Any) -> Response:
+        """Turn the value returned by a handler into a response.
+
+        Parameters:
+        - request (InMemoryRequest): The request that was handled.
+        - result (Any): The value returned by the handler.
+
+        Returns:
+        - Response: The response.
+        """
+        if isinstance(result, requests.Response):
+            return result
+        headers: Mapping[str, str] | None = None
+        if isinstance(result, tuple):
+            status_code, body, *rest = result
+            if rest:
+                headers = rest[0]
+        else:
+            status_code, body = 200, result
+        prepared = requests.Request(
+            request.method,
+            request.url,
+            headers=dict(request.headers),
+            data=request.body,
+        ).prepare()
+        return make_response(status_code, body, headers, request.url, prepared)
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        *,
+        data: str | bytes | Any | None = None,
+        params: str | None = None,
+        headers: Mapping[str, str] | None = None,
+        auth: tuple[str, str] | None = None,
+        timeout: float | None = None,  # noqa: ARG002
+    ) -> Response:
+        """Route a request to its handler.
+
+        Parameters:
+        - method (str): The HTTP method, in lowercase (e.g. 'get').
+        - url (str): The full URL of the request, without the query string.
+        - data (str | bytes | Any | None): The request body.
+        - params (str | None): The encoded query string.
+        - headers (Mapping[str, str] | None): The request headers.
+        - auth (tuple[str, str] | None): The basic authentication credentials.
+        - timeout (float | None): Ignored.
+
+        Returns:
+        - Response: The response built from the handler result.
+        """
+        request = self.build_request(
+            method,
+            url,
+            data=data,
+            params=params,
+            headers=headers,
+            auth=auth,
+        )
+        if self.record:
+            self.requests.append(request)
+        handler = self.match(request)
+        if handler is None:
+            return self.respond(request, (404, {"ErrorMessage": "Route not found"}))
+        return self.respond(request, handler(request))
+
+
+class AsyncInMemoryTransport(AsyncTransport):
+    """Route requests of coroutines to Python handlers, without sockets.
+
+    Handlers are registered on the wrapped `InMemoryTransport` and may be
+    plain functions or coroutine functions.
+
+    Attributes:
+    - router (InMemoryTransport): The transport holding the routes.
+    """
+
+    def __init__(self, router: InMemoryTransport | None = None) -> None:
+        """Initialize a new AsyncInMemoryTransport instance.
+
+        Parameters:
+        - router (InMemoryTransport | None): The transport holding the routes. If None, an empty one is created.
+        """
+        self.router = router or InMemoryTransport()
+
+    async def send(
+        self,
+        method: str,
+        url: str,
+        *,
+        data: str | bytes | Any | None = None,
+        params: str | None = None,
+        headers: Mapping[str, str] | None = None,
+        auth: tuple[str, str] | None = None,
+        timeout: float | None = None,  # noqa: ARG002
+    ) -> Response:
+        """Route a request to its handler, awaiting it if it is a coroutine function.
+
+        Parameters:
+        - method (str): The HTTP method, in lowercase (e.g. 'get').
+        - url (str): The full URL of the request, without the query string.
+        - data (str | bytes | Any | None): The request body.
+        - params (str | None): The encoded query string.
+        - headers (Mapping[str, str] | None): The request headers.
+        - auth (tuple[str, str] | None): The basic authentication credentials.
+        - timeout (float | None): Ignored.
+
+        Returns:
+        - Response: The response built from the handler result.
+        """
+        router = self.router
+        request = router.build_request(
+            method,
+            url,
+            data=data,
+            params=params,
+            headers=headers,
+            auth=auth,
+        )
+        if router.record:
+            router.requests.append(request)
+        handler = router.match(request)
+        if handler is None:
+            return router.respond(request, (404, {"ErrorMessage": "Route not found"}))
+        result = handler(request)
+        if inspect.isawaitable(result):
+            result = await result
+        return router.respond(request, result)
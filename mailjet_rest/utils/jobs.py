@@ -0,0 +1,102 @@
+"""Submission and polling of asynchronous `managemanycontacts` jobs.
+
+Bulk contact changes (`contact_managemanycontacts` and
+`contactslist_managemanycontacts`) are processed by the API as jobs: the
+creation request returns a `JobID`, whose status is then polled until the job
+completes, fails or is aborted.
+
+Functions:
+    - job_data: Return the job record of a job response.
+    - run_job: Submit a job and poll it until it reaches a final status.
+    - job_error: Return the error of a finished job, if it failed.
+
+Attributes:
+    - FINAL_JOB_STATUSES: The statuses of a job that will not change anymore.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+from typing import Any
+
+from mailjet_rest.client import ApiError
+
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from typing import Callable
+
+    from requests.models import Response  # type: ignore[import-untyped]
+
+
+FINAL_JOB_STATUSES = frozenset({"Completed", "Error", "Abort"})
+
+
+def job_data(response: Response, what: str) -> dict[str, Any]:
+    """Return the job record of a job creation or status response.
+
+    Parameters:
+    - response (Response): The API response.
+    - what (str): The request described in the error message.
+
+    Returns:
+    - dict[str, Any]: A copy of the first record of the response `Data`.
+
+    Raises:
+    - ApiError: If the response status is not a 2xx status.
+    """
+    if not 200 <= response.status_code < 300:
+        msg = f"{what} failed: HTTP {response.status_code} {response.text}"
+        raise ApiError(msg)
+    return dict(response.json()["Data"][0])
+
+
+def run_job(
+    create: Callable[[], Response],
+    status: Callable[[Any], Response],
+    what: str,
+    wait: bool = True,
+    poll_interval: float = 2.0,
+    fields: Mapping[str, Any] | None = None,
+    jobs: list[dict[str, Any]] | None = None,
+) -> dict[str, Any]:
+    """Submit a job and poll its status until it reaches a final status.
+
+    Parameters:
+    - create (Callable[[], Response]): Sends the job creation request.
+    - status (Callable[[Any], Response]): Sends the status request of a `JobID`.
+    - what (str): The job described in error messages.
+    - wait (bool): Whether to poll the job; if False, the job is returned as submitted.
+    - poll_interval (float): The number of seconds between two status requests.
+    - fields (Mapping[str, Any] | None): Extra fields recorded in the job record, e.g. the action.
+    - jobs (list[dict[str, Any]] | None): A list the job record is appended to as soon as the
+      job is accepted, so it is recorded even if polling fails.
+
+    Returns:
+    - dict[str, Any]: The job record, updated with its last polled status.
+
+    Raises:
+    - ApiError: If the creation or a status request fails.
+    """
+    job = {**(fields or {}), **job_data(create(), what)}
+    if jobs is not None:
+        jobs.append(job)
+    while wait and job.get("Status") not in FINAL_JOB_STATUSES:
+        time.sleep(poll_interval)
+        job.update(job_data(status(job["JobID"]), f"{what} status"))
+    return job
+
+
+def job_error(job: Mapping[str, Any]) -> str | None:
+    """Return the error of a job that failed or was aborted.
+
+    Parameters:
+    - job (Mapping[str, Any]): The job record.
+
+    Returns:
+    - str | None: The job ID, status and error, or None if the job did not fail.
+    """
+    if job.get("Status") not in {"Error", "Abort"} and not job.get("Error"):
+        return None
+    return f"Job {job['JobID']}: {job.get('Status')} {job.get('Error', '')}".strip()
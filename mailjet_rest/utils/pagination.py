@@ -0,0 +1,98 @@
+"""Pagination helpers for the Mailjet REST API client.
+
+The Mailjet REST resources page their results with the `Limit` and `Offset`
+query parameters. This module wraps that mechanism in generators, so callers
+can stream large collections page by page with constant memory.
+
+Attributes:
+    MAX_PAGE_SIZE (int): The largest `Limit` value accepted by the API.
+
+Functions:
+    iter_pages: Yields the `Data` list of every page of a resource.
+    iter_records: Yields the records of a resource one by one.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from typing import Any
+
+from mailjet_rest.client import ApiError
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from collections.abc import Mapping
+
+    from mailjet_rest.client import Endpoint
+
+
+MAX_PAGE_SIZE: int = 1000
+
+
+def iter_pages(
+    endpoint: Endpoint,
+    filters: Mapping[str, str | Any] | None = None,
+    limit: int = MAX_PAGE_SIZE,
+    offset: int = 0,
+    **kwargs: Any,
+) -> Iterator[list[dict[str, Any]]]:
+    """Yield the records of an endpoint one page at a time.
+
+    Pages are requested with increasing `Offset` values until the API returns
+    a page shorter than `limit`.
+
+    Parameters:
+    endpoint (Endpoint): The endpoint to read, e.g. `client.contact`.
+    filters (Mapping[str, str | Any] | None): Additional filters sent with every page request.
+    limit (int): The page size. Defaults to MAX_PAGE_SIZE.
+    offset (int): The offset of the first page. Defaults to 0.
+    **kwargs (Any): Additional keyword arguments to be passed to the API call.
+
+    Yields:
+    list[dict[str, Any]]: The `Data` list of each page.
+
+    Raises:
+    ValueError: If `limit` is not between 1 and MAX_PAGE_SIZE.
+    ApiError: If a page request does not succeed.
+    """
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        msg = f"limit must be between 1 and {MAX_PAGE_SIZE}"
+        raise ValueError(msg)
+    while True:
+        page_filters: dict[str, Any] = dict(filters or {})
+        page_filters["Limit"] = limit
+        page_filters["Offset"] = offset
+        response = endpoint.get_many(filters=page_filters, **kwargs)
+        if response.status_code != 200:
+            msg = (
+                f"Failed to fetch page at offset {offset}: HTTP {response.status_code}"
+            )
+            raise ApiError(msg)
+        data: list[dict[str, Any]] = response.json().get("Data", [])
+        if data:
+            yield data
+        if len(data) < limit:
+            return
+        offset += limit
+
+
+def iter_records(
+    endpoint: Endpoint,
+    filters: Mapping[str, str | Any] | None = None,
+    limit: int = MAX_PAGE_SIZE,
+    **kwargs: Any,
+) -> Iterator[dict[str, Any]]:
+    """Yield the records of an endpoint one by one.
+
+    Parameters:
+    endpoint (Endpoint): The endpoint to read, e.g. `client.contact`.
+    filters (Mapping[str, str | Any] | None): Additional filters sent with every page request.
+    limit (int): The page size. Defaults to MAX_PAGE_SIZE.
+    **kwargs (Any): Additional keyword arguments to be passed to the API call.
+
+    Yields:
+    dict[str, Any]: Each record of the resource.
+    """
+    for page in iter_pages(endpoint, filters=filters, limit=limit, **kwargs):
+        yield from page
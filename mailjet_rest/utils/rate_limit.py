@@ -0,0 +1,110 @@
+"""Token bucket rate limiting.
+
+Classes:
+    TokenBucket: A thread-safe token bucket.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+
+class TokenBucket:
+    """A thread-safe token bucket.
+
+    The bucket holds at most `capacity` tokens and is refilled continuously at
+    `rate` tokens per second. Each request takes one token, so bursts of up to
+    `capacity` requests go through at once and the sustained throughput is
+    `rate` requests per second.
+
+    Attributes:
+    - rate (float): The number of tokens added per second.
+    - capacity (float): The largest number of tokens held.
+    - waited (float): The total time callers spent waiting for tokens, in seconds.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        """Initialize a new, full TokenBucket instance.
+
+        Parameters:
+        - rate (float): The number of tokens added per second.
+        - capacity (float | None): The largest number of tokens held. Defaults to `rate`, with a minimum of 1.
+
+        Raises:
+        - ValueError: If `rate` is not positive or `capacity` is less than one token.
+        """
+        if rate <= 0:
+            msg = "rate must be positive"
+            raise ValueError(msg)
+        if capacity is None:
+            capacity = max(rate, 1.0)
+        if capacity < 1:
+            msg = "capacity must be at least 1"
+            raise ValueError(msg)
+        self.rate = rate
+        self.capacity = capacity
+        self.waited = 0.0
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        """Return the number of tokens currently available."""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity,
+            self._tokens + (now - self._updated) * self.rate,
+        )
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens if they are available.
+
+        Parameters:
+        - tokens (float): The number of tokens to take.
+
+        Returns:
+        - float: 0 if the tokens were taken, otherwise the delay in seconds after which they will be available.
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0, timeout: float | None = None) -> bool:
+        """Take tokens, waiting until they are available.
+
+        Parameters:
+        - tokens (float): The number of tokens to take.
+        - timeout (float | None): The longest time to wait, in seconds. If None, wait as long as needed.
+
+        Returns:
+        - bool: True if the tokens were taken, False if the timeout elapsed first.
+
+        Raises:
+        - ValueError: If more tokens are requested than the bucket can hold.
+        """
+        if tokens > self.capacity:
+            msg = f"cannot take {tokens} tokens from a bucket holding at most {self.capacity}"
+            raise ValueError(msg)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = self.try_acquire(tokens)
+            if delay == 0:
+                return True
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining < delay:
+                    return False
+            time.sleep(delay)
+            with self._lock:
+                self.waited += delay
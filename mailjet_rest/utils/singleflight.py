@@ -0,0 +1,108 @@
+"""Duplicate call suppression for concurrent identical requests.
+
+This module provides the `SingleFlight` class, which lets many threads ask
+for the same result at the same time while only one of them does the work.
+The other callers wait for the in-flight call and receive its result, or its
+exception.
+
+Classes:
+    SingleFlight: Coalesces concurrent calls sharing the same key.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+from typing import Any
+
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+    from typing import Callable
+
+
+class _Call:
+    """The shared state of one in-flight call."""
+
+    __slots__ = ("done", "error", "result", "waiters")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share the same key.
+
+    Only calls that overlap in time are coalesced: once the in-flight call
+    finishes, the next call with the same key does the work again. No result
+    is cached.
+
+    Attributes:
+    - executed (int): The number of calls that did the work.
+    - coalesced (int): The number of calls that reused an in-flight result.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a new SingleFlight instance."""
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return the call counters.
+
+        Returns:
+        - dict[str, int]: The `executed`, `coalesced` and currently `in_flight` counts.
+        """
+        with self._lock:
+            return {
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls),
+            }
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """Run `func`, unless a call with the same key is already in flight.
+
+        Parameters:
+        - key (Hashable): Identifies calls that may share a result.
+        - func (Callable[[], Any]): The work to do when no call is in flight.
+
+        Returns:
+        - Any: The result of `func`, possibly produced for another caller.
+
+        Raises:
+        - BaseException: Whatever `func` raised, re-raised in every waiting caller.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                leader = True
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except BaseException as err:
+            call.error = err
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
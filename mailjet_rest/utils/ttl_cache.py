@@ -0,0 +1,97 @@
+"""A small thread-safe cache whose entries expire after a fixed delay.
+
+Classes:
+    TTLCache: Maps keys to values for at most `ttl` seconds.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+from typing import Any
+
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+
+
+class TTLCache:
+    """Map keys to values for a limited time and a limited number of keys.
+
+    Expired entries are dropped when they are looked up; when the cache is
+    full, the least recently used entry is evicted.
+
+    Attributes:
+    - ttl (float): The lifetime of an entry, in seconds.
+    - maxsize (int): The largest number of entries kept.
+    - hits (int): The number of lookups answered from the cache.
+    - misses (int): The number of lookups that found no live entry.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 1024) -> None:
+        """Initialize a new TTLCache instance.
+
+        Parameters:
+        - ttl (float): The lifetime of an entry, in seconds.
+        - maxsize (int): The largest number of entries kept.
+
+        Raises:
+        - ValueError: If `ttl` is negative or `maxsize` is not positive.
+        """
+        if ttl < 0:
+            msg = "ttl must not be negative"
+            raise ValueError(msg)
+        if maxsize < 1:
+            msg = "maxsize must be positive"
+            raise ValueError(msg)
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of entries, including expired ones not yet dropped."""
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the live value of a key.
+
+        Parameters:
+        - key (Hashable): The key to look up.
+        - default (Any): The value returned when the key has no live entry.
+
+        Returns:
+        - Any: The cached value, or `default`.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value for `ttl` seconds.
+
+        Parameters:
+        - key (Hashable): The key of the value.
+        - value (Any): The value to store.
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,261 @@
+"""Bulk validation of senders and sending domains.
+
+Onboarding many senders means calling `sender_validate`, `dns_check` and
+`dns` once per sender or domain. `BulkValidator` runs those calls
+concurrently within a request budget, caches each result for a while so that
+repeated runs (e.g. polling until DNS records propagate) do not call the API
+again, and consolidates everything into one status table.
+
+Classes:
+    - ValidationRow: The validation status of one sender or domain.
+    - ValidationReport: The rows of a bulk validation, with table helpers.
+    - BulkValidator: Validates many senders and domains concurrently.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from dataclasses import field
+from dataclasses import replace
+from typing import TYPE_CHECKING
+from typing import Any
+
+from mailjet_rest.utils.rate_limit import TokenBucket
+from mailjet_rest.utils.ttl_cache import TTLCache
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from requests.models import Response  # type: ignore[import-untyped]
+
+    from mailjet_rest.client import Client
+
+
+VALID: str = "valid"
+INVALID: str = "invalid"
+ERROR: str = "error"
+
+
+@dataclass(frozen=True)
+class ValidationRow:
+    """The validation status of one sender or domain.
+
+    Attributes:
+    - kind (str): Either "sender" or "domain".
+    - target (str): The ID of the sender or DNS record.
+    - status (str): One of `VALID`, `INVALID` or `ERROR` (the API call failed).
+    - details (dict[str, Any]): The relevant fields of the API response (e.g. `DKIMStatus`, `SPFStatus`, `Errors`).
+    - error (str | None): A description of the failure, if the status is not `VALID`.
+    - cached (bool): Whether the row was served from the cache.
+    """
+
+    kind: str
+    target: str
+    status: str
+    details: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+    cached: bool = False
+
+
+@dataclass(frozen=True)
+class ValidationReport:
+    """The rows of a bulk validation.
+
+    Attributes:
+    - rows (list[ValidationRow]): One row per sender and domain, in request order.
+    """
+
+    rows: list[ValidationRow]
+
+    @property
+    def valid(self) -> list[ValidationRow]:
+        """Return the rows of the valid senders and domains."""
+        return [row for row in self.rows if row.status == VALID]
+
+    @property
+    def problems(self) -> list[ValidationRow]:
+        """Return the rows of the invalid senders and domains, and of failed calls."""
+        return [row for row in self.rows if row.status != VALID]
+
+    def as_table(self) -> list[dict[str, Any]]:
+        """Return the report as a list of flat rows.
+
+        Returns:
+        - list[dict[str, Any]]: One dict per row, with the kind, target, status, error and cached columns.
+        """
+        return [
+            {
+                "kind": row.kind,
+                "target": row.target,
+                "status": row.status,
+                "error": row.error or "",
+                "cached": row.cached,
+            }
+            for row in self.rows
+        ]
+
+    def format(self) -> str:
+        """Render the report as a plain text table.
+
+        Returns:
+        - str: The table, with a header line.
+        """
+        columns = ("kind", "target", "status", "error")
+        table = [{name: name.upper() for name in columns}] + [
+            {name: str(row[name]) for name in columns} for row in self.as_table()
+        ]
+        widths = {name: max(len(line[name]) for line in table) for name in columns}
+        return "\n".join(
+            "  ".join(line[name].ljust(widths[name]) for name in columns).rstrip()
+            for line in table
+        )
+
+
+def _data(response: Response) -> dict[str, Any]:
+    body = response.json() if response.content else {}
+    if isinstance(body, dict) and isinstance(body.get("Data"), list):
+        return body["Data"][0] if body["Data"] else {}
+    return body if isinstance(body, dict) else {}
+
+
+class BulkValidator:
+    """Validate many senders and domains concurrently.
+
+    Results are cached per sender and domain for `cache_ttl` seconds; failed
+    API calls are not cached.
+
+    Attributes:
+    - client (Client): The client used to call the API (version v3).
+    - max_workers (int): The largest number of requests running at once.
+    - bucket (TokenBucket | None): The request budget, if any.
+    - cache (TTLCache): The cache of validation rows.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        rate: float | None = None,
+        burst: float | None = None,
+        max_workers: int = 8,
+        cache_ttl: float = 300.0,
+    ) -> None:
+        """Initialize a new BulkValidator instance.
+
+        Parameters:
+        - client (Client): The client used to call the API (version v3).
+        - rate (float | None): The request budget, in requests per second. If None, requests are not limited.
+        - burst (float | None): The number of requests that may be sent at once. Defaults to `rate`.
+        - max_workers (int): The largest number of requests running at once.
+        - cache_ttl (float): How long results are cached, in seconds.
+        """
+        self.client = client
+        self.max_workers = max_workers
+        self.bucket = TokenBucket(rate, burst) if rate is not None else None
+        self.cache = TTLCache(cache_ttl, maxsize=100_000)
+
+    def _request(self, kind: str, target: str, check: bool) -> Response:
+        if self.bucket is not None:
+            self.bucket.acquire()
+        if kind == "sender":
+            return self.client.sender_validate.create(id=target)
+        if check:
+            return self.client.dns_check.create(id=target)
+        return self.client.dns.get(id=target)
+
+    def _validate(
+        self,
+        kind: str,
+        target: str,
+        check: bool,
+        use_cache: bool,
+    ) -> ValidationRow:
+        key = (kind, target, check)
+        if use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return replace(cached, cached=True)
+        try:
+            response = self._request(kind, target, check)
+        except Exception as err:  # noqa: BLE001
+            return ValidationRow(
+                kind,
+                target,
+                ERROR,
+                error=str(err) or type(err).__name__,
+            )
+        if not 200 <= response.status_code < 300:
+            return ValidationRow(
+                kind,
+                target,
+                ERROR,
+                error=f"HTTP {response.status_code}: {response.text}",
+            )
+        data = _data(response)
+        row = (
+            self._sender_row(target, data)
+            if kind == "sender"
+            else self._domain_row(target, data)
+        )
+        self.cache.set(key, row)
+        return row
+
+    @staticmethod
+    def _sender_row(target: str, data: dict[str, Any]) -> ValidationRow:
+        errors = data.get("Errors") or {}
+        global_error = data.get("GlobalError") or ""
+        details: dict[str, Any] = {
+            "ValidationMethod": data.get("ValidationMethod", ""),
+            "Errors": errors,
+            "GlobalError": global_error,
+        }
+        if errors or global_error:
+            error = global_error or "; ".join(f"{k}: {v}" for k, v in errors.items())
+            return ValidationRow("sender", target, INVALID, details, error)
+        return ValidationRow("sender", target, VALID, details)
+
+    @staticmethod
+    def _domain_row(target: str, data: dict[str, Any]) -> ValidationRow:
+        details: dict[str, Any] = {
+            name: data[name]
+            for name in ("Domain", "DKIMStatus", "SPFStatus", "DKIMErrors", "SPFErrors")
+            if name in data
+        }
+        failing = [
+            f"{name[:-6]} {data.get(name, 'unknown')}"
+            for name in ("DKIMStatus", "SPFStatus")
+            if data.get(name) != "OK"
+        ]
+        if failing:
+            return ValidationRow("domain", target, INVALID, details, ", ".join(failing))
+        return ValidationRow("domain", target, VALID, details)
+
+    def validate(
+        self,
+        senders: Iterable[str | int] = (),
+        domains: Iterable[str | int] = (),
+        check: bool = True,
+        use_cache: bool = True,
+    ) -> ValidationReport:
+        """Validate senders and domains concurrently.
+
+        Parameters:
+        - senders (Iterable[str | int]): The IDs of the senders to validate with `sender_validate`.
+        - domains (Iterable[str | int]): The IDs of the DNS records to check.
+        - check (bool): Whether to run a fresh `dns_check` instead of reading the last `dns` status.
+        - use_cache (bool): Whether cached results may be returned.
+
+        Returns:
+        - ValidationReport: One row per sender and domain, in the given order.
+        """
+        jobs = [("sender", str(target)) for target in senders]
+        jobs += [("domain", str(target)) for target in domains]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            rows = list(
+                executor.map(
+                    lambda job: self._validate(job[0], job[1], check, use_cache),
+                    jobs,
+                ),
+            )
+        return ValidationReport(rows)
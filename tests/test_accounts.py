@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from typing import Any
+
+import pytest
+
+from mailjet_rest.accounts import ClientPool
+from mailjet_rest.accounts import RateLimitedTransport
+from mailjet_rest.client import TimeoutError
+from mailjet_rest.transport import InMemoryRequest
+from mailjet_rest.transport import InMemoryTransport
+from mailjet_rest.utils.rate_limit import TokenBucket
+
+
+class ClosingTransport(InMemoryTransport):
+    """An in-memory transport remembering whether it was closed."""
+
+    closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def transport() -> ClosingTransport:
+    """Provide a shared transport echoing the API key of each request."""
+    transport = ClosingTransport(record=True)
+
+    @transport.route("GET", "/v3/REST/contact")
+    def list_contacts(request: InMemoryRequest) -> dict[str, Any]:
+        assert request.auth is not None
+        return {"Count": 0, "Data": [], "Total": 0, "Key": request.auth[0]}
+
+    return transport
+
+
+def test_accounts_share_the_transport(transport: ClosingTransport) -> None:
+    """Test that every account client sends through the pool's transport."""
+    pool = ClientPool(transport=transport, version="v3")
+    first = pool.get(("key-1", "secret-1"))
+    second = pool.get(("key-2", "secret-2"))
+
+    assert pool.get(("key-1", "secret-1")) is first
+    assert first.contact.get().json()["Key"] == "key-1"
+    assert second.contact.get().json()["Key"] == "key-2"
+    assert isinstance(first.transport, RateLimitedTransport)
+    assert first.transport.transport is second.transport.transport is transport
+
+    first.close()
+    assert not transport.closed
+    pool.close()
+    assert transport.closed
+    assert len(pool) == 0
+
+
+def test_new_secret_replaces_the_client(transport: ClosingTransport) -> None:
+    """Test that rotated credentials get a new client."""
+    pool = ClientPool(transport=transport)
+    old = pool.get(("key", "old"))
+    new = pool.get(("key", "new"))
+    assert new is not old
+    assert new.auth == ("key", "new")
+    assert len(pool) == 1
+
+
+def test_pool_keeps_a_bounded_number_of_clients(transport: ClosingTransport) -> None:
+    """Test that only the most recently used clients are kept."""
+    pool = ClientPool(max_clients=100, transport=transport)
+    for i in range(5000):
+        pool.get((f"key-{i}", "secret"))
+        pool.get(("key-0", "secret"))
+
+    assert len(pool) == 100
+    assert pool.evicted == 4900
+    assert "key-0" in pool
+    assert "key-4999" in pool
+    assert "key-1" not in pool
+
+
+def test_per_account_budgets(transport: ClosingTransport) -> None:
+    """Test that accounts have independent token buckets."""
+    pool = ClientPool(rate=1000, burst=5, transport=transport)
+    limited = pool.get(("limited", "secret"), rate=0.001, burst=2)
+    other = pool.get(("other", "secret"))
+
+    assert limited.contact.get().status_code == 200
+    assert limited.contact.get().status_code == 200
+    with pytest.raises(TimeoutError):
+        limited.contact.get(timeout=0.01)
+    assert [other.contact.get().status_code for _ in range(5)] == [200] * 5
+    assert pool.get(("unlimited", "secret"), rate=None).transport.bucket.rate == 1000
+
+
+def test_token_bucket_refills_over_time(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that tokens are refilled at the configured rate, up to the capacity."""
+    now = [0.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    bucket = TokenBucket(rate=10, capacity=2)
+
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == pytest.approx(0.1)
+    now[0] += 0.05
+    assert bucket.tokens == pytest.approx(0.5)
+    now[0] += 10
+    assert bucket.tokens == 2
+
+
+def test_token_bucket_rejects_unreachable_amounts() -> None:
+    """Test that buckets never holding a whole request are rejected."""
+    with pytest.raises(ValueError, match="capacity"):
+        TokenBucket(rate=10, capacity=0.5)
+    with pytest.raises(ValueError, match="at most 2"):
+        TokenBucket(rate=10, capacity=2).acquire(3)
+
+
+def test_accounts_do_not_share_cookies() -> None:
+    """Test that a cookie set for one account is not sent for another."""
+    cookies: list[str | None] = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:
+            cookies.append(self.headers.get("Cookie"))
+            self.send_response(200)
+            self.send_header("Set-Cookie", "session=first-account; Path=/")
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with ClientPool(
+            api_url=f"http://127.0.0.1:{server.server_address[1]}/",
+        ) as pool:
+            pool.get(("first", "secret")).contact.get()
+            pool.get(("second", "secret")).contact.get()
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert cookies == [None, None]
+
+
+def test_budgets_survive_client_eviction(transport: ClosingTransport) -> None:
+    """Test that an evicted account keeps its budget on its next client."""
+    pool = ClientPool(max_clients=1, rate=0.001, burst=2, transport=transport)
+    first = pool.get(("key-0", "secret"))
+    assert first.contact.get().status_code == 200
+    assert first.contact.get().status_code == 200
+    pool.get(("key-1", "secret"))
+    assert "key-0" not in pool
+
+    second = pool.get(("key-0", "secret"))
+    assert second is not first
+    assert second.transport.bucket is first.transport.bucket
+    with pytest.raises(TimeoutError):
+        second.contact.get(timeout=0.01)
+
+
+def test_full_budgets_are_pruned(transport: ClosingTransport) -> None:
+    """Test that the buckets of idle, evicted accounts do not accumulate."""
+    pool = ClientPool(max_clients=10, rate=1000, burst=1, transport=transport)
+    for i in range(1000):
+        pool.get((f"key-{i}", "secret"))
+    assert len(pool._buckets) <= 20
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from mailjet_rest import Client
+from mailjet_rest.bench import main
+from mailjet_rest.bench import percentile
+from mailjet_rest.bench import run
+from mailjet_rest.testing import MockMailjet
+
+
+def test_percentile_nearest_rank() -> None:
+    """Test the nearest-rank percentiles."""
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile(values, 100) == 100.0
+    assert percentile([], 95) == 0.0
+
+
+@pytest.mark.parametrize("scenario", ["send", "read", "mixed"])
+def test_run_counts_requests_and_errors(scenario: str) -> None:
+    """Test a bounded run of every scenario against an in-process mock."""
+    mock = MockMailjet()
+    mock.seed("contact", [{"Email": f"c{i}@example.com"} for i in range(20)])
+    mock.inject(429, count=5)
+    client = Client(auth=("key", "secret"), transport=mock.transport)
+
+    result = run(
+        client,
+        scenario,
+        concurrency=4,
+        max_requests=60,
+        page_size=10,
+        pages=2,
+    )
+
+    assert result.requests == 60
+    assert result.errors == {"HTTP 429": 5}
+    assert mock.request_count == 60
+    sends = len(mock.records("message"))
+    assert sends == {"send": 55, "read": 0, "mixed": sends}[scenario]
+    if scenario == "mixed":
+        assert 0 < sends < 55
+
+
+def test_cli_reports_json(capsys: pytest.CaptureFixture[str]) -> None:
+    """Test the command line against its local mock server."""
+    status = main(
+        [
+            "--scenario",
+            "read",
+            "--requests",
+            "30",
+            "--concurrency",
+            "3",
+            "--format",
+            "json",
+        ],
+    )
+    summary = json.loads(capsys.readouterr().out)
+
+    assert status == 0
+    assert summary["requests"] == 30
+    assert summary["errors"] == 0
+    assert set(summary["latency_ms"]) == {"p50", "p95", "p99", "max"}
+    assert summary["latency_ms"]["p50"] <= summary["latency_ms"]["p99"]
+    assert summary["throughput_rps"] > 0
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+import requests
+
+from mailjet_rest import Client
+from mailjet_rest.campaigns import CampaignSpec
+from mailjet_rest.campaigns import CampaignWorkflow
+from mailjet_rest.transport import InMemoryRequest
+from mailjet_rest.transport import InMemoryTransport
+
+
+class CampaignBackend:
+    """An in-memory stand-in for the campaign draft resources."""
+
+    def __init__(self) -> None:
+        self.transport = InMemoryTransport(record=True)
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1000)
+        self.titles: dict[str, str] = {}
+        self.calls: list[tuple[str, str]] = []
+        self.fail: set[tuple[str, str]] = set()
+        self.lose: set[tuple[str, str]] = set()
+        self.drop: set[tuple[str, str]] = set()
+        self.status: dict[str, int] = {}
+        self.created: dict[str, str] = {}
+        self.listed: list[dict[str, str]] = []
+        self.active = 0
+        self.peak = 0
+        for step in ("detailcontent", "test", "schedule", "send"):
+            self.transport.add_route(
+                "POST",
+                "/v3/REST/campaigndraft/{id}/" + step,
+                self.make_handler(step),
+            )
+        self.transport.add_route("POST", "/v3/REST/campaigndraft", self.create)
+        self.transport.add_route("GET", "/v3/REST/campaigndraft", self.list_drafts)
+        self.transport.add_route("GET", "/v3/REST/campaigndraft/{id}", self.get)
+
+    def track(self, step: str, name: str) -> tuple[int, Any] | None:
+        with self.lock:
+            self.calls.append((step, name))
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.005)
+        with self.lock:
+            self.active -= 1
+        if (step, name) in self.fail:
+            return 400, {"ErrorMessage": f"{step} refused"}
+        return None
+
+    def create(self, request: InMemoryRequest) -> Any:
+        title = request.json()["Title"]
+        failure = self.track("create", title)
+        if failure:
+            return failure
+        if ("create", title) in self.drop:
+            raise requests.exceptions.ConnectTimeout(title)
+        draft_id = next(self.ids)
+        self.titles[str(draft_id)] = title
+        self.status[str(draft_id)] = 0
+        self.created[str(draft_id)] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        self.check_lost("create", title)
+        return 201, {"Data": [{"ID": draft_id}]}
+
+    def check_lost(self, step: str, title: str) -> None:
+        """Simulate a response lost after the server applied the step."""
+        if (step, title) in self.lose:
+            raise requests.exceptions.ReadTimeout(step)
+
+    def add_draft(self, title: str, status: int, created: str) -> int:
+        draft_id = next(self.ids)
+        self.titles[str(draft_id)] = title
+        self.status[str(draft_id)] = status
+        self.created[str(draft_id)] = created
+        return draft_id
+
+    def list_drafts(self, request: InMemoryRequest) -> Any:
+        self.listed.append(dict(request.query))
+        drafts = [
+            {
+                "ID": int(i),
+                "Title": title,
+                "Status": self.status[i],
+                "CreatedAt": self.created[i],
+            }
+            for i, title in self.titles.items()
+            if str(self.status[i]) == request.query.get("Status", str(self.status[i]))
+        ]
+        drafts.sort(
+            key=lambda draft: draft["ID"],
+            reverse=request.query.get("Sort") == "ID DESC",
+        )
+        offset, limit = int(request.query["Offset"]), int(request.query["Limit"])
+        page = drafts[offset : offset + limit]
+        return {"Count": len(page), "Data": page, "Total": len(drafts)}
+
+    def get(self, request: InMemoryRequest) -> Any:
+        draft_id = request.path_params["id"]
+        return {"Data": [{"ID": int(draft_id), "Status": self.status[draft_id]}]}
+
+    def make_handler(self, step: str) -> Any:
+        def handler(request: InMemoryRequest) -> Any:
+            title = self.titles[request.path_params["id"]]
+            failure = self.track(step, title)
+            if failure:
+                return failure
+            if step in {"schedule", "send"}:
+                self.status[request.path_params["id"]] = 1 if step == "schedule" else 2
+            self.check_lost(step, title)
+            return 201, {"Data": [{}]}
+
+        return handler
+
+
+def specs(count: int) -> list[CampaignSpec]:
+    return [
+        CampaignSpec(
+            key=f"draft-{i}",
+            draft={"Locale": "en_US", "Title": f"draft-{i}", "ContactsListID": 1},
+            content={"Html-part": "<h3>Hello</h3>", "Text-part": "Hello"},
+            test_recipients=[{"Email": "passenger@mailjet.com"}],
+            schedule="2030-01-01T00:00:00",
+        )
+        for i in range(count)
+    ]
+
+
+def test_drafts_are_pipelined_in_step_order() -> None:
+    """Test that drafts run concurrently while each keeps its step order."""
+    backend = CampaignBackend()
+    client = Client(auth=("key", "secret"), transport=backend.transport)
+    result = CampaignWorkflow(client, max_workers=8).run(specs(20))
+
+    assert len(result.succeeded) == 20
+    assert backend.peak > 1
+    for outcome in result.outcomes.values():
+        assert outcome.completed == ("create", "content", "test", "schedule")
+        steps = [step for step, name in backend.calls if name == outcome.key]
+        assert steps == ["create", "detailcontent", "test", "schedule"]
+
+
+def test_failed_drafts_resume_at_the_failed_step(tmp_path: Path) -> None:
+    """Test that a second run only redoes the unfinished steps."""
+    backend = CampaignBackend()
+    client = Client(auth=("key", "secret"), transport=backend.transport)
+    checkpoint = tmp_path / "campaigns.sqlite"
+    backend.fail = {("create", "draft-1"), ("test", "draft-0")}
+
+    first = CampaignWorkflow(client, checkpoint).run(specs(3))
+    assert [outcome.key for outcome in first.failed] == ["draft-0", "draft-1"]
+    assert "test refused" in (first.outcomes["draft-0"].error or "")
+    assert first.outcomes["draft-0"].completed == ("create", "content")
+    assert first.outcomes["draft-1"].draft_id is None
+
+    backend.fail.clear()
+    backend.calls.clear()
+    second = CampaignWorkflow(client, checkpoint).run(specs(3))
+
+    assert len(second.succeeded) == 3
+    assert second.outcomes["draft-0"].draft_id == first.outcomes["draft-0"].draft_id
+    assert [step for step, name in backend.calls if name == "draft-0"] == [
+        "test",
+        "schedule",
+    ]
+    assert ("create", "draft-1") in backend.calls
+    assert not [call for call in backend.calls if call[1] == "draft-2"]
+
+
+def test_unconfirmed_steps_are_not_repeated(tmp_path: Path) -> None:
+    """Test that a create or schedule applied without a response is not sent twice."""
+    backend = CampaignBackend()
+    client = Client(auth=("key", "secret"), transport=backend.transport)
+    checkpoint = tmp_path / "campaigns.sqlite"
+    backend.lose = {("create", "draft-0"), ("schedule", "draft-1"), ("test", "draft-2")}
+    backend.fail = {("create", "draft-3")}
+
+    first = CampaignWorkflow(client, checkpoint).run(specs(4))
+    assert len(first.failed) == 4
+    assert first.outcomes["draft-0"].pending == "create"
+    assert first.outcomes["draft-1"].pending == "schedule"
+    assert first.outcomes["draft-2"].pending is None
+    assert first.outcomes["draft-3"].pending is None
+
+    backend.lose.clear()
+    backend.fail.clear()
+    backend.calls.clear()
+    second = CampaignWorkflow(client, checkpoint).run(specs(4))
+
+    assert len(second.succeeded) == 4
+    assert all(outcome.pending is None for outcome in second.outcomes.values())
+    assert second.outcomes["draft-0"].draft_id in {int(i) for i in backend.titles}
+    assert [step for step, name in backend.calls if name == "draft-0"] == [
+        "detailcontent",
+        "test",
+        "schedule",
+    ]
+    assert [step for step, name in backend.calls if name == "draft-1"] == []
+    assert [step for step, name in backend.calls if name == "draft-2"] == [
+        "test",
+        "schedule",
+    ]
+    assert sorted(backend.titles.values()) == [
+        "draft-0",
+        "draft-1",
+        "draft-2",
+        "draft-3",
+    ]
+
+
+def test_recovery_ignores_older_drafts_with_the_same_title(tmp_path: Path) -> None:
+    """Test that an unconfirmed create is matched only with drafts created after it."""
+    backend = CampaignBackend()
+    client = Client(auth=("key", "secret"), transport=backend.transport)
+    checkpoint = tmp_path / "campaigns.sqlite"
+    sent = backend.add_draft("draft-0", 2, "2020-01-01T00:00:00Z")
+    older = backend.add_draft("draft-1", 0, "2020-01-01T00:00:00Z")
+    for i in range(3):
+        backend.add_draft(f"other-{i}", 0, "2020-01-01T00:00:00Z")
+    backend.drop = {("create", "draft-0")}
+    backend.lose = {("create", "draft-1")}
+
+    first = CampaignWorkflow(client, checkpoint).run(specs(2))
+    assert first.outcomes["draft-0"].pending == "create"
+    assert first.outcomes["draft-1"].pending == "create"
+    assert first.outcomes["draft-1"].pending_since is not None
+    created = max(int(i) for i in backend.titles)
+
+    backend.drop.clear()
+    backend.lose.clear()
+    backend.calls.clear()
+    backend.listed.clear()
+    second = CampaignWorkflow(client, checkpoint).run(specs(2))
+
+    assert len(second.succeeded) == 2
+    assert second.outcomes["draft-1"].draft_id == created
+    assert second.outcomes["draft-1"].draft_id != older
+    assert second.outcomes["draft-0"].draft_id not in {sent, older}
+    assert backend.status[str(sent)] == 2
+    assert ("create", "draft-0") in backend.calls
+    assert [step for step, name in backend.calls if name == "draft-1"] == [
+        "detailcontent",
+        "test",
+        "schedule",
+    ]
+    assert len(backend.listed) == 2
+    assert backend.listed[0] == {
+        "Status": "0",
+        "Sort": "ID DESC",
+        "ContactsList": "1",
+        "Limit": "1000",
+        "Offset": "0",
+    }
+
+
+def test_spec_steps() -> None:
+    """Test the steps derived from a campaign description."""
+    spec = CampaignSpec(key="a", draft={}, content={})
+    assert spec.steps == ("create", "content")
+    assert CampaignSpec("b", {}, {}, send_now=True).steps == (
+        "create",
+        "content",
+        "send",
+    )
+
+
+def test_keys_must_be_unique() -> None:
+    """Test that duplicated draft keys are rejected before any call."""
+    client = Client(auth=("key", "secret"), transport=InMemoryTransport())
+    with pytest.raises(ValueError, match="unique"):
+        CampaignWorkflow(client).run(specs(2) + specs(1))
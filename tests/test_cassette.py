@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from mailjet_rest import Client
+from mailjet_rest.cassette import CassetteMissError
+from mailjet_rest.cassette import RecordingTransport
+from mailjet_rest.cassette import ReplayTransport
+from mailjet_rest.transport import InMemoryRequest
+from mailjet_rest.transport import InMemoryTransport
+from mailjet_rest.utils.pagination import iter_records
+
+
+def make_backend() -> InMemoryTransport:
+    """Provide a paginated contact backend with 25 contacts."""
+    backend = InMemoryTransport()
+    contacts = [{"ID": i, "Email": f"user{i}@example.com"} for i in range(25)]
+
+    @backend.route("GET", "/v3/REST/contact")
+    def list_contacts(request: InMemoryRequest) -> dict[str, Any]:
+        offset, limit = int(request.query["Offset"]), int(request.query["Limit"])
+        data = contacts[offset : offset + limit]
+        return {"Count": len(data), "Data": data, "Total": len(contacts)}
+
+    @backend.route("POST", "/{version}/send")
+    def send(request: InMemoryRequest) -> tuple[int, Any, dict[str, str]]:
+        return (
+            200,
+            {"Messages": [{"Status": "success"}]},
+            {"X-MJ-Request-GUID": "g", "Content-Encoding": "gzip"},
+        )
+
+    return backend
+
+
+@pytest.mark.parametrize("name", ["cassette.jsonl", "cassette.jsonl.gz"])
+def test_record_then_replay_offline(tmp_path: Path, name: str) -> None:
+    """Test that a replayed pagination run sees the recorded responses."""
+    path = tmp_path / name
+    recorder = RecordingTransport(make_backend(), path)
+    with Client(auth=("key", "secret"), transport=recorder) as client:
+        recorded = list(iter_records(client.contact, limit=10))
+        client.send.create(data={"Messages": []})
+    assert len(recorder.interactions) == 4
+    assert "secret" not in path.read_bytes().decode("latin-1")
+
+    replay = ReplayTransport(path)
+    client = Client(auth=("key", "secret"), transport=replay)
+    assert list(iter_records(client.contact, limit=10)) == recorded
+    sent = client.send.create(data={"Messages": []})
+    assert sent.headers["X-MJ-Request-GUID"] == "g"
+    assert "Content-Encoding" not in sent.headers
+    assert replay.replayed == 4
+
+
+def test_unrecorded_requests_raise(tmp_path: Path) -> None:
+    """Test that requests missing from the cassette are reported."""
+    path = tmp_path / "cassette.jsonl"
+    recorder = RecordingTransport(make_backend(), path)
+    Client(transport=recorder).contact.get(filters={"Limit": 1, "Offset": 0})
+    recorder.save()
+
+    client = Client(transport=ReplayTransport(path))
+    with pytest.raises(CassetteMissError):
+        client.contact.get(filters={"Limit": 2, "Offset": 0})
+
+
+def test_match_body_distinguishes_payloads(tmp_path: Path) -> None:
+    """Test that bodies are only matched when asked to."""
+    path = tmp_path / "cassette.jsonl"
+    recorder = RecordingTransport(make_backend(), path)
+    Client(transport=recorder, version="v3.1").send.create(data={"Messages": [1]})
+    recorder.save()
+
+    loose = Client(transport=ReplayTransport(path), version="v3.1")
+    assert loose.send.create(data={"Messages": [2]}).status_code == 200
+    strict = Client(transport=ReplayTransport(path, match_body=True), version="v3.1")
+    assert strict.send.create(data={"Messages": [1]}).status_code == 200
+    with pytest.raises(CassetteMissError):
+        strict.send.create(data={"Messages": [2]})
+
+
+def test_replay_simulates_latency_with_seeded_jitter(tmp_path: Path) -> None:
+    """Test that latency is added and jitter is reproducible for a given seed."""
+    path = tmp_path / "cassette.jsonl"
+    recorder = RecordingTransport(make_backend(), path)
+    Client(transport=recorder).contact.get(filters={"Limit": 1, "Offset": 0})
+    recorder.save()
+
+    first = ReplayTransport(path, latency=0.02, jitter=0.01, seed=7)
+    second = ReplayTransport(path, latency=0.02, jitter=0.01, seed=7)
+    assert [first._random.random() for _ in range(3)] == [
+        second._random.random() for _ in range(3)
+    ]
+
+    client = Client(transport=ReplayTransport(path, latency=0.02))
+    started = time.perf_counter()
+    client.contact.get(filters={"Limit": 1, "Offset": 0})
+    assert time.perf_counter() - started >= 0.02
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+
+from mailjet_rest import Client
+from mailjet_rest.cli import Progress
+from mailjet_rest.cli import export_records
+from mailjet_rest.cli import import_csv
+from mailjet_rest.cli import main
+from mailjet_rest.testing import MockMailjet
+from mailjet_rest.testing import MockMailjetServer
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture
+def mock() -> MockMailjet:
+    mock = MockMailjet()
+    mock.seed(
+        "contact",
+        [{"Email": f"c{i}@example.com", "Properties": {"n": i}} for i in range(1, 251)],
+    )
+    return mock
+
+
+@pytest.fixture
+def client(mock: MockMailjet) -> Client:
+    return Client(auth=("key", "secret"), transport=mock.transport)
+
+
+@pytest.mark.parametrize("parallel", [1, 4])
+def test_export_streams_every_record_in_order(
+    client: Client,
+    mock: MockMailjet,
+    parallel: int,
+) -> None:
+    """Test a JSON lines export fetching pages ahead of the writer."""
+    out = io.StringIO()
+    progress = Progress("records")
+
+    total = export_records(
+        client,
+        "contact",
+        out,
+        page_size=50,
+        parallel=parallel,
+        progress=progress,
+    )
+
+    emails = [json.loads(line)["Email"] for line in out.getvalue().splitlines()]
+    assert total == progress.count == 250
+    assert emails == [f"c{i}@example.com" for i in range(1, 251)]
+    # Six page requests (the last one empty), plus at most the read-ahead.
+    assert 6 <= mock.request_count <= 5 + parallel
+
+
+def test_export_csv_with_filters(client: Client) -> None:
+    """Test a CSV export with nested values encoded as JSON."""
+    out = io.StringIO()
+
+    export_records(
+        client,
+        "contact",
+        out,
+        "csv",
+        filters={"Email": "c7@example.com"},
+    )
+
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert len(rows) == 1
+    assert rows[0]["Email"] == "c7@example.com"
+    assert json.loads(rows[0]["Properties"]) == {"n": 7}
+
+
+def test_export_csv_does_not_drop_late_fields() -> None:
+    """Test that a field first seen after the first page is not silently dropped."""
+    mock = MockMailjet()
+    mock.seed("contactslist", [{"Name": f"list {i}"} for i in range(1, 4)])
+    mock.seed("contactslist", [{"Name": "tagged", "Tag": "vip"}])
+    client = Client(auth=("key", "secret"), transport=mock.transport)
+
+    with pytest.raises(ValueError, match="Tag"):
+        export_records(client, "contactslist", io.StringIO(), "csv", page_size=2)
+
+    out = io.StringIO()
+    export_records(
+        client,
+        "contactslist",
+        out,
+        "csv",
+        page_size=2,
+        columns=["ID", "Name", "Tag"],
+    )
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert [row["Tag"] for row in rows] == ["", "", "", "vip"]
+
+
+def test_import_uploads_one_job_per_chunk(client: Client, mock: MockMailjet) -> None:
+    """Test a chunked import, which must not lose or duplicate rows."""
+    list_id = mock.seed("contactslist", [{"Name": "Imported"}])[0]["ID"]
+    lines = ["email,name"] + [f"new{i}@example.com,New {i}" for i in range(25)]
+    progress = Progress("rows")
+
+    jobs = import_csv(
+        client,
+        list_id,
+        io.StringIO("\n".join(lines) + "\n"),
+        chunk_size=10,
+        parallel=3,
+        progress=progress,
+    )
+
+    assert [job["Count"] for job in jobs] == [10, 10, 5]
+    assert {job["Status"] for job in jobs} == {"Completed"}
+    assert progress.count == 25
+    assert client.contact.count(filters={"ContactsList": list_id}) == 25
+
+
+def test_command_line(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Test the export and import subcommands against a mock server."""
+    monkeypatch.setenv("MJ_APIKEY_PUBLIC", "key")
+    monkeypatch.setenv("MJ_APIKEY_PRIVATE", "secret")
+    source = tmp_path / "contacts.csv"
+    source.write_text("email\na@example.com\nb@example.com\n", encoding="utf-8")
+    exported = tmp_path / "contacts.jsonl"
+
+    with MockMailjetServer(MockMailjet(credentials=("key", "secret"))) as server:
+        list_id = server.mock.seed("contactslist", [{"Name": "CLI"}])[0]["ID"]
+        args = ["--api-url", server.url]
+        assert main([*args, "import", str(list_id), str(source)]) == 0
+        assert main([*args, "export", "contact", "-o", str(exported)]) == 0
+        assert main([*args, "--quiet", "export", "nosuchresource"]) == 1
+
+    assert len(exported.read_text(encoding="utf-8").splitlines()) == 2
+    err = capsys.readouterr().err
+    assert "2 rows imported" in err
+    assert "1 import jobs, 0 failed: 2 contacts imported" in err
+    assert "HTTP 404" in err
@@ -5,6 +5,9 @@ import glob
 import json
 import os
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -15,6 +18,7 @@ from _pytest.logging import LogCaptureFixture
 from mailjet_rest.utils.version import get_version
 from mailjet_rest import Client
 from mailjet_rest.client import prepare_url, parse_response, logging_handler, Config
+from mailjet_rest.utils.singleflight import SingleFlight
 
 
 def debug_entries() -> tuple[str, str, str, str, str, str, str]:
@@ -565,3 +569,101 @@ def test_debug_logging_to_log_file(
         print(f"Removing log file {log_file}...")
         Path(log_file_path).unlink()
         print(f"The log file {log_file} has been removed.")
+
+
+# ======= TEST REQUEST COALESCING ========
+
+
+def test_concurrent_identical_gets_are_coalesced(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that concurrent identical GET requests share a single API call.
+
+    The patched `api_call` blocks until every worker thread has entered `_get`,
+    so all of them overlap with the first in-flight call.
+
+    Parameters:
+    monkeypatch (pytest.MonkeyPatch): A fixture for patching `api_call`.
+    """
+    workers = 8
+    calls: list[str] = []
+    entered = threading.Semaphore(0)
+    release = threading.Event()
+    original_do = SingleFlight.do
+
+    def counting_do(self: SingleFlight, key: Any, func: Any) -> Any:
+        entered.release()
+        return original_do(self, key, func)
+
+    def fake_api_call(auth: Any, method: str, url: str, **kwargs: Any) -> str:
+        calls.append(url)
+        release.wait(timeout=5)
+        return f"response for {url}"
+
+    monkeypatch.setattr(SingleFlight, "do", counting_do)
+    monkeypatch.setattr("mailjet_rest.client.api_call", fake_api_call)
+    client = Client(auth=("key", "secret"), coalesce_gets=True)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(client.template.get, id="42", filters={"Limit": 1})
+            for _ in range(workers)
+        ]
+        for _ in range(workers):
+            entered.acquire(timeout=5)
+        time.sleep(0.05)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert len(calls) == 1
+    assert results == [results[0]] * workers
+    assert client.coalescer is not None
+    assert client.coalescer.stats == {
+        "executed": 1,
+        "coalesced": workers - 1,
+        "in_flight": 0,
+    }
+
+
+def test_different_gets_are_not_coalesced(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that GET requests with different filters or credentials are not shared.
+
+    Parameters:
+    monkeypatch (pytest.MonkeyPatch): A fixture for patching `api_call`.
+    """
+    monkeypatch.setattr(
+        "mailjet_rest.client.api_call",
+        lambda auth, method, url, **kwargs: (auth, kwargs["filters"]),
+    )
+    client = Client(auth=("key", "secret"), coalesce_gets=True)
+    assert client.sender.get(filters={"Limit": 1}) == (("key", "secret"), {"Limit": 1})
+    assert client.sender.get(filters={"Limit": 2}) == (("key", "secret"), {"Limit": 2})
+    assert client.coalescer is not None
+    assert client.coalescer.stats["executed"] == 2
+    assert client.coalescer.stats["coalesced"] == 0
+
+
+def test_coalescing_is_disabled_by_default() -> None:
+    """Test that a client does not coalesce requests unless asked to."""
+    client = Client(auth=("key", "secret"))
+    assert client.coalescer is None
+    assert client.contact._coalescer is None
+
+
+def test_single_flight_propagates_errors_to_waiters() -> None:
+    """Test that every coalesced caller receives the exception of the shared call."""
+    flight = SingleFlight()
+    started = threading.Event()
+
+    def failing() -> None:
+        started.set()
+        time.sleep(0.05)
+        raise ValueError("boom")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(flight.do, "key", failing)
+        started.wait(timeout=5)
+        follower = executor.submit(flight.do, "key", failing)
+        for future in (leader, follower):
+            with pytest.raises(ValueError):
+                future.result()
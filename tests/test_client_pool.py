@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from typing import Any
+from typing import Iterator
+
+import pytest
+
+from mailjet_rest import Client
+
+
+class ConnectionCounter:
+    """Track the connections accepted by the stand-in server."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.opened = 0
+        self.open = 0
+        self.peak = 0
+        self.requests = 0
+
+    def connect(self) -> None:
+        with self.lock:
+            self.opened += 1
+            self.open += 1
+            self.peak = max(self.peak, self.open)
+
+    def disconnect(self) -> None:
+        with self.lock:
+            self.open -= 1
+
+
+def make_handler(counter: ConnectionCounter) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def setup(self) -> None:
+            super().setup()
+            counter.connect()
+
+        def finish(self) -> None:
+            super().finish()
+            counter.disconnect()
+
+        def do_GET(self) -> None:
+            with counter.lock:
+                counter.requests += 1
+            body = json.dumps({"Count": 1, "Data": [{"ID": 1}], "Total": 1}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return Handler
+
+
+@pytest.fixture
+def stand_in_server() -> Iterator[tuple[str, ConnectionCounter]]:
+    """Run a local HTTP/1.1 keep-alive server and yield its URL and counters."""
+    counter = ConnectionCounter()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(counter))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/", counter
+    server.shutdown()
+    server.server_close()
+
+
+def wait_for(predicate: Any, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_shared_client_reuses_a_bounded_pool(
+    stand_in_server: tuple[str, ConnectionCounter],
+) -> None:
+    """Hammer a shared client from many threads and check connection usage.
+
+    With a blocking pool of four connections, 32 threads issuing 800 requests
+    in total must never have more than four connections open, and closing the
+    client must release all of them.
+    """
+    api_url, counter = stand_in_server
+    client = Client(
+        auth=("key", "secret"),
+        api_url=api_url,
+        pool_maxsize=4,
+        pool_block=True,
+    )
+
+    def worker(_: int) -> list[int]:
+        return [client.contact.get(id="1").status_code for _ in range(25)]
+
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        statuses = [s for batch in executor.map(worker, range(32)) for s in batch]
+
+    assert statuses == [200] * 800
+    assert counter.requests == 800
+    assert counter.peak <= 4
+    assert counter.opened <= 4
+
+    client.close()
+    assert wait_for(lambda: counter.open == 0)
+
+
+def test_client_context_manager_closes_connections(
+    stand_in_server: tuple[str, ConnectionCounter],
+) -> None:
+    """Test that leaving the client context releases its pooled connections."""
+    api_url, counter = stand_in_server
+    with Client(auth=("key", "secret"), api_url=api_url) as client:
+        assert client.contact.get().json()["Count"] == 1
+        assert counter.open == 1
+    assert wait_for(lambda: counter.open == 0)
+
+
+def test_pool_options_are_applied_to_the_adapter() -> None:
+    """Test that the pool sizing options reach the underlying HTTP adapter."""
+    client = Client(pool_connections=3, pool_maxsize=7, pool_block=True)
+    adapter = client.session.get_adapter("https://api.mailjet.com/")
+    assert adapter._pool_connections == 3
+    assert adapter._pool_maxsize == 7
+    assert adapter._pool_block is True
+    client.close()
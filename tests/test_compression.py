@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from typing import Any
+from typing import Iterator
+
+import pytest
+
+from mailjet_rest import Client
+from mailjet_rest.transport import InMemoryRequest
+from mailjet_rest.transport import InMemoryTransport
+
+
+def large_batch() -> dict[str, Any]:
+    html = "<h3>Dear passenger, welcome to Mailjet!</h3>" * 50
+    return {
+        "Messages": [
+            {"To": [{"Email": f"passenger{i}@mailjet.com"}], "HTMLPart": html}
+            for i in range(20)
+        ],
+    }
+
+
+@pytest.fixture
+def echo_transport() -> InMemoryTransport:
+    """Provide a transport that decodes and echoes the received body."""
+    transport = InMemoryTransport(record=True)
+
+    @transport.route("POST", "/{version}/send")
+    def send(request: InMemoryRequest) -> dict[str, Any]:
+        body = request.body or b""
+        if request.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        return {"Received": len(json.loads(body)["Messages"])}
+
+    return transport
+
+
+def test_large_bodies_are_gzipped(echo_transport: InMemoryTransport) -> None:
+    """Test that bodies above the threshold are compressed and accounted for."""
+    client = Client(
+        auth=("key", "secret"),
+        version="v3.1",
+        transport=echo_transport,
+        compress_min_size=1024,
+    )
+    result = client.send.create(data=large_batch())
+
+    assert result.json() == {"Received": 20}
+    request = echo_transport.requests[-1]
+    assert request.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" not in request.headers
+    assert client.compression_stats is not None
+    stats = client.compression_stats.as_dict()
+    assert stats["requests_compressed"] == 1
+    assert stats["request_bytes_sent"] == len(request.body or b"")
+    assert stats["request_bytes_saved"] > stats["request_bytes_sent"]
+
+
+def test_small_bodies_are_sent_as_is(echo_transport: InMemoryTransport) -> None:
+    """Test that bodies below the threshold are not compressed."""
+    client = Client(version="v3.1", transport=echo_transport, compress_min_size=1024)
+    client.send.create(data={"Messages": []})
+
+    assert "Content-Encoding" not in echo_transport.requests[-1].headers
+    assert client.compression_stats is not None
+    assert client.compression_stats.requests_compressed == 0
+
+
+def test_only_allowed_endpoints_are_compressed(
+    echo_transport: InMemoryTransport,
+) -> None:
+    """Test that bodies sent to other endpoints are never compressed."""
+
+    @echo_transport.route("POST", "/{version}/REST/template")
+    def template(request: InMemoryRequest) -> dict[str, Any]:
+        return {"Data": []}
+
+    client = Client(transport=echo_transport, compress_min_size=16)
+    client.template.create(data={"Name": "x" * 2048})
+    assert "Content-Encoding" not in echo_transport.requests[-1].headers
+
+    client = Client(
+        transport=echo_transport,
+        compress_min_size=16,
+        compress_endpoints={"template"},
+    )
+    client.template.create(data={"Name": "x" * 2048})
+    assert echo_transport.requests[-1].headers["Content-Encoding"] == "gzip"
+
+
+def test_compression_is_disabled_by_default(echo_transport: InMemoryTransport) -> None:
+    """Test that clients do not compress bodies unless asked to."""
+    client = Client(version="v3.1", transport=echo_transport)
+    client.send.create(data=large_batch())
+
+    assert client.compression_stats is None
+    assert "Content-Encoding" not in echo_transport.requests[-1].headers
+
+
+@pytest.fixture
+def gzip_server() -> Iterator[str]:
+    """Run a local server answering every GET with a gzipped JSON body."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:
+            payload = json.dumps({"Data": [{"Name": "x" * 50}] * 100}).encode()
+            body = gzip.compress(payload)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_compressed_responses_are_decoded_and_counted(gzip_server: str) -> None:
+    """Test that gzipped responses are transparently decoded and accounted for."""
+    with Client(api_url=gzip_server, compress_min_size=1024) as client:
+        result = client.contact.get()
+        assert len(result.json()["Data"]) == 100
+        assert client.compression_stats is not None
+        stats = client.compression_stats.as_dict()
+    assert stats["responses_compressed"] == 1
+    assert stats["response_bytes_decoded"] == len(result.content)
+    assert 0 < stats["response_bytes_wire"] < stats["response_bytes_decoded"]
+
+
+def test_pre_encoded_bodies_are_gzipped(echo_transport: InMemoryTransport) -> None:
+    """Test that memoryview bodies are compressed like bytes bodies."""
+    client = Client(version="v3.1", transport=echo_transport, compress_min_size=1024)
+    payload = json.dumps(large_batch()).encode()
+
+    result = client.send.create(data=memoryview(payload))
+
+    assert result.json() == {"Received": 20}
+    assert echo_transport.requests[-1].headers["Content-Encoding"] == "gzip"
+    assert client.compression_stats is not None
+    assert client.compression_stats.request_bytes_raw == len(payload)
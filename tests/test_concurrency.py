@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+import pytest
+import requests
+
+from mailjet_rest import Client
+from mailjet_rest.client import ApiError
+from mailjet_rest.client import ApiRateLimitError
+from mailjet_rest.client import CriticalApiError
+from mailjet_rest.client import DoesNotExistError
+from mailjet_rest.client import ValidationError
+from mailjet_rest.concurrency import AdaptiveTransport
+from mailjet_rest.concurrency import AIMDLimiter
+from mailjet_rest.concurrency import map_adaptive
+from mailjet_rest.transport import InMemoryRequest
+from mailjet_rest.transport import InMemoryTransport
+from mailjet_rest.transport import make_response
+
+
+def complete(limiter: AIMDLimiter, status_code: int = 200) -> None:
+    with limiter.slot() as slot:
+        slot.record(make_response(status_code, {}))
+
+
+def test_limit_grows_while_healthy() -> None:
+    """Test the additive increase of about one request per round."""
+    limiter = AIMDLimiter(initial_limit=2, max_limit=5)
+    for _ in range(2 + 3):
+        complete(limiter)
+    assert limiter.limit == 3
+    for _ in range(100):
+        complete(limiter)
+    assert limiter.limit == 5
+    assert limiter.stats["increases"] == 3
+
+
+def test_overload_backs_off_once_per_burst() -> None:
+    """Test that a burst of 429s from concurrent requests halves the limit once."""
+    limiter = AIMDLimiter(initial_limit=8)
+    slots = [limiter.acquire() for _ in range(8)]
+    assert limiter.acquire(timeout=0) is None
+    for slot in slots:
+        assert slot is not None
+        slot.record(make_response(429, {}))
+        limiter.release(slot)
+    assert limiter.limit == 4
+    assert limiter.decreases == 1
+
+    complete(limiter, 503)
+    assert limiter.limit == 2
+    complete(limiter, 500)
+    complete(limiter, 500)
+    assert limiter.limit == 1
+
+
+def test_errors_are_classified() -> None:
+    """Test that network errors back off and unrelated errors do not."""
+    limiter = AIMDLimiter(initial_limit=4)
+    with pytest.raises(ValueError), limiter.slot():
+        raise ValueError
+    assert limiter.limit == 4
+    with pytest.raises(requests.exceptions.ConnectionError), limiter.slot():
+        raise requests.exceptions.ConnectionError
+    assert limiter.limit == 2
+    assert limiter.in_flight == 0
+
+
+def test_api_errors_are_classified_by_status() -> None:
+    """Test that client errors keep the limit, and 429, 5xx and wrapped network errors back off."""
+    limiter = AIMDLimiter(initial_limit=16)
+    for error in (
+        ValidationError("bad", status_code=400),
+        DoesNotExistError("missing", status_code=404),
+        ApiError("unknown"),
+    ):
+        with pytest.raises(ApiError), limiter.slot():
+            raise error
+    assert limiter.limit == 16
+    for error in (
+        ApiRateLimitError("slow down", status_code=429),
+        CriticalApiError("down", status_code=503),
+        ApiError(requests.exceptions.ConnectionError("reset")),
+    ):
+        with pytest.raises(ApiError), limiter.slot():
+            raise error
+        time.sleep(0.001)
+    assert limiter.limit == 2
+
+
+def test_slow_responses_do_not_grow_the_limit(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that completions above the latency target hold the limit."""
+    now = [0.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    limiter = AIMDLimiter(initial_limit=2, latency_target=0.5)
+    for _ in range(10):
+        with limiter.slot():
+            now[0] += 1
+    assert limiter.limit == 2
+
+
+def test_map_adaptive_converges_below_server_capacity() -> None:
+    """Test a bulk run against a server rejecting more than 6 concurrent requests."""
+    lock = threading.Lock()
+    state = {"active": 0, "rejected": 0}
+    transport = InMemoryTransport()
+
+    @transport.route("POST", "/v3.1/send")
+    def send(request: InMemoryRequest) -> Any:
+        with lock:
+            state["active"] += 1
+            overloaded = state["active"] > 6
+            state["rejected"] += overloaded
+        time.sleep(0.002)
+        with lock:
+            state["active"] -= 1
+        if overloaded:
+            return 429, {"ErrorMessage": "Too Many Requests"}
+        return {"Messages": [{"Status": "success"}]}
+
+    limiter = AIMDLimiter(initial_limit=2, max_limit=32)
+    client = Client(auth=("key", "secret"), version="v3.1", transport=transport)
+    results = map_adaptive(
+        lambda i: client.send.create(data={"Messages": [{"CustomID": str(i)}]}),
+        range(300),
+        limiter,
+    )
+
+    assert len(results) == 300
+    assert limiter.stats["decreases"] >= 1
+    assert limiter.limit <= 16
+    assert limiter.in_flight == 0
+    assert sum(r.status_code == 200 for r in results) == 300 - state["rejected"]
+
+
+def test_adaptive_transport_gates_client_requests() -> None:
+    """Test that the adaptive transport feeds response statuses to its limiter."""
+    transport = InMemoryTransport()
+    transport.add_route("GET", "/v3/REST/contact", lambda request: (503, None))
+    adaptive = AdaptiveTransport(transport, AIMDLimiter(initial_limit=8))
+    client = Client(auth=("key", "secret"), transport=adaptive)
+
+    assert client.contact.get().status_code == 503
+    assert adaptive.limiter.limit == 4
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+
+import pytest
+
+from mailjet_rest.client import ApiError
+from mailjet_rest.contact_index import ContactIndex
+
+
+class FakeResponse:
+    """A minimal stand-in for `requests.Response`."""
+
+    def __init__(self, payload: dict[str, Any], status_code: int = 200) -> None:
+        self.status_code = status_code
+        self._payload = payload
+
+    def json(self) -> dict[str, Any]:
+        return self._payload
+
+
+class FakeEndpoint:
+    """Serve records with Limit, Offset, Sort and lookups by email."""
+
+    def __init__(self, records: list[dict[str, Any]]) -> None:
+        self.records = records
+        self.calls: list[dict[str, Any]] = []
+
+    def get_many(self, filters: dict[str, Any] | None = None, **kwargs: Any) -> FakeResponse:
+        filters = dict(filters or {})
+        self.calls.append(filters)
+        records = sorted(
+            self.records,
+            key=lambda r: r["ID"],
+            reverse=filters.get("Sort") == "ID DESC",
+        )
+        offset, limit = filters.get("Offset", 0), filters.get("Limit", 10)
+        data = records[offset : offset + limit]
+        return FakeResponse({"Count": len(data), "Data": data})
+
+    def get(self, id: str | None = None, **kwargs: Any) -> FakeResponse:
+        data = [r for r in self.records if r.get("Email") == id]
+        return FakeResponse({"Count": len(data), "Data": data}, 200 if data else 404)
+
+
+class FakeClient:
+    def __init__(self, contacts: list[dict[str, Any]]) -> None:
+        self.contact = FakeEndpoint(contacts)
+        self.contactdata = FakeEndpoint(
+            [
+                {"ID": c["ID"], "ContactID": c["ID"], "Data": [{"Name": "age", "Value": c["ID"]}]}
+                for c in contacts
+            ]
+        )
+
+
+def make_contacts(start: int, stop: int) -> list[dict[str, Any]]:
+    return [{"ID": i, "Email": f"User{i}@Example.com"} for i in range(start, stop)]
+
+
+def test_load_mirrors_contacts_and_properties() -> None:
+    """Test that a full load stores contacts and their properties."""
+    index = ContactIndex(FakeClient(make_contacts(1, 8)), page_size=3)  # type: ignore[arg-type]
+    assert index.load() == 7
+    assert index.lookup("user5@example.com") == 5
+    assert index.lookup(" USER5@EXAMPLE.COM ") == 5
+    assert index.lookup("nobody@example.com") is None
+    assert index.properties(5) == {"age": 5}
+    assert index.contact("user2@example.com") == {"ID": 2, "Email": "User2@Example.com"}
+    index.close()
+
+
+def test_failed_load_keeps_the_previous_mirror() -> None:
+    """Test that a reload failing halfway leaves the previous mirror intact."""
+    client = FakeClient(make_contacts(1, 8))
+    index = ContactIndex(client, page_size=3)  # type: ignore[arg-type]
+    index.load()
+    client.contact.records = make_contacts(1, 20)
+    get_many = client.contactdata.get_many
+
+    def failing_get_many(filters: dict[str, Any] | None = None, **kwargs: Any) -> FakeResponse:
+        if (filters or {}).get("Offset"):
+            return FakeResponse({}, 500)
+        return get_many(filters, **kwargs)
+
+    client.contactdata.get_many = failing_get_many  # type: ignore[method-assign]
+    with pytest.raises(ApiError):
+        index.load()
+    assert len(index) == 7
+    assert index.lookup("user12@example.com") is None
+    assert index.properties(5) == {"age": 5}
+
+    client.contactdata.get_many = get_many  # type: ignore[method-assign]
+    assert index.load() == 19
+    index.close()
+
+
+def test_lookups_see_the_previous_mirror_during_a_load() -> None:
+    """Test that the mirror is swapped in only once every page is fetched."""
+    client = FakeClient(make_contacts(1, 8))
+    index = ContactIndex(client, page_size=3)  # type: ignore[arg-type]
+    index.load()
+    client.contact.records = make_contacts(1, 4) + make_contacts(10, 14)
+    seen: list[int | None] = []
+    get_many = client.contactdata.get_many
+
+    def observing_get_many(filters: dict[str, Any] | None = None, **kwargs: Any) -> FakeResponse:
+        seen.append(index.lookup("user5@example.com"))
+        return get_many(filters, **kwargs)
+
+    client.contactdata.get_many = observing_get_many  # type: ignore[method-assign]
+    assert index.load() == 7
+    assert seen
+    assert set(seen) == {5}
+    assert index.lookup("user5@example.com") is None
+    assert index.lookup("user12@example.com") == 12
+    index.close()
+
+
+def test_refresh_only_fetches_new_contacts() -> None:
+    """Test that a refresh stops at the first already known contact."""
+    client = FakeClient(make_contacts(1, 21))
+    index = ContactIndex(client, page_size=5)  # type: ignore[arg-type]
+    index.load()
+    client.contact.records += make_contacts(21, 24)
+    client.contact.calls.clear()
+
+    assert index.refresh() == 3
+    assert len(client.contact.calls) == 1
+    assert client.contact.calls[0]["Sort"] == "ID DESC"
+    assert index.lookup("user23@example.com") == 23
+    assert len(index) == 23
+    index.close()
+
+
+def test_resolve_falls_back_to_the_api() -> None:
+    """Test that a local miss is resolved through the API and cached."""
+    client = FakeClient(make_contacts(1, 3))
+    index = ContactIndex(client)  # type: ignore[arg-type]
+    assert index.resolve("User2@Example.com") == 2
+    assert index.lookup("user2@example.com") == 2
+    assert index.resolve("missing@example.com") is None
+    index.close()
+
+
+def test_background_refresh_picks_up_new_contacts() -> None:
+    """Test that the background thread refreshes the mirror periodically."""
+    client = FakeClient(make_contacts(1, 3))
+    index = ContactIndex(client)  # type: ignore[arg-type]
+    index.load()
+    client.contact.records += make_contacts(3, 4)
+    index.start_background_refresh(interval=0.01)
+    deadline = time.monotonic() + 5
+    while index.lookup("user3@example.com") is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    index.close()
+    assert index._thread is None
+    assert client.contact.calls
+
+
+def test_background_reload_picks_up_changes() -> None:
+    """Test that periodic full reloads pick up edits and deletions."""
+    client = FakeClient(make_contacts(1, 4))
+    index = ContactIndex(client)  # type: ignore[arg-type]
+    index.load()
+    client.contact.records = [c for c in client.contact.records if c["ID"] != 2]
+    client.contactdata.records[0]["Data"] = [{"Name": "age", "Value": 40}]
+    index.refresh()
+    assert index.lookup("user2@example.com") == 2
+    assert index.properties(1) == {"age": 1}
+
+    index.start_background_refresh(interval=0.01, reload_interval=0)
+    deadline = time.monotonic() + 5
+    while index.lookup("user2@example.com") is not None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    index.stop_background_refresh()
+    assert index.lookup("user2@example.com") is None
+    assert index.properties(1) == {"age": 40}
+    index.close()
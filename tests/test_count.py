@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+import pytest
+
+from mailjet_rest import Client
+from mailjet_rest.client import ApiError
+from mailjet_rest.transport import InMemoryRequest
+from mailjet_rest.transport import InMemoryTransport
+from mailjet_rest.utils.ttl_cache import TTLCache
+
+
+@pytest.fixture
+def transport() -> InMemoryTransport:
+    """Provide a transport answering count-only contact requests."""
+    transport = InMemoryTransport(record=True)
+
+    @transport.route("GET", "/v3/REST/contact")
+    def list_contacts(request: InMemoryRequest) -> Any:
+        if request.query.get("ContactsList") == "missing":
+            return 400, {"ErrorMessage": "Invalid ContactsList"}
+        total = 1234 if "ContactsList" in request.query else 5678
+        if request.query.get("countOnly") == "1":
+            return {"Count": total, "Data": [], "Total": total}
+        return {"Count": 1, "Data": [{"ID": 1}], "Total": total}
+
+    return transport
+
+
+def test_count_uses_count_only_mode(transport: InMemoryTransport) -> None:
+    """Test that count() asks for the total only and returns it as an int."""
+    client = Client(auth=("key", "secret"), transport=transport)
+
+    assert client.contact.count(filters={"ContactsList": "12"}) == 1234
+    assert transport.requests[-1].query == {"ContactsList": "12", "countOnly": "1"}
+    assert client.contact.count() == 5678
+
+
+def test_count_is_not_cached_by_default(transport: InMemoryTransport) -> None:
+    """Test that every count() call reaches the API unless caching is enabled."""
+    client = Client(auth=("key", "secret"), transport=transport)
+    client.contact.count()
+    client.contact.count()
+    assert len(transport.requests) == 2
+    assert client.count_cache is None
+
+
+def test_count_cache_expires(
+    transport: InMemoryTransport,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that cached totals are reused until their TTL elapses."""
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    client = Client(auth=("key", "secret"), transport=transport, count_cache_ttl=30)
+
+    assert client.contact.count(filters={"ContactsList": "12"}) == 1234
+    assert client.contact.count(filters={"ContactsList": "12"}) == 1234
+    assert client.contact.count() == 5678
+    assert len(transport.requests) == 2
+
+    assert client.contact.count(filters={"ContactsList": "12"}, use_cache=False) == 1234
+    assert len(transport.requests) == 3
+
+    now[0] += 31
+    client.contact.count(filters={"ContactsList": "12"})
+    assert len(transport.requests) == 4
+
+
+def test_count_raises_on_errors(transport: InMemoryTransport) -> None:
+    """Test that failed count requests raise instead of returning zero."""
+    client = Client(auth=("key", "secret"), transport=transport, count_cache_ttl=30)
+    with pytest.raises(ApiError):
+        client.contact.count(filters={"ContactsList": "missing"})
+    assert client.count_cache is not None
+    assert len(client.count_cache) == 0
+
+
+def test_acount(transport: InMemoryTransport) -> None:
+    """Test the coroutine variant of count()."""
+    client = Client(auth=("key", "secret"), transport=transport)
+    assert asyncio.run(client.contact.acount(filters={"ContactsList": "1"})) == 1234
+
+
+def test_ttl_cache_evicts_least_recently_used() -> None:
+    """Test that a full cache drops its least recently used entry."""
+    cache = TTLCache(ttl=60, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert (cache.hits, cache.misses) == (3, 1)
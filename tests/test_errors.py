@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+import requests
+
+from mailjet_rest import Client
+from mailjet_rest.client import ApiError
+from mailjet_rest.client import ApiRateLimitError
+from mailjet_rest.client import AuthorizationError
+from mailjet_rest.client import CriticalApiError
+from mailjet_rest.client import DoesNotExistError
+from mailjet_rest.client import ValidationError
+from mailjet_rest.client import error_from_response
+from mailjet_rest.client import parse_response
+from mailjet_rest.transport import InMemoryTransport
+from mailjet_rest.transport import make_response
+
+
+def no_log() -> Any:
+    raise AssertionError
+
+
+@pytest.mark.parametrize(
+    ("status_code", "error_type"),
+    [
+        (400, ValidationError),
+        (401, AuthorizationError),
+        (404, DoesNotExistError),
+        (429, ApiRateLimitError),
+        (503, CriticalApiError),
+        (418, ApiError),
+    ],
+)
+def test_status_codes_map_to_error_types(
+    status_code: int,
+    error_type: type[ApiError],
+) -> None:
+    """Test the dispatch of status codes to exception types."""
+    response = make_response(
+        status_code,
+        {
+            "ErrorInfo": "info",
+            "ErrorMessage": "Something failed",
+            "StatusCode": status_code,
+        },
+    )
+    with pytest.raises(error_type) as excinfo:
+        parse_response(response, no_log, raise_errors=True)
+
+    assert type(excinfo.value) is error_type
+    assert excinfo.value.status_code == status_code
+    assert excinfo.value.error_message == "Something failed"
+    assert excinfo.value.error_info == "info"
+    assert str(excinfo.value) == f"HTTP {status_code}: Something failed"
+    assert excinfo.value.retryable is (status_code in {429, 503})
+
+
+def test_send_api_errors_and_retry_hint() -> None:
+    """Test the v3.1 error details and the Retry-After hint."""
+    body = {
+        "Messages": [
+            {
+                "Status": "error",
+                "Errors": [
+                    {
+                        "ErrorCode": "send-0003",
+                        "ErrorMessage": 'At least "HTMLPart" or "TextPart" is required.',
+                        "ErrorRelatedTo": ["HTMLPart", "TextPart"],
+                        "StatusCode": 400,
+                    },
+                ],
+            },
+        ],
+    }
+    error = error_from_response(make_response(400, body))
+    assert isinstance(error, ValidationError)
+    assert error.errors[0]["ErrorCode"] == "send-0003"
+    assert error.error_message is not None
+    assert error.error_message.startswith("At least")
+
+    throttled = error_from_response(make_response(429, None, {"Retry-After": "7"}))
+    assert throttled.retry_after == 7.0
+    assert str(throttled) == "HTTP 429: Unknown error"
+    past = error_from_response(
+        make_response(503, "<html>", {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}),
+    )
+    assert past.retry_after == 0.0
+    assert past.error_message is None
+
+
+def test_bodies_are_decoded_only_when_needed() -> None:
+    """Test that 204, empty and DELETE responses are not decoded in raise_errors mode."""
+    assert parse_response(make_response(204), no_log, raise_errors=True) is None
+    request = requests.Request(
+        "DELETE",
+        "https://api.mailjet.com/v3/REST/contact/1",
+    ).prepare()
+    deleted = make_response(200, b"not json", request=request)
+    assert parse_response(deleted, no_log, raise_errors=True) is None
+    assert parse_response(make_response(200, {"Count": 0}), no_log) == {"Count": 0}
+    with pytest.raises(DoesNotExistError):
+        parse_response(make_response(404, b"not json"), no_log, raise_errors=True)
+
+
+def test_bodies_are_always_decoded_by_default() -> None:
+    """Test that the default mode still returns the body of a DELETE response."""
+    request = requests.Request(
+        "DELETE",
+        "https://api.mailjet.com/v3/REST/contact/1",
+    ).prepare()
+    deleted = make_response(200, {"Count": 1}, request=request)
+    assert parse_response(deleted, no_log) == {"Count": 1}
+    assert parse_response(deleted, no_log, raise_errors=True) is None
+
+
+def test_client_raise_errors_mode() -> None:
+    """Test that endpoint methods raise typed errors in raise_errors mode."""
+    transport = InMemoryTransport()
+    transport.add_route(
+        "GET",
+        "/v3/REST/contact/{id}",
+        lambda request: (404, {"ErrorMessage": "Object not found"}),
+    )
+    transport.add_route("DELETE", "/v3/REST/contact/{id}", lambda request: (204, None))
+    transport.add_route("GET", "/v3/REST/contact", lambda request: (401, None))
+
+    lenient = Client(auth=("key", "secret"), transport=transport)
+    assert lenient.contact.get(id=1).status_code == 404
+
+    strict = Client(auth=("key", "secret"), transport=transport, raise_errors=True)
+    with pytest.raises(DoesNotExistError, match="Object not found"):
+        strict.contact.get(id=1)
+    with pytest.raises(DoesNotExistError):
+        asyncio.run(strict.contact.aget(id=1))
+    assert strict.contact.delete(id=1).status_code == 204
+    with pytest.raises(AuthorizationError):
+        lenient.contact.count()
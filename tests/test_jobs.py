@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from mailjet_rest.client import ApiError
+from mailjet_rest.utils.jobs import job_error
+from mailjet_rest.utils.jobs import run_job
+
+
+class FakeResponse:
+    """A minimal stand-in for `requests.Response`."""
+
+    def __init__(self, status_code: int, data: dict[str, Any] | None = None) -> None:
+        self.status_code = status_code
+        self.text = "" if data else "Server error"
+        self._data = data
+
+    def json(self) -> dict[str, Any]:
+        return {"Data": [self._data]}
+
+
+def test_run_job_polls_until_a_final_status() -> None:
+    """Test that a job is polled until it completes and then recorded."""
+    statuses = iter(["In Progress", "Completed"])
+    polled: list[Any] = []
+
+    def status(job_id: Any) -> FakeResponse:
+        polled.append(job_id)
+        return FakeResponse(200, {"JobID": job_id, "Status": next(statuses)})
+
+    jobs: list[dict[str, Any]] = []
+    job = run_job(
+        lambda: FakeResponse(201, {"JobID": 3, "Status": "Pending"}),
+        status,
+        "addforce job",
+        poll_interval=0,
+        fields={"Action": "addforce"},
+        jobs=jobs,
+    )
+    assert job == {"Action": "addforce", "JobID": 3, "Status": "Completed"}
+    assert jobs == [job]
+    assert polled == [3, 3]
+    assert job_error(job) is None
+
+
+def test_run_job_records_jobs_whose_polling_fails() -> None:
+    """Test that a failed status request raises after the job is recorded."""
+    jobs: list[dict[str, Any]] = []
+    with pytest.raises(ApiError, match="addforce job status failed: HTTP 500"):
+        run_job(
+            lambda: FakeResponse(201, {"JobID": 3, "Status": "Pending"}),
+            lambda _: FakeResponse(500),
+            "addforce job",
+            poll_interval=0,
+            jobs=jobs,
+        )
+    assert jobs == [{"JobID": 3, "Status": "Pending"}]
+    assert job_error({"JobID": 3, "Status": "Abort"}) == "Job 3: Abort"
+    assert job_error({"JobID": 3, "Status": "Completed", "Error": "Bad"}) == (
+        "Job 3: Completed Bad"
+    )
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import pytest
+
+from mailjet_rest import Client
+from mailjet_rest.reconcile import DigestSet
+from mailjet_rest.reconcile import ListReconciler
+from mailjet_rest.reconcile import email_digest
+from mailjet_rest.testing import MockMailjet
+
+
+@pytest.fixture
+def mock() -> MockMailjet:
+    mock = MockMailjet()
+    contacts = mock.seed(
+        "contact",
+        [{"Email": f"c{i}@example.com"} for i in range(1, 6)],
+    )
+    mock.seed("contactslist", [{"ID": 7, "Name": "Newsletter"}])
+    mock.seed(
+        "listrecipient",
+        [
+            {
+                "ContactID": contact["ID"],
+                "ListID": 7,
+                "IsUnsubscribed": contact["Email"] == "c5@example.com",
+            }
+            for contact in contacts
+        ],
+    )
+    return mock
+
+
+@pytest.fixture
+def client(mock: MockMailjet) -> Client:
+    return Client(auth=("key", "secret"), transport=mock.transport)
+
+
+def subscribed(client: Client) -> set[str]:
+    unsubscribed = {
+        r["ContactID"]
+        for r in client.listrecipient.get(
+            filters={"ContactsList": 7, "Unsub": "true"},
+        ).json()["Data"]
+    }
+    return {
+        c["Email"]
+        for c in client.contact.get(filters={"ContactsList": 7}).json()["Data"]
+        if c["ID"] not in unsubscribed
+    }
+
+
+def test_digest_set() -> None:
+    """Test that a DigestSet deduplicates and finds its values."""
+    digests = DigestSet([5, 3, 5, 2**64 - 1, 3])
+    assert len(digests) == 3
+    assert 5 in digests
+    assert 2**64 - 1 in digests
+    assert 4 not in digests
+    assert -1 not in digests
+    assert email_digest(" A@Example.com") == email_digest("a@example.com")
+    assert email_digest("a@example.com") in DigestSet.of_emails(["A@example.com"])
+
+
+def test_plan(client: Client) -> None:
+    """Test the changes computed against the current membership."""
+    plan = ListReconciler(client, 7, page_size=2).plan(
+        ["C1@example.com", "c2@example.com", "c5@example.com", "new@example.com"],
+    )
+    assert plan.members == 4
+    assert plan.unsubscribed == 1
+    assert plan.desired == 4
+    assert sorted(plan.to_add) == ["c5@example.com", "new@example.com"]
+    assert sorted(plan.to_drop) == ["c3@example.com", "c4@example.com"]
+    assert plan.unchanged == 2
+
+
+def test_reconcile_from_generator(client: Client) -> None:
+    """Test a reconciliation reading the desired addresses from a generator."""
+    desired = (f"c{i}@example.com\n" for i in (1, 2, 2, 6))
+    reconciler = ListReconciler(client, 7, add_action="addnoforce", poll_interval=0)
+    result = reconciler.reconcile(desired)
+    assert result.plan.to_add == ["c6@example.com"]
+    assert [job["Action"] for job in result.jobs] == ["addnoforce", "remove"]
+    assert all(job["Status"] == "Completed" for job in result.jobs)
+    assert not result.failed
+    assert subscribed(client) == {"c1@example.com", "c2@example.com", "c6@example.com"}
+
+
+def test_reconcile_unsubscribes(client: Client) -> None:
+    """Test dropping members by unsubscribing them, in several jobs."""
+    reconciler = ListReconciler(
+        client,
+        7,
+        drop_action="unsub",
+        batch_size=1,
+        poll_interval=0,
+    )
+    result = reconciler.reconcile(["c1@example.com", "c5@example.com"])
+    assert [job["Action"] for job in result.jobs] == [
+        "addforce",
+        "unsub",
+        "unsub",
+        "unsub",
+    ]
+    assert subscribed(client) == {"c1@example.com", "c5@example.com"}
+    assert (
+        ListReconciler(client, 7).plan(["c1@example.com", "c5@example.com"]).to_drop
+        == []
+    )
+
+
+def test_dry_run(client: Client) -> None:
+    """Test that a dry run does not submit any job."""
+    result = ListReconciler(client, 7).reconcile(["c1@example.com"], dry_run=True)
+    assert len(result.plan.to_drop) == 3
+    assert result.jobs == []
+    assert len(subscribed(client)) == 4
+
+
+def test_invalid_action(client: Client) -> None:
+    """Test that unsupported actions are rejected."""
+    with pytest.raises(ValueError, match="drop_action"):
+        ListReconciler(client, 7, drop_action="delete")
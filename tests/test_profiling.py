@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import asyncio
+import io
+
+from mailjet_rest import Client
+from mailjet_rest.client import parse_response
+from mailjet_rest.profiling import PHASES
+from mailjet_rest.profiling import Profiler
+from mailjet_rest.testing import MockMailjet
+
+
+def test_profile_attributes_phases_to_resources() -> None:
+    """Test the phases recorded per resource and the printed summary."""
+    mock = MockMailjet()
+    client = Client(auth=("key", "secret"), transport=mock.transport)
+    out = io.StringIO()
+
+    with client.profile(stream=out) as profiler:
+        for i in range(3):
+            client.contact.create(data={"Email": f"c{i}@example.com"})
+        parse_response(client.contact.get(), lambda: None)
+        client.contactslist.get().json()
+        assert client.contact.count() == 3
+        asyncio.run(client.contact.aget())
+
+    stats = profiler.stats
+    assert stats["endpoint", "contact"].calls == 6
+    assert stats["encode", "contact"].calls == 3
+    assert stats["url", "contact"].calls == 6
+    assert stats["network", "contact"].calls == 6
+    assert stats["parse", "contact"].calls == 2
+    assert stats["parse", "contactslist"].calls == 1
+    assert stats["network", "contactslist"].wall > 0
+    assert list(profiler.by_phase()) == list(PHASES)
+    assert stats["encode", "contact"].allocated != 0
+    summary = out.getvalue()
+    assert summary.startswith("By phase:")
+    assert "By phase and resource:" in summary
+    assert "KiB" in summary
+
+    # Requests after the block are not measured.
+    client.contact.get()
+    assert profiler.stats["network", "contact"].calls == 6
+    assert not profiler.enabled
+
+
+def test_disabled_profiler_and_ranking() -> None:
+    """Test that a disabled profiler records nothing and the ranking order."""
+    profiler = Profiler()
+    with profiler.phase("network", "contact"):
+        pass
+    assert profiler.stats == {}
+
+    profiler.start(trace_allocations=False)
+    with profiler.phase("url", "contact"):
+        pass
+    with profiler.phase("network", "contact"):
+        sum(range(100_000))
+    profiler.stop()
+
+    assert [row[:2] for row in profiler.ranked()] == [
+        ("network", "contact"),
+        ("url", "contact"),
+    ]
+    assert "KiB" not in profiler.format()
+    assert len(profiler.format(limit=1).splitlines()) == 5
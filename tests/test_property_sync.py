@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import pytest
+
+from mailjet_rest import Client
+from mailjet_rest.contact_index import ContactIndex
+from mailjet_rest.property_sync import PropertySync
+from mailjet_rest.property_sync import diff_properties
+from mailjet_rest.testing import MockMailjet
+
+
+@pytest.fixture
+def mock() -> MockMailjet:
+    mock = MockMailjet()
+    contacts = mock.seed(
+        "contact",
+        [{"Email": f"c{i}@example.com"} for i in range(1, 6)],
+    )
+    mock.seed(
+        "contactdata",
+        [
+            {
+                "ID": contact["ID"],
+                "ContactID": contact["ID"],
+                "Data": [
+                    {"Name": "plan", "Value": "free"},
+                    {"Name": "seats", "Value": 1},
+                ],
+            }
+            for contact in contacts
+        ],
+    )
+    return mock
+
+
+@pytest.fixture
+def index(mock: MockMailjet) -> ContactIndex:
+    client = Client(auth=("key", "secret"), transport=mock.transport)
+    index = ContactIndex(client, page_size=2)
+    index.load()
+    return index
+
+
+def properties(mock: MockMailjet, email: str) -> dict:
+    response = Client(auth=("k", "s"), transport=mock.transport).contactdata.get(
+        id=email,
+    )
+    return {item["Name"]: item["Value"] for item in response.json()["Data"][0]["Data"]}
+
+
+def test_diff_properties() -> None:
+    """Test that values are compared by their text."""
+    current = {"plan": "free", "seats": "1", "trial": "true"}
+    desired = {"plan": "free", "seats": 1, "trial": True, "vip": None, "name": "A"}
+    assert diff_properties(current, desired) == {"name": "A"}
+    assert diff_properties(current, {"seats": 2}) == {"seats": 2}
+
+
+def test_only_changes_are_sent_in_bulk(mock: MockMailjet, index: ContactIndex) -> None:
+    """Test a sync sending the changes of several contacts in one job."""
+    sync = PropertySync(index.client, index, poll_interval=0)
+    desired = {
+        "c1@example.com": {"plan": "free", "seats": 1},
+        "c2@example.com": {"plan": "pro", "seats": 1},
+        "C3@example.com": {"plan": "pro", "seats": 5},
+        "new@example.com": {"plan": "free"},
+    }
+    requests_before = mock.request_count
+
+    result = sync.sync(desired)
+
+    assert (result.contacts, result.unchanged, result.unknown) == (4, 1, 1)
+    assert (result.properties_sent, result.properties_skipped) == (4, 3)
+    assert len(result.jobs) == 1
+    assert result.jobs[0]["Status"] == "Completed"
+    assert result.updates == 0
+    assert result.calls_avoided == 3
+    assert not result.failed
+    # One job submission and one status request.
+    assert mock.request_count - requests_before == 2
+    assert properties(mock, "c2@example.com") == {"plan": "pro", "seats": 1}
+    assert properties(mock, "c3@example.com") == {"plan": "pro", "seats": 5}
+    assert properties(mock, "new@example.com") == {"plan": "free"}
+    assert index.properties(index.lookup("c3@example.com")) == {
+        "plan": "pro",
+        "seats": 5,
+    }
+
+    index.refresh()
+    again = sync.sync(desired)
+    assert again.unchanged == 4
+    assert again.calls == 0
+
+
+def test_small_changes_and_batches(mock: MockMailjet, index: ContactIndex) -> None:
+    """Test direct updates of small changes and the split into jobs."""
+    sync = PropertySync(index.client, index, batch_size=2, poll_interval=0)
+
+    single = sync.sync([("c1@example.com", {"seats": 3})])
+    assert (single.updates, single.jobs) == (1, [])
+    assert properties(mock, "c1@example.com")["seats"] == 3
+
+    result = sync.sync((f"c{i}@example.com", {"plan": "team"}) for i in range(1, 6))
+    assert len(result.jobs) == 2
+    assert result.updates == 1
+    assert result.calls_avoided == 2
+    assert {properties(mock, f"c{i}@example.com")["plan"] for i in range(1, 6)} == {
+        "team",
+    }
+
+
+def test_failures_are_reported(mock: MockMailjet, index: ContactIndex) -> None:
+    """Test that failed changes are reported and kept out of the snapshot."""
+    sync = PropertySync(index.client, index, poll_interval=0)
+    mock.inject(500)
+
+    result = sync.sync(
+        {"c1@example.com": {"plan": "pro"}, "c2@example.com": {"plan": "pro"}},
+    )
+
+    assert result.failed == ["c1@example.com", "c2@example.com"]
+    assert "HTTP 500" in result.errors[0]
+    assert index.properties(index.lookup("c1@example.com"))["plan"] == "free"
+    assert sync.sync({"c1@example.com": {"plan": "pro"}}).updates == 1
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import pytest
+
+from mailjet_rest import Client
+from mailjet_rest import segments
+from mailjet_rest.contact_index import ContactIndex
+from mailjet_rest.segments import BoolOp
+from mailjet_rest.segments import Comparison
+from mailjet_rest.segments import Expression
+from mailjet_rest.segments import ExpressionSyntaxError
+from mailjet_rest.segments import Not
+from mailjet_rest.segments import SegmentPreview
+from mailjet_rest.stats import ColumnTable
+from mailjet_rest.testing import MockMailjet
+
+
+NOW = 1_700_000_000.0  # 2023-11-14T22:13:20Z
+
+
+@pytest.fixture(params=["numpy", "lists"])
+def preview(
+    request: pytest.FixtureRequest,
+    monkeypatch: pytest.MonkeyPatch,
+) -> SegmentPreview:
+    if request.param == "lists":
+        monkeypatch.setattr(segments, "np", None)
+    table = ColumnTable(
+        {
+            "age": [28, "41", None, 35, "n/a"],
+            "country": ["FR", "BE", "FR", "", None],
+            "newsletter": [True, "True", "false", False, None],
+            "lastorder": [
+                "2023-11-10T10:00:00Z",
+                "2023-09-01T10:00:00Z",
+                None,
+                "2023-11-14T08:00:00",
+                "soon",
+            ],
+        },
+    )
+    return SegmentPreview(table, now=NOW)
+
+
+def test_parse() -> None:
+    """Test the syntax tree of an expression and its precedence."""
+    expression = Expression('(age<35) AND not country="FR" or Newsletter = true')
+    assert expression.root == BoolOp(
+        "or",
+        (
+            BoolOp(
+                "and",
+                (Comparison("age", "<", 35.0), Not(Comparison("country", "=", "FR"))),
+            ),
+            Comparison("Newsletter", "=", True),
+        ),
+    )
+    assert expression.properties() == {"age", "country", "Newsletter"}
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["", "(age<35", "age<", "age 35", "age<35)", "Unknown(age, 1)", "age<35 $"],
+)
+def test_syntax_errors(text: str) -> None:
+    """Test that invalid expressions are rejected."""
+    with pytest.raises(ExpressionSyntaxError):
+        Expression(text)
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("(age<35)", [True, False, False, False, False]),
+        ("age>=35", [False, True, False, True, False]),
+        ("age!=35", [True, True, False, False, False]),
+        ('country="FR"', [True, False, True, False, False]),
+        ("country<>'FR'", [False, True, False, True, True]),
+        ('country=""', [False, False, False, True, True]),
+        ("newsletter=true", [True, True, False, False, False]),
+        ("not newsletter=true", [False, False, True, True, True]),
+        ('(age<40 or age>40) and country="FR"', [True, False, False, False, False]),
+        ("IsInPreviousDays(lastorder, 7)", [True, False, False, True, False]),
+    ],
+)
+def test_mask(preview: SegmentPreview, text: str, expected: list[bool]) -> None:
+    """Test the contacts matching an expression, with and without NumPy."""
+    assert [bool(value) for value in preview.mask(text)] == expected
+    assert preview.count(text) == sum(expected)
+
+
+def test_counts(preview: SegmentPreview) -> None:
+    """Test the helpers built on the mask."""
+    assert len(preview) == 5
+    assert preview.ratio('country="FR"') == 0.4
+    assert preview.matching("age>30")["age"] == ["41", 35]
+    with pytest.raises(ExpressionSyntaxError, match="booleans"):
+        preview.count("newsletter>true")
+
+
+def test_matches() -> None:
+    """Test the evaluation of an expression for a single contact."""
+    expression = Expression('(age<35) and (country="FR" or country="BE")')
+    assert expression.matches({"age": 28, "country": "BE"})
+    assert not expression.matches({"age": 28})
+
+
+def test_preview_from_index() -> None:
+    """Test a preview over the contacts mirrored by a ContactIndex."""
+    mock = MockMailjet()
+    contacts = mock.seed(
+        "contact",
+        [{"Email": f"c{i}@example.com"} for i in range(1, 5)],
+    )
+    mock.seed(
+        "contactdata",
+        [
+            {
+                "ID": contact["ID"],
+                "ContactID": contact["ID"],
+                "Data": [{"Name": "age", "Value": age}],
+            }
+            for contact, age in zip(contacts[:3], [25, 38, 51])
+        ],
+    )
+    index = ContactIndex(Client(auth=("key", "secret"), transport=mock.transport))
+    index.load()
+    table = index.table()
+    assert table["Email"][0] == "c1@example.com"
+    assert list(table["age"]) == [25, 38, 51, None]
+    preview = SegmentPreview.from_index(index)
+    assert preview.count("(age<35)") == 1
+    assert preview.count("not (age<35)") == 3
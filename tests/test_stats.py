@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from mailjet_rest import Client
+from mailjet_rest import stats
+from mailjet_rest.stats import ColumnTable
+from mailjet_rest.stats import StatsAggregator
+from mailjet_rest.transport import InMemoryRequest
+from mailjet_rest.transport import InMemoryTransport
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    """Run a test with NumPy columns, if available, and with plain lists."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(stats, "np", None)
+    return request.param
+
+
+@pytest.fixture
+def transport() -> InMemoryTransport:
+    """Provide a transport answering the statistics resources of three campaigns."""
+    transport = InMemoryTransport(record=True)
+
+    def page(records: list[dict[str, Any]]) -> dict[str, Any]:
+        return {"Count": len(records), "Data": records, "Total": len(records)}
+
+    @transport.route("GET", "/v3/REST/statistics/link-click")
+    def link_click(request: InMemoryRequest) -> Any:
+        campaign = int(request.query["CampaignId"])
+        if campaign == 3:
+            return 500, {"ErrorMessage": "Internal error"}
+        return page(
+            [
+                {"URL": "https://mailjet.com", "ClickedCount": campaign * 10},
+                {"URL": "https://dev.mailjet.com", "ClickedCount": campaign},
+            ],
+        )
+
+    @transport.route("GET", "/v3/REST/geostatistics")
+    def geo(request: InMemoryRequest) -> Any:
+        campaign = int(request.query["CampaignID"])
+        return page(
+            [
+                {"Country": "FR", "OpenedCount": 5 * campaign, "ClickedCount": campaign},
+                {"Country": "US", "OpenedCount": 2, "ClickedCount": 0},
+            ],
+        )
+
+    @transport.route("GET", "/v3/REST/statcounters")
+    def counters(request: InMemoryRequest) -> Any:
+        assert request.query["CounterSource"] == "Campaign"
+        return page([{"SourceID": int(request.query["SourceId"]), "MessageSentCount": 100}])
+
+    return transport
+
+
+def test_reports_are_fetched_into_tables(
+    transport: InMemoryTransport,
+    backend: str,
+) -> None:
+    """Test that every report of every campaign lands in its table."""
+    aggregator = StatsAggregator(Client(auth=("key", "secret"), transport=transport))
+    report = aggregator.fetch([1, 2, 3], reports=("link_click", "geo", "counters"))
+
+    assert report.errors.keys() == {("link_click", "3")}
+    assert len(report["link_click"]) == 4
+    assert len(report["geo"]) == 6
+    assert report["counters"].sum("MessageSentCount") == 300
+
+    by_url = report["link_click"].group_sum("URL", ["ClickedCount"])
+    assert list(by_url.rows()) == [
+        {"URL": "https://mailjet.com", "ClickedCount": 30},
+        {"URL": "https://dev.mailjet.com", "ClickedCount": 3},
+    ]
+    by_campaign = report["geo"].group_sum(["CampaignID"], ["OpenedCount", "ClickedCount"])
+    assert by_campaign["CampaignID"] == ["1", "2", "3"]
+    assert list(by_campaign["OpenedCount"]) == [7, 12, 17]
+
+
+def test_column_table_helpers(backend: str) -> None:
+    """Test building, filtering, stacking and summing tables."""
+    table = ColumnTable.from_records(
+        [{"Country": "FR", "Count": 2}, {"Country": "US", "Count": 3}, {"Country": "FR"}],
+    )
+    assert table["Country"] == ["FR", "US", "FR"]
+    assert table.sum("Count") == 5
+    france = table.where(lambda row: row["Country"] == "FR")
+    assert len(france) == 2
+
+    numeric = ColumnTable({"Country": ["FR", "US"], "Count": [1.5, 2.5]})
+    assert type(numeric["Count"]).__name__ == ("ndarray" if backend == "numpy" else "list")
+    stacked = ColumnTable.concat([numeric, ColumnTable({"Country": ["DE"]})])
+    assert list(stacked.rows())[-1] == {"Country": "DE", "Count": None}
+
+    with pytest.raises(ValueError, match="same length"):
+        ColumnTable({"a": [1], "b": [1, 2]})
+
+
+def test_unknown_reports_are_rejected(transport: InMemoryTransport) -> None:
+    """Test that misspelled report names fail before any request."""
+    aggregator = StatsAggregator(Client(auth=("key", "secret"), transport=transport))
+    with pytest.raises(ValueError, match="linkclick"):
+        aggregator.fetch([1], reports=("linkclick",))
+    assert transport.requests == []
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+from typing import Any
+
+import pytest
+
+from mailjet_rest import Client
+from mailjet_rest.stats_cache import CLOSED_TTL
+from mailjet_rest.stats_cache import DEFAULT_TTLS
+from mailjet_rest.stats_cache import StatsCache
+from mailjet_rest.stats_cache import stats_ttl
+from mailjet_rest.transport import InMemoryRequest
+from mailjet_rest.transport import InMemoryTransport
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+NOW = 1_700_000_000.0
+
+
+def backend() -> tuple[InMemoryTransport, list[str]]:
+    transport = InMemoryTransport()
+    calls: list[str] = []
+
+    @transport.route("GET", "/v3/REST/{resource}")
+    def stats(request: InMemoryRequest) -> Any:
+        calls.append(request.path_params["resource"])
+        return {"Count": 1, "Data": [{"MessageSentCount": len(calls)}], "Total": 1}
+
+    return transport, calls
+
+
+def test_ttl_depends_on_period_and_resolution() -> None:
+    """Test the TTL of closed periods and of open ones per resolution."""
+    closed = {"ToTS": str(int(NOW - 3 * 86400)), "CounterResolution": "Day"}
+    assert stats_ttl(closed, now=NOW) == CLOSED_TTL
+    settling = {"ToTS": str(int(NOW - 3600)), "CounterResolution": "Day"}
+    assert stats_ttl(settling, now=NOW) == DEFAULT_TTLS["day"]
+    assert stats_ttl({"totS": "2023-01-01T00:00:00Z"}, now=NOW) == CLOSED_TTL
+    assert stats_ttl({"CounterResolution": "Hour"}, now=NOW) == DEFAULT_TTLS["hour"]
+    assert stats_ttl({"CounterResolution": "Lifetime"}, ttls={"lifetime": 1}) == 1
+
+
+def test_statistics_are_served_from_disk_across_clients(tmp_path: Path) -> None:
+    """Test that a second client reuses the cache file, and that other calls pass through."""
+    transport, calls = backend()
+    path = tmp_path / "stats.sqlite"
+    filters = {
+        "CounterSource": "Campaign",
+        "CounterResolution": "Day",
+        "FromTS": "2024-01-01T00:00:00Z",
+        "ToTS": "2024-01-31T00:00:00Z",
+    }
+
+    first = Client(
+        auth=("key", "secret"),
+        transport=transport,
+        stats_cache=StatsCache(path),
+    )
+    assert (
+        first.statcounters.get(filters=filters).json()["Data"][0]["MessageSentCount"]
+        == 1
+    )
+    first.contact.get()
+    first.contact.get()
+
+    second = Client(
+        auth=("key", "secret"),
+        transport=transport,
+        stats_cache=StatsCache(path),
+    )
+    reordered = dict(reversed(list(filters.items())))
+    response = second.statcounters.get(filters=reordered)
+    assert response.status_code == 200
+    assert response.json()["Data"][0]["MessageSentCount"] == 1
+    assert response.headers["Content-Type"] == "application/json"
+    assert calls == ["statcounters", "contact", "contact"]
+
+    other_account = Client(
+        auth=("other", "secret"),
+        transport=transport,
+        stats_cache=StatsCache(path),
+    )
+    other_account.statcounters.get(filters=filters)
+    assert calls[-1] == "statcounters"
+
+
+def test_expiry_and_eviction(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test TTL expiry and the least recently used eviction."""
+    now = [NOW]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    cache = StatsCache(max_entries=2, max_bytes=10)
+
+    cache.set("a", 200, {}, b"aaaa", ttl=60)
+    cache.set("b", 200, {}, b"bbbb", ttl=60)
+    now[0] += 1
+    assert cache.get("a") is not None
+    cache.set("c", 200, {}, b"cccc", ttl=60)
+    assert (cache.get("a") is not None, cache.get("b"), len(cache)) == (True, None, 2)
+    assert cache.evictions == 1
+
+    cache.set("big", 200, {}, b"x" * 11, ttl=60)
+    assert cache.get("big") is None
+    now[0] += 1
+    assert cache.get("c") is not None
+    cache.set("d", 200, {}, b"dddddd", ttl=60)
+    assert cache.evictions == 2
+    assert cache.get("a") is None
+    assert cache.get("d") == (200, {}, b"dddddd")
+
+    now[0] += 61
+    assert cache.get("d") is None
+    assert (cache.hits, cache.misses) == (4, 4)
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from mailjet_rest.client import ApiError
+from mailjet_rest.sync import IncrementalSync
+from mailjet_rest.utils.pagination import iter_records
+
+
+class FakeResponse:
+    """A minimal stand-in for `requests.Response`."""
+
+    def __init__(self, payload: dict[str, Any], status_code: int = 200) -> None:
+        self.status_code = status_code
+        self._payload = payload
+
+    def json(self) -> dict[str, Any]:
+        return self._payload
+
+
+class FakeEndpoint:
+    """Serve a list of records, honouring Limit, Offset and FromTS filters."""
+
+    def __init__(self, records: list[dict[str, Any]], status_code: int = 200) -> None:
+        self.records = records
+        self.status_code = status_code
+        self.calls: list[dict[str, Any]] = []
+
+    def get_many(self, filters: dict[str, Any] | None = None, **kwargs: Any) -> FakeResponse:
+        filters = dict(filters or {})
+        self.calls.append(filters)
+        records = self.records
+        if "FromTS" in filters:
+            records = [r for r in records if r["ArrivedAt"] >= filters["FromTS"]]
+        offset, limit = filters.get("Offset", 0), filters.get("Limit", 10)
+        data = records[offset : offset + limit]
+        return FakeResponse({"Count": len(data), "Data": data}, self.status_code)
+
+
+class FakeClient:
+    def __init__(self, message: FakeEndpoint) -> None:
+        self.message = message
+
+
+def make_messages(start: int, stop: int) -> list[dict[str, Any]]:
+    return [
+        {"ID": i, "ArrivedAt": f"2025-01-01T00:{i:02d}:00Z", "Status": "sent"}
+        for i in range(start, stop)
+    ]
+
+
+def test_iter_records_walks_every_page() -> None:
+    """Test that iter_records requests pages until a short page is returned."""
+    endpoint = FakeEndpoint(make_messages(0, 25))
+    records = list(iter_records(endpoint, limit=10))  # type: ignore[arg-type]
+    assert [r["ID"] for r in records] == list(range(25))
+    assert [call["Offset"] for call in endpoint.calls] == [0, 10, 20]
+
+
+def test_iter_records_raises_on_error_status() -> None:
+    """Test that a failed page request raises ApiError."""
+    endpoint = FakeEndpoint(make_messages(0, 5), status_code=401)
+    with pytest.raises(ApiError):
+        list(iter_records(endpoint))  # type: ignore[arg-type]
+
+
+def test_iter_records_rejects_invalid_limit() -> None:
+    """Test that page sizes above the API maximum are rejected."""
+    with pytest.raises(ValueError):
+        list(iter_records(FakeEndpoint([]), limit=5000))  # type: ignore[arg-type]
+
+
+def test_first_sync_fetches_everything_and_stores_watermark() -> None:
+    """Test that the first run stores every record and the largest watermark."""
+    endpoint = FakeEndpoint(make_messages(0, 12))
+    with IncrementalSync(FakeClient(endpoint), page_size=5) as sync:  # type: ignore[arg-type]
+        result = sync.sync("message")
+        assert result.fetched == 12
+        assert result.previous_watermark is None
+        assert result.watermark == "2025-01-01T00:11:00Z"
+        assert sync.count("message") == 12
+        assert "FromTS" not in endpoint.calls[0]
+
+
+def test_next_sync_only_fetches_newer_records(tmp_path: Any) -> None:
+    """Test that a later run filters on the persisted watermark and upserts."""
+    path = tmp_path / "sync.sqlite"
+    endpoint = FakeEndpoint(make_messages(0, 10))
+    with IncrementalSync(FakeClient(endpoint), path) as sync:  # type: ignore[arg-type]
+        sync.sync("message")
+
+    endpoint.records += make_messages(10, 13)
+    endpoint.calls.clear()
+    with IncrementalSync(FakeClient(endpoint), path) as sync:  # type: ignore[arg-type]
+        result = sync.sync("message")
+        assert endpoint.calls[0]["FromTS"] == "2025-01-01T00:09:00Z"
+        # The record sitting on the watermark is fetched again and overwritten.
+        assert result.fetched == 4
+        assert result.watermark == "2025-01-01T00:12:00Z"
+        assert sync.count("message") == 13
+        assert {r["ID"] for r in sync.records("message")} == set(range(13))
+
+
+def test_reset_forgets_records_and_watermark() -> None:
+    """Test that reset removes the stored state of a resource."""
+    endpoint = FakeEndpoint(make_messages(0, 3))
+    with IncrementalSync(FakeClient(endpoint)) as sync:  # type: ignore[arg-type]
+        sync.sync("message")
+        sync.reset("message")
+        assert sync.watermark("message") is None
+        assert sync.count("message") == 0
+
+
+def test_numeric_watermarks_are_compared_as_numbers() -> None:
+    """Test that numeric watermark fields are not compared lexicographically."""
+    records = [{"ID": i, "ArrivedAt": i} for i in (2, 9, 10)]
+    with IncrementalSync(FakeClient(FakeEndpoint(records))) as sync:  # type: ignore[arg-type]
+        result = sync.sync("message", watermark_field="ID", watermark_filter="MinID")
+        assert result.watermark == "10"
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import pytest
+import requests
+
+from mailjet_rest import Client
+from mailjet_rest.testing import MockMailjet
+from mailjet_rest.testing import MockMailjetServer
+
+
+@pytest.fixture
+def mock() -> MockMailjet:
+    return MockMailjet(seed=0)
+
+
+@pytest.fixture
+def client(mock: MockMailjet) -> Client:
+    return Client(auth=("key", "secret"), transport=mock.transport)
+
+
+@pytest.fixture
+def server() -> Iterator[MockMailjetServer]:
+    with MockMailjetServer() as server:
+        yield server
+
+
+def test_contact_crud(client: Client, mock: MockMailjet) -> None:
+    """Test creating, reading, updating and deleting a contact."""
+    created = client.contact.create(data={"Email": "Passenger@mailjet.com"})
+    assert created.status_code == 201
+    contact_id = created.json()["Data"][0]["ID"]
+
+    duplicate = client.contact.create(data={"Email": "passenger@mailjet.com"})
+    assert duplicate.status_code == 400
+    assert client.contact.create(data={"Name": "No email"}).status_code == 400
+
+    by_email = client.contact.get(id="passenger@mailjet.com").json()["Data"][0]
+    assert by_email["ID"] == contact_id
+    client.contact.update(id=contact_id, data={"Name": "Passenger"})
+    assert mock.records("contact")[0]["Name"] == "Passenger"
+    assert client.contact.delete(id=contact_id).status_code == 204
+    assert client.contact.get(id=contact_id).status_code == 404
+    assert client.message.create(data={}).status_code == 405
+
+
+def test_pagination_sort_filters_and_count(client: Client, mock: MockMailjet) -> None:
+    """Test Limit/Offset paging, Sort, equality filters and countOnly."""
+    mock.seed(
+        "contact",
+        [
+            {"Email": f"c{i}@example.com", "Name": "even" if i % 2 else "odd"}
+            for i in range(25)
+        ],
+    )
+    page = client.contact.get(filters={"Limit": 10, "Offset": 20}).json()
+    assert (page["Count"], page["Total"]) == (5, 25)
+    newest = client.contact.get(filters={"Limit": 1, "Sort": "ID DESC"}).json()
+    assert newest["Data"][0]["Email"] == "c24@example.com"
+    assert client.contact.count(filters={"Name": "even"}) == 12
+    assert client.contact.get(filters={"countOnly": 1}).json()["Data"] == []
+
+
+def test_sort_on_string_field(client: Client, mock: MockMailjet) -> None:
+    """Test sorting on a text field holding empty values, in both directions."""
+    mock.seed(
+        "contact",
+        [{"Email": "b@example.com", "Name": "Bea"}, {"Email": "x@example.com"}],
+    )
+    mock.seed("contact", [{"Email": "a@example.com", "Name": "Al"}])
+    names = [
+        contact["Name"]
+        for contact in client.contact.get(filters={"Sort": "Name"}).json()["Data"]
+    ]
+    assert names == ["", "Al", "Bea"]
+    names = [
+        contact["Name"]
+        for contact in client.contact.get(filters={"Sort": "Name+DESC"}).json()["Data"]
+    ]
+    assert names == ["Bea", "Al", ""]
+
+
+def test_csv_import_creates_list_members(client: Client, mock: MockMailjet) -> None:
+    """Test uploading CSV data and importing it into a contact list."""
+    list_id = client.contactslist.create(data={"Name": "Newsletter"}).json()["Data"][0][
+        "ID"
+    ]
+    upload = client.contactslist_csvdata.create(
+        id=list_id,
+        data="email,name\na@example.com,A\nnot-an-email,B\nb@example.com,C\n",
+    )
+    job = client.csvimport.create(
+        data={
+            "ContactsListID": list_id,
+            "DataID": upload.json()["ID"],
+            "Method": "addnoforce",
+        },
+    ).json()["Data"][0]
+
+    assert (job["Status"], job["Count"], job["Errcount"]) == ("Completed", 2, 1)
+    assert client.contact.count(filters={"ContactsList": list_id}) == 2
+    assert len(mock.records("listrecipient")) == 2
+
+
+def test_send_records_messages(mock: MockMailjet) -> None:
+    """Test the v3.1 send API and the stored messages."""
+    client = Client(auth=("key", "secret"), version="v3.1", transport=mock.transport)
+    result = client.send.create(
+        data={
+            "Messages": [
+                {
+                    "From": {"Email": "pilot@mailjet.com"},
+                    "To": [{"Email": "a@example.com"}, {"Email": "b@example.com"}],
+                    "Subject": "Hello",
+                },
+            ],
+        },
+    )
+    assert result.status_code == 200
+    sent = result.json()["Messages"][0]
+    assert sent["Status"] == "success"
+    assert [to["Email"] for to in sent["To"]] == ["a@example.com", "b@example.com"]
+    assert {m["ContactAlt"] for m in mock.records("message")} == {
+        "a@example.com",
+        "b@example.com",
+    }
+
+    invalid = client.send.create(
+        data={"Messages": [{"To": [{"Email": "a@example.com"}]}]},
+    )
+    assert invalid.status_code == 400
+
+
+def test_injected_throttling_and_credentials() -> None:
+    """Test forced and random 429 responses, and the credentials check."""
+    mock = MockMailjet(throttle_rate=0.5, seed=1, credentials=("key", "secret"))
+    client = Client(auth=("key", "secret"), transport=mock.transport)
+    statuses = [client.contact.get().status_code for _ in range(200)]
+    assert 60 < statuses.count(429) < 140
+    assert mock.throttled == statuses.count(429)
+
+    mock.throttle_rate = 0
+    mock.inject(503, count=2)
+    assert [client.contact.get().status_code for _ in range(3)] == [503, 503, 200]
+    wrong = Client(auth=("key", "wrong"), transport=mock.transport)
+    assert wrong.contact.get().status_code == 401
+
+
+def test_latency_overlaps_between_requests(mock: MockMailjet, client: Client) -> None:
+    """Test that the simulated latency does not serialise concurrent requests."""
+    mock.latency = 0.05
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        statuses = list(
+            executor.map(lambda _: client.contact.get().status_code, range(8)),
+        )
+    assert statuses == [200] * 8
+    assert time.monotonic() - started < 0.05 * 4
+
+
+def test_http_server(server: MockMailjetServer) -> None:
+    """Test the mock over HTTP, with a client built by the server."""
+    server.mock.seed("contact", [{"Email": "passenger@mailjet.com"}])
+    client = server.client()
+    assert server.url.startswith("http://127.0.0.1:")
+    assert client.contact.count() == 1
+    created = client.contactslist.create(data={"Name": "Over HTTP"})
+    assert created.status_code == 201
+    assert server.mock.records("contactslist")[0]["Name"] == "Over HTTP"
+    assert server.mock.request_count == 2
+
+
+def test_http_server_errors(
+    server: MockMailjetServer,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that failures are answered with Mailjet-style errors over HTTP."""
+    contact = server.mock.seed("contact", [{"Email": "passenger@mailjet.com"}])[0]
+    url = f"{server.url}/v3/REST/contact/{contact['ID']}"
+
+    malformed = requests.put(url, data=b"{bad", auth=("key", "secret"), timeout=5)
+    assert malformed.status_code == 400
+    assert malformed.json()["ErrorMessage"] == "Invalid JSON payload"
+
+    bad_auth = requests.get(url, headers={"Authorization": "Basic %%%"}, timeout=5)
+    assert bad_auth.status_code == 401
+
+    def fail(*args: Any, **kwargs: Any) -> Any:
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(server.mock.transport, "send", fail)
+    failed = requests.get(url, auth=("key", "secret"), timeout=5)
+    assert failed.status_code == 500
+    assert "boom" in failed.json()["ErrorMessage"]
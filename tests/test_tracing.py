@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import json
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+import requests
+
+from mailjet_rest import Client
+from mailjet_rest.client import ApiError
+from mailjet_rest.tracing import Tracer
+from mailjet_rest.tracing import url_template
+from mailjet_rest.transport import InMemoryTransport
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from mailjet_rest.transport import InMemoryRequest
+
+
+def read_trace(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+@pytest.mark.parametrize(
+    ("url", "template"),
+    [
+        ("https://api.mailjet.com/v3/REST/contact", "/v3/REST/contact"),
+        ("https://api.mailjet.com/v3/REST/contact/42", "/v3/REST/contact/{id}"),
+        (
+            "https://api.mailjet.com/v3/REST/contact/a%40example.com",
+            "/v3/REST/contact/{id}",
+        ),
+        (
+            "https://api.mailjet.com/v3/REST/contactslist/7/managecontact",
+            "/v3/REST/contactslist/{id}/managecontact",
+        ),
+        (
+            "https://api.mailjet.com/v3/DATA/contactslist/7/CSVData/text:plain",
+            "/v3/DATA/contactslist/{id}/CSVData/text:plain",
+        ),
+        ("https://api.mailjet.com/v3.1/send", "/v3.1/send"),
+    ],
+)
+def test_url_template(url: str, template: str) -> None:
+    """Test that IDs are removed from the traced URLs."""
+    assert url_template(url) == template
+
+
+def test_client_traces_every_request(tmp_path: Path) -> None:
+    """Test the trace records written for successful and failed requests."""
+    transport = InMemoryTransport()
+    transport.add_route(
+        "GET",
+        "/v3/REST/contact/{id}",
+        lambda request: (
+            200,
+            {"Count": 1, "Data": [{"ID": 1}], "Total": 1},
+            {"X-MJ-Request-GUID": "guid-1"},
+        ),
+    )
+    transport.add_route("POST", "/v3/REST/contact", lambda request: (400, None))
+
+    def unreachable(request: InMemoryRequest) -> None:
+        raise requests.exceptions.ConnectionError
+
+    transport.add_route("GET", "/v3/REST/contactslist/{id}", unreachable)
+    path = tmp_path / "traces" / "requests.jsonl"
+
+    with Tracer(path) as tracer:
+        client = Client(auth=("key", "secret"), transport=transport, tracer=tracer)
+        client.contact.get(id=1)
+        client.contact.create(data={"Email": "a@example.com"})
+        client.contact.get(id=2)
+        with pytest.raises(ApiError):
+            client.contactslist.get(id=3)
+
+    first, created, second, failed = read_trace(path)
+    assert failed["url_template"] == "/v3/REST/contactslist/{id}"
+    assert tracer.written == 4
+    assert first["method"] == "GET"
+    assert first["resource"] == "contact"
+    assert first["url_template"] == "/v3/REST/contact/{id}"
+    assert first["status"] == 200
+    assert first["request_ids"] == {"X-MJ-Request-GUID": "guid-1"}
+    assert first["request_bytes"] == 0
+    assert first["response_bytes"] > 0
+    assert first["duration_ms"] >= 0
+    assert first["ts"] == pytest.approx(time.time(), abs=60)
+    assert created["status"] == 400
+    assert created["request_bytes"] == len('{"Email": "a@example.com"}')
+    assert second["url_template"] == first["url_template"]
+    assert failed["status"] is None
+    assert failed["error"] == "ConnectionError"
+
+
+def test_full_queue_drops_records(tmp_path: Path) -> None:
+    """Test that records are dropped rather than blocking the requests."""
+    tracer = Tracer(tmp_path / "trace.jsonl", max_queue=1)
+    for i in range(1000):
+        tracer.record({"n": i})
+    tracer.close()
+    tracer.record({"n": "late"})
+
+    assert tracer.written + tracer.dropped == 1001
+    assert tracer.dropped >= 1
+    assert len(read_trace(tracer.path)) == tracer.written
+
+
+def test_unwritable_trace_file_fails_early(tmp_path: Path) -> None:
+    """Test that a trace file that cannot be opened is reported by the constructor."""
+    (tmp_path / "file").write_text("")
+    with pytest.raises(OSError):
+        Tracer(tmp_path / "file" / "trace.jsonl", max_queue=2)
+
+
+def test_unwritable_records_are_logged_and_dropped(
+    tmp_path: Path,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test that a record the writer cannot serialize does not stop the tracer."""
+    tracer = Tracer(tmp_path / "trace.jsonl", max_queue=2, flush_interval=0.01)
+    tracer.record({"n": object()})
+    tracer.record({"n": 1})
+    tracer.close()
+
+    assert tracer.written == 1
+    assert tracer.dropped == 1
+    assert read_trace(tracer.path) == [{"n": 1}]
+    assert "Could not write a trace record" in caplog.text
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import array
+import asyncio
+import io
+from typing import Any
+
+import pytest
+import requests
+
+from mailjet_rest import Client
+from mailjet_rest.client import ApiError
+from mailjet_rest.client import TimeoutError
+from mailjet_rest.client import api_call
+from mailjet_rest.transport import AsyncInMemoryTransport
+from mailjet_rest.transport import InMemoryRequest
+from mailjet_rest.transport import InMemoryTransport
+from mailjet_rest.transport import RequestsTransport
+from mailjet_rest.transport import ThreadedAsyncTransport
+from mailjet_rest.transport import Transport
+from mailjet_rest.transport import make_response
+
+
+@pytest.fixture
+def transport() -> InMemoryTransport:
+    """Provide an in-memory transport answering a few contact routes."""
+    transport = InMemoryTransport(record=True)
+
+    @transport.route("GET", "/v3/REST/contact/{id}")
+    def get_contact(request: InMemoryRequest) -> dict[str, Any]:
+        return {"Count": 1, "Data": [{"ID": request.path_params["id"]}], "Total": 1}
+
+    @transport.route("POST", "/v3/REST/contact")
+    def create_contact(request: InMemoryRequest) -> tuple[int, Any, dict[str, str]]:
+        return 201, {"Data": [request.json()]}, {"X-MJ-Request-GUID": "abc"}
+
+    @transport.route("DELETE", "/v3/REST/contact/{id}")
+    def delete_contact(request: InMemoryRequest) -> tuple[int, None]:
+        return 204, None
+
+    return transport
+
+
+def test_client_routes_requests_to_handlers(transport: InMemoryTransport) -> None:
+    """Test that a client with an in-memory transport never opens a socket."""
+    client = Client(auth=("key", "secret"), transport=transport)
+
+    result = client.contact.get(id="42", filters={"Limit": 5})
+    assert result.status_code == 200
+    assert result.json()["Data"] == [{"ID": "42"}]
+
+    request = transport.requests[-1]
+    assert request.method == "GET"
+    assert request.query == {"Limit": "5"}
+    assert request.auth == ("key", "secret")
+    assert request.headers["Content-type"] == "application/json"
+
+
+def test_handler_tuples_set_status_body_and_headers(
+    transport: InMemoryTransport,
+) -> None:
+    """Test the (status, body, headers) and (status, body) handler results."""
+    client = Client(auth=("key", "secret"), transport=transport)
+
+    created = client.contact.create(data={"Email": "passenger@mailjet.com"})
+    assert created.status_code == 201
+    assert created.headers["X-MJ-Request-GUID"] == "abc"
+    assert created.json() == {"Data": [{"Email": "passenger@mailjet.com"}]}
+
+    deleted = client.contact.delete(id="42")
+    assert deleted.status_code == 204
+    assert deleted.content == b""
+
+
+def test_unknown_routes_answer_404(transport: InMemoryTransport) -> None:
+    """Test that requests without a matching route get a 404 response."""
+    client = Client(auth=("key", "secret"), transport=transport)
+    assert client.template.get(id="1").status_code == 404
+
+
+def test_default_transport_is_pooled_requests_session() -> None:
+    """Test that clients use a RequestsTransport unless told otherwise."""
+    client = Client(auth=("key", "secret"), pool_maxsize=3)
+    assert isinstance(client.transport, RequestsTransport)
+    assert client.session is client.transport.session
+    assert client.contact._transport is client.transport
+
+
+def test_transport_errors_are_translated() -> None:
+    """Test that requests exceptions raised by a transport become library errors."""
+
+    class FailingTransport(Transport):
+        def __init__(self, error: Exception) -> None:
+            self.error = error
+
+        def send(self, method: str, url: str, **kwargs: Any) -> Any:
+            raise self.error
+
+    with pytest.raises(TimeoutError):
+        api_call(None, "get", "https://example.com", {}, transport=FailingTransport(requests.exceptions.ReadTimeout()))
+    with pytest.raises(ApiError):
+        api_call(None, "get", "https://example.com", {}, transport=FailingTransport(requests.exceptions.ConnectionError()))
+
+
+def test_async_endpoint_methods_use_async_transport(
+    transport: InMemoryTransport,
+) -> None:
+    """Test the coroutine endpoint methods with an async in-memory transport."""
+
+    async def fetch_stats(request: InMemoryRequest) -> dict[str, Any]:
+        await asyncio.sleep(0)
+        return {"Data": [{"SourceId": request.query["SourceId"]}]}
+
+    transport.add_route("GET", "/v3/REST/statcounters", fetch_stats)
+    client = Client(
+        auth=("key", "secret"),
+        async_transport=AsyncInMemoryTransport(transport),
+    )
+
+    async def main() -> list[Any]:
+        return await asyncio.gather(
+            client.contact.aget(id="7"),
+            client.statcounters.aget_many(filters={"SourceId": "9"}),
+            client.contact.acreate(data={"Email": "a@b.c"}),
+            client.contact.adelete(id="7"),
+        )
+
+    contact, stats, created, deleted = asyncio.run(main())
+    assert contact.json()["Data"] == [{"ID": "7"}]
+    assert stats.json()["Data"] == [{"SourceId": "9"}]
+    assert created.status_code == 201
+    assert deleted.status_code == 204
+
+
+def test_threaded_async_transport_wraps_sync_transport(
+    transport: InMemoryTransport,
+) -> None:
+    """Test that the default async transport runs the sync transport in threads."""
+    client = Client(auth=("key", "secret"), transport=transport)
+    assert isinstance(client.async_transport, ThreadedAsyncTransport)
+    response = asyncio.run(client.contact.aget(id="3"))
+    assert response.json()["Data"] == [{"ID": "3"}]
+
+
+def test_make_response_serialises_json_bodies() -> None:
+    """Test that non-bytes bodies are sent as JSON."""
+    response = make_response(200, {"Count": 0})
+    assert response.json() == {"Count": 0}
+    assert response.headers["Content-Type"] == "application/json"
+    assert make_response(200, "plain").text == "plain"
+
+
+class CapturingTransport(Transport):
+    """Keep the body objects handed over by the client."""
+
+    def __init__(self) -> None:
+        self.bodies: list[Any] = []
+
+    def send(self, method: str, url: str, **kwargs: Any) -> Any:
+        self.bodies.append(kwargs["data"])
+        return make_response(201, {"Count": 1})
+
+
+def test_pre_encoded_bodies_are_passed_through() -> None:
+    """Test that bytes, memoryview and file bodies reach the transport uncopied."""
+    capturing = CapturingTransport()
+    client = Client(auth=("key", "secret"), transport=capturing)
+    payload = b'{"Email": "passenger@mailjet.com"}'
+    buffer = bytearray(payload)
+    view = memoryview(buffer)
+    stream = io.BytesIO(payload)
+
+    client.contact.create(data=payload)
+    client.contact.create(data=buffer)
+    client.contact.update(id="1", data=view)
+    client.contact.create(data=stream)
+    client.contact.create(data=payload.decode())
+
+    assert capturing.bodies[0] is payload
+    assert capturing.bodies[1] is buffer
+    assert capturing.bodies[2] is view
+    assert capturing.bodies[3] is stream
+    assert capturing.bodies[4] == payload.decode()
+
+
+def test_wide_memoryviews_are_sent_as_bytes(transport: InMemoryTransport) -> None:
+    """Test that memoryviews of multi-byte items are sent without truncation."""
+    words = array.array("I", [1, 2, 3])
+    capturing = CapturingTransport()
+    client = Client(auth=("key", "secret"), transport=capturing)
+
+    client.contact.create(data=memoryview(words))
+
+    body = capturing.bodies[-1]
+    assert len(body) == words.itemsize * 3
+    assert body.obj is words
+
+
+def test_strided_memoryviews_are_sent_as_bytes() -> None:
+    """Test that non-contiguous memoryviews are copied instead of failing to cast."""
+    words = array.array("i", [1, 2, 3, 4])
+    capturing = CapturingTransport()
+    client = Client(auth=("key", "secret"), transport=capturing)
+
+    client.contact.create(data=memoryview(words)[::2])
+    client.contact.create(data=memoryview(b"abcd")[::2])
+
+    assert capturing.bodies[-2] == array.array("i", [1, 3]).tobytes()
+    assert capturing.bodies[-1] == b"ac"
+
+
+def test_text_bodies_of_non_json_endpoints_are_encoded(
+    transport: InMemoryTransport,
+) -> None:
+    """Test that CSV uploads given as text are sent with the requested encoding."""
+    transport.add_route(
+        "POST",
+        "/v3/DATA/contactslist/{id}/csvdata/text:plain",
+        lambda request: {"ID": 7, "Size": len(request.body or b"")},
+    )
+    client = Client(auth=("key", "secret"), transport=transport)
+
+    csv = "email\npässenger@mailjet.com\n"
+
+    result = client.contactslist_csvdata.create(id="1", data=csv)
+
+    assert result.json()["Size"] == len(csv.encode())
+    assert transport.requests[-1].body == csv.encode()
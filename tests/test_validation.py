@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+import pytest
+
+from mailjet_rest import Client
+from mailjet_rest.transport import InMemoryRequest
+from mailjet_rest.transport import InMemoryTransport
+from mailjet_rest.validation import ERROR
+from mailjet_rest.validation import INVALID
+from mailjet_rest.validation import VALID
+from mailjet_rest.validation import BulkValidator
+
+
+class OverlapTransport(InMemoryTransport):
+    """An in-memory transport measuring how many requests overlap."""
+
+    def __init__(self) -> None:
+        super().__init__(record=True)
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def overlap(self) -> None:
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.005)
+        with self.lock:
+            self.active -= 1
+
+
+@pytest.fixture
+def transport() -> OverlapTransport:
+    """Provide a transport answering sender validations and DNS checks."""
+    transport = OverlapTransport()
+
+    @transport.route("POST", "/v3/REST/sender/{id}/validate")
+    def validate_sender(request: InMemoryRequest) -> Any:
+        transport.overlap()
+        if request.path_params["id"] == "404":
+            return 404, {"ErrorMessage": "Object not found"}
+        if request.path_params["id"] == "2":
+            return {"Errors": {"DNSValidationError": "No TXT record"}, "ValidationMethod": ""}
+        return {"Errors": {}, "ValidationMethod": "ActivationEmail", "GlobalError": ""}
+
+    @transport.route("POST", "/v3/REST/dns/{id}/check")
+    def check_dns(request: InMemoryRequest) -> Any:
+        transport.overlap()
+        spf = "Error" if request.path_params["id"] == "20" else "OK"
+        return {"DKIMStatus": "OK", "SPFStatus": spf, "SPFErrors": []}
+
+    @transport.route("GET", "/v3/REST/dns/{id}")
+    def get_dns(request: InMemoryRequest) -> Any:
+        record = {"Domain": "mailjet.com", "DKIMStatus": "OK", "SPFStatus": "OK"}
+        return {"Count": 1, "Data": [record], "Total": 1}
+
+    return transport
+
+
+def test_report_consolidates_senders_and_domains(transport: OverlapTransport) -> None:
+    """Test the statuses of valid, invalid and failing senders and domains."""
+    validator = BulkValidator(Client(auth=("key", "secret"), transport=transport))
+    report = validator.validate(senders=[1, 2, 404], domains=[10, 20])
+
+    assert [(row.kind, row.target, row.status) for row in report.rows] == [
+        ("sender", "1", VALID),
+        ("sender", "2", INVALID),
+        ("sender", "404", ERROR),
+        ("domain", "10", VALID),
+        ("domain", "20", INVALID),
+    ]
+    assert report.rows[1].error == "DNSValidationError: No TXT record"
+    assert report.rows[4].error == "SPF Error"
+    assert len(report.problems) == 3
+    assert transport.peak > 1
+
+    lines = report.format().splitlines()
+    assert lines[0].split() == ["KIND", "TARGET", "STATUS", "ERROR"]
+    assert lines[5].split() == ["domain", "20", "invalid", "SPF", "Error"]
+
+
+def test_results_are_cached(transport: OverlapTransport) -> None:
+    """Test that successful results are reused and failures are retried."""
+    validator = BulkValidator(Client(auth=("key", "secret"), transport=transport))
+    validator.validate(senders=[1, 404])
+    report = validator.validate(senders=[1, 404])
+
+    assert [row.cached for row in report.rows] == [True, False]
+    assert len(transport.requests) == 3
+    validator.validate(senders=[1], use_cache=False)
+    assert len(transport.requests) == 4
+
+
+def test_dns_status_without_check(transport: OverlapTransport) -> None:
+    """Test that domains can be read from the last DNS status instead of checked."""
+    validator = BulkValidator(Client(auth=("key", "secret"), transport=transport))
+    row = validator.validate(domains=[10], check=False).rows[0]
+    assert row.status == VALID
+    assert row.details["Domain"] == "mailjet.com"
+    assert transport.requests[-1].method == "GET"
+
+
+def test_rate_budget_spaces_requests(transport: OverlapTransport) -> None:
+    """Test that the token bucket limits the request rate."""
+    validator = BulkValidator(
+        Client(auth=("key", "secret"), transport=transport),
+        rate=100,
+        burst=1,
+    )
+    started = time.monotonic()
+    validator.validate(domains=range(6), check=False)
+    assert time.monotonic() - started >= 0.04
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import pytest
+
+from mailjet_rest import Client
+from mailjet_rest.client import ApiError
+from mailjet_rest.testing import MockMailjetServer
+from mailjet_rest.transport import InMemoryTransport
+from mailjet_rest.transport import RequestsTransport
+
+
+def pool_of(client: Client) -> Any:
+    assert client.session is not None
+    pools = client.session.get_adapter(client.config.api_url).poolmanager.pools
+    (key,) = pools.keys()
+    return pools[key]
+
+
+def test_warmup_opens_pooled_connections() -> None:
+    """Test that a burst after a warmup reuses the pre-opened connections."""
+    with MockMailjetServer() as server:
+        client = server.client(pool_maxsize=4)
+        assert client.warmup() == 4
+        assert client.warmup(2) == 0
+        pool = pool_of(client)
+        assert pool.num_connections == 4
+
+        with ThreadPoolExecutor(4) as executor:
+            statuses = list(
+                executor.map(lambda _: client.contact.get().status_code, range(20)),
+            )
+
+        assert statuses == [200] * 20
+        assert pool.num_connections == 4
+        client.close()
+
+
+def test_stale_connections_are_reaped() -> None:
+    """Test that connections idle for too long are closed and replaced."""
+    with MockMailjetServer() as server:
+        client = server.client(pool_maxsize=3, pool_max_idle=0.05)
+        transport = client.transport
+        assert isinstance(transport, RequestsTransport)
+        assert client.warmup() == 3
+        assert transport.reap() == 0
+
+        time.sleep(0.1)
+
+        assert transport.reap() == 3
+        assert client.warmup() == 3
+        time.sleep(0.1)
+        # Taking a stale connection from the pool reopens it.
+        assert client.contact.get().status_code == 200
+        assert transport.reap() == 2
+        client.close()
+
+
+def test_background_reaper() -> None:
+    """Test the reaper thread closing connections past their maximum age."""
+    with MockMailjetServer() as server:
+        client = server.client(pool_max_age=0.02, pool_reap_interval=0.01)
+        client.warmup(2)
+        pool = pool_of(client)
+        deadline = time.monotonic() + 2
+        while any(conn and conn.sock for conn in pool.pool.queue):
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        client.close()
+
+
+def test_warmup_without_pool_or_server() -> None:
+    """Test warmups of transports without pools and of unreachable servers."""
+    assert Client(auth=("key", "secret"), transport=InMemoryTransport()).warmup() == 0
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    client = Client(auth=("key", "secret"), api_url=f"http://127.0.0.1:{port}/")
+    with pytest.raises(ApiError):
+        client.warmup(2, timeout=1)